@@ -0,0 +1,226 @@
+"""
+Реестр бэкендов для бенчмарка лабораторной работы 10.
+
+Каждый бэкенд регистрируется декоратором @register и описывается
+генератором-контекстом: он получает (n_iter, n_jobs), готовит ресурсы
+(например, пул), выдает функцию одного замера и освобождает ресурсы.
+Функция замера передает свои аргументы вызову integrate*, поэтому
+run(return_stats=True) возвращает (значение, IntegrationStats).
+"""
+
+import json
+import math
+import os
+import subprocess
+import sys
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+import timeit
+from typing import Any, Callable, ContextManager, Dict, List
+
+import numpy as np
+
+ROOT = Path(__file__).parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import cython
+from src.integrate import integrate
+from src.integrate_async import integrate_threads, integrate_processes, IntegratorPool, gil_enabled
+from src.integrate_adaptive import integrate_adaptive
+
+# Интеграл, на котором сравниваются все бэкенды
+A, B = 0.0, math.pi
+
+
+@dataclass(frozen=True)
+class Backend:
+    """Бэкенд бенчмарка."""
+    name: str
+    setup: Callable[[int, int], ContextManager[Callable[..., Any]]]
+    parallel: bool = False  # зависит ли время от n_jobs
+    description: str = ""
+
+
+BACKENDS: Dict[str, Backend] = {}
+
+# Дополнительные отчеты (не матрица n_iter x n_jobs); получают строки матрицы
+REPORTS: Dict[str, Callable[[List[Dict[str, Any]]], None]] = {}
+
+
+def register(name: str, *, parallel: bool = False):
+    """Регистрирует генератор-контекст как бэкенд с именем name."""
+    def decorator(func):
+        BACKENDS[name] = Backend(name, contextmanager(func), parallel,
+                                 (func.__doc__ or "").strip())
+        return func
+    return decorator
+
+
+def report(name: str):
+    """Регистрирует дополнительный отчет."""
+    def decorator(func):
+        REPORTS[name] = func
+        return func
+    return decorator
+
+
+@register("python")
+def python_backend(n_iter, n_jobs):
+    """integrate: цикл Python"""
+    yield lambda **kw: integrate(math.cos, A, B, n_iter=n_iter, **kw)
+
+
+@register("numpy")
+def numpy_backend(n_iter, n_jobs):
+    """integrate(backend="numpy"): векторизация блоками"""
+    yield lambda **kw: integrate(np.cos, A, B, n_iter=n_iter, backend="numpy", **kw)
+
+
+@register("threads", parallel=True)
+def threads_backend(n_iter, n_jobs):
+    """integrate_threads: новый ThreadPoolExecutor на вызов"""
+    yield lambda **kw: integrate_threads(math.cos, A, B, n_jobs=n_jobs, n_iter=n_iter, **kw)
+
+
+@register("processes", parallel=True)
+def processes_backend(n_iter, n_jobs):
+    """integrate_processes: новый ProcessPoolExecutor на вызов"""
+    yield lambda **kw: integrate_processes(math.cos, A, B, n_jobs=n_jobs, n_iter=n_iter, **kw)
+
+
+@register("pool", parallel=True)
+def pool_backend(n_iter, n_jobs):
+    """IntegratorPool: процессы запущены заранее (старт пула - в отчете pool)"""
+    with IntegratorPool(n_jobs=n_jobs) as pool:
+        yield lambda **kw: pool.integrate(math.cos, A, B, n_iter=n_iter, **kw)
+
+
+@register("cython", parallel=True)
+def cython_backend(n_iter, n_jobs):
+    """integrate_threads(kernel="cython_nogil"): C-цикл без GIL"""
+    yield lambda **kw: integrate_threads(math.cos, A, B, n_jobs=n_jobs, n_iter=n_iter,
+                                         kernel="cython_nogil", **kw)
+
+
+@report("speedup")
+def speedup_report(results: List[Dict[str, Any]]):
+    """Ускорение каждого бэкенда относительно цикла Python (бэкенд python) по матрице"""
+    python = {row['n_iter']: row['min_sec'] for row in results if row['backend'] == 'python'}
+    print("\nУСКОРЕНИЕ ОТНОСИТЕЛЬНО PYTHON (по минимальному времени)")
+    if not python:
+        print("Нет замеров бэкенда python: добавьте его в --backends")
+        return
+    print(f"{'Бэкенд':<10} | {'n_iter':>8} | {'n_jobs':>6} | {'Ускорение':>9}")
+    print("-" * 44)
+    for row in results:
+        base = python.get(row['n_iter'])
+        if row['backend'] == 'python' or base is None or row['min_sec'] <= 0:
+            continue
+        print(f"{row['backend']:<10} | {row['n_iter']:8d} | {row['n_jobs']:6d} | "
+              f"{base / row['min_sec']:8.1f}x")
+
+
+@report("pool")
+def pool_report(results: List[Dict[str, Any]], n_iter: int = 1000, calls: int = 50,
+                n_jobs: int = 4):
+    """Старт IntegratorPool и время вызова с его учетом против одноразовых процессов"""
+    print(f"\nМАЛЫЕ ИНТЕГРАЛЫ: n_iter={n_iter:,}, вызовов={calls}, n_jobs={n_jobs}")
+    print("-" * 64)
+    t_python = timeit.timeit(lambda: integrate(math.cos, A, B, n_iter=n_iter),
+                             number=calls) / calls * 1000
+    t_oneshot = timeit.timeit(
+        lambda: integrate_processes(math.cos, A, B, n_jobs=n_jobs, n_iter=n_iter),
+        number=calls) / calls * 1000
+    with IntegratorPool(n_jobs=n_jobs) as pool:
+        for _ in range(calls):
+            pool.integrate(math.cos, A, B, n_iter=n_iter)
+        t_call = pool.total_time / pool.calls * 1000
+        t_pool = pool.amortized_time * 1000
+        startup = pool.startup_time * 1000
+    print(f"Python:            {t_python:7.2f}мс")
+    print(f"Процессы (разово): {t_oneshot:7.2f}мс, накладные {t_oneshot - t_python:7.2f}мс/вызов")
+    print(f"IntegratorPool:    {t_call:7.2f}мс без старта, {t_pool:7.2f}мс со стартом "
+          f"({startup:.1f}мс на {calls} вызовов)")
+
+
+@report("imports")
+def import_time_report(results: List[Dict[str, Any]], repeats: int = 5):
+    """Время холодного импорта пакетов в отдельном процессе (мс)"""
+    snippets = {
+        "import src": "import src",
+        "import cython": "import cython",
+        "cython.load()": "import cython; cython.load()",
+    }
+    print("\nВРЕМЯ ИМПОРТА (холодный старт, мс)")
+    print("-" * 40)
+    for name, snippet in snippets.items():
+        code = ("import time; start = time.perf_counter(); "
+                f"{snippet}; print((time.perf_counter() - start) * 1000)")
+        times = [
+            float(subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True,
+                                 capture_output=True, text=True).stdout)
+            for _ in range(repeats)
+        ]
+        print(f"{name:<14} | {min(times):6.1f}мс")
+    print(f"Cython-расширение: {'собрано' if cython.available() else 'не собрано (numpy)'}")
+
+
+@report("evaluations")
+def evaluations_report(results: List[Dict[str, Any]]):
+    """Число вычислений f для одинаковой точности: прямоугольники vs адаптивный Симпсон"""
+    exact = 2.0  # ∫sin(x)dx от 0 до π
+    print("\nТОЧНОСТЬ vs ЧИСЛО ВЫЧИСЛЕНИЙ f (∫sin(x)dx от 0 до π)")
+    print("n_iter     | Ошибка     | Адаптивный: вызовов f")
+    print("-" * 48)
+    for n_iter in (1000, 10000, 100000):
+        error = abs(integrate(math.sin, 0, math.pi, n_iter=n_iter) - exact)
+        adaptive = integrate_adaptive(math.sin, 0, math.pi, tol=error)
+        print(f"{n_iter:<10} | {error:.2e} | {adaptive.n_evals}")
+
+
+# Замер для отчета "gil": выполняется в отдельном интерпретаторе
+GIL_SNIPPET = """
+import json, math, sys, timeit
+from src.integrate_async import integrate_threads, integrate_processes, gil_enabled
+n_iter = int(sys.argv[1])
+rows = []
+for n_jobs in (1, 2, 4):
+    for name, func in (("threads", integrate_threads), ("processes", integrate_processes)):
+        run = lambda: func(math.cos, 0, math.pi, n_jobs=n_jobs, n_iter=n_iter)
+        run()
+        rows.append([name, n_jobs, min(timeit.repeat(run, number=1, repeat=3))])
+print(json.dumps({"gil": gil_enabled(), "version": sys.version.split()[0], "rows": rows}))
+"""
+
+
+@report("gil")
+def gil_report(results: List[Dict[str, Any]], n_iter: int = 200000):
+    """Потоки под GIL, потоки без GIL и процессы на одной машине"""
+    # Free-threaded интерпретатор (python3.13t) можно указать в NOGIL_PYTHON;
+    # PYTHON_GIL=0/1 включает и выключает GIL на такой сборке
+    interpreters = [sys.executable] + [path for path in [os.environ.get("NOGIL_PYTHON")] if path]
+    print(f"\nПОТОКИ С GIL / БЕЗ GIL / ПРОЦЕССЫ (n_iter={n_iter}, мс)")
+    print(f"{'Интерпретатор':<22} | {'GIL':<5} | {'Бэкенд':<9} | {'n_jobs':>6} | {'Мин (мс)':>9}")
+    print("-" * 64)
+    seen = set()
+    for python in interpreters:
+        for flag in ("1", "0"):
+            result = subprocess.run([python, "-c", GIL_SNIPPET, str(n_iter)], cwd=ROOT,
+                                    env={**os.environ, "PYTHON_GIL": flag},
+                                    capture_output=True, text=True)
+            if result.returncode != 0:
+                # Обычная сборка не запускается с PYTHON_GIL=0
+                continue
+            data = json.loads(result.stdout)
+            key = (python, data["gil"])
+            if key in seen:
+                continue
+            seen.add(key)
+            label = f"{Path(python).name} {data['version']}"
+            for name, n_jobs, seconds in data["rows"]:
+                print(f"{label:<22} | {'да' if data['gil'] else 'нет':<5} | {name:<9} | "
+                      f"{n_jobs:6d} | {seconds * 1000:9.2f}")
+    if all(gil for _, gil in seen):
+        print("Free-threaded интерпретатор не найден: укажите NOGIL_PYTHON=python3.13t")
@@ -1,88 +1,240 @@
 """
-Итерация 1: Замеры производительности базовой функции integrate().
-Сравнение времени выполнения для различного числа итераций.
+Единый бенчмарк лабораторной работы 10.
+
+Прогоняет зарегистрированные бэкенды (benchmarks/backends.py) по
+матрице n_iter x n_jobs с разогревом и повторами, сохраняет
+результаты в results/benchmark.json и results/benchmark.csv и
+сравнивает их с сохраненным базовым файлом.
+
+Примеры:
+    python benchmarks/benchmark.py
+    python benchmarks/benchmark.py --backends python numpy --n-iter 10000 100000
+    python benchmarks/benchmark.py --save-baseline
+    python benchmarks/benchmark.py --report imports evaluations
+    python benchmarks/benchmark.py --backends python numpy pool --report speedup pool
+    NOGIL_PYTHON=python3.13t python benchmarks/benchmark.py --backends threads --report gil
+    python benchmarks/benchmark.py --stats
+    python benchmarks/benchmark.py --calibrate
 """
 
-import timeit
-import math
-import sys
+import argparse
 import csv
-from pathlib import Path
-from typing import Dict, Any
 import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import timeit
+from datetime import datetime
+from multiprocessing import freeze_support
+from pathlib import Path
+from typing import Any, Dict, List, Optional
 
-# Импортируем тестируемую функцию
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
-from integrate import integrate
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from benchmarks.backends import BACKENDS, REPORTS
+from src.autotune import CALIBRATED, CALIBRATION_FILE, fit_calibration, measure_task_overhead
+from src.integrate_async import gil_enabled
+from src.stats import aggregate_stats
 
 RESULTS_DIR = Path(__file__).parent.parent / "results"
-RESULTS_DIR.mkdir(exist_ok=True)
+BASELINE_FILE = RESULTS_DIR / "baseline.json"
+
+CSV_FIELDS = ['backend', 'n_iter', 'n_jobs', 'mean_sec', 'min_sec', 'std_sec', 'repeats', 'value']
 
-def benchmark_integrate(n_iters: list[int], repeats: int = 20) -> Dict[str, list[float]]:
+
+def measure(backend_name: str, n_iter: int, n_jobs: int,
+            repeats: int, warmup: int, stats: bool = False) -> Dict[str, Any]:
     """
-    Замеряет время выполнения функции integrate для разных n_iter.
+    Замеряет один бэкенд в одной точке матрицы.
     
-    Args:
-        n_iters: Список значений n_iter для тестирования
-        repeats: Количество повторений каждого замера
+    Со stats после замеров выполняются еще repeats запусков с
+    return_stats=True; средние по ним фазы попадают в поле 'stats'.
+    Замеры времени идут без статистики и ее накладных расходов.
+    """
+    backend = BACKENDS[backend_name]
+    with backend.setup(n_iter, n_jobs) as run:
+        value = None
+        for _ in range(warmup):
+            value = run()
+        gc.collect()
+        times = timeit.repeat(run, number=1, repeat=repeats)
+        if value is None:
+            value = run()
+        runs = [run(return_stats=True)[1] for _ in range(repeats)] if stats else []
+    row = {
+        'backend': backend_name,
+        'n_iter': n_iter,
+        'n_jobs': n_jobs,
+        'mean_sec': statistics.fmean(times),
+        'min_sec': min(times),
+        'std_sec': statistics.pstdev(times),
+        'repeats': repeats,
+        'value': value,
+    }
+    if runs:
+        row['stats'] = aggregate_stats(runs)
+    return row
+
+
+def run_matrix(backends: List[str], n_iters: List[int], n_jobs_list: List[int],
+               repeats: int, warmup: int, stats: bool = False) -> List[Dict[str, Any]]:
+    """Прогоняет матрицу; непараллельные бэкенды замеряются только с n_jobs=1."""
+    results = []
+    print(f"{'Бэкенд':<10} | {'n_iter':>8} | {'n_jobs':>6} | {'Среднее (мс)':>12} | {'Мин (мс)':>9}")
+    print("-" * 58)
+    for name in backends:
+        jobs = n_jobs_list if BACKENDS[name].parallel else [1]
+        for n_iter in n_iters:
+            for n_jobs in jobs:
+                row = measure(name, n_iter, n_jobs, repeats, warmup, stats)
+                results.append(row)
+                print(f"{name:<10} | {n_iter:8d} | {n_jobs:6d} | "
+                      f"{row['mean_sec'] * 1000:12.2f} | {row['min_sec'] * 1000:9.2f}")
+                if 'stats' in row:
+                    print(format_stats(row['stats']))
+    return results
+
+
+def format_stats(stats: Dict[str, Any]) -> str:
+    """Строка с разбивкой времени по фазам для таблицы run_matrix."""
+    phases = " ".join(f"{name}={stats[name] * 1000:.2f}" for name in
+                      ('spawn', 'submit', 'compute', 'reduce', 'total'))
+    return (f"{'':>10}   фазы (мс): {phases}; {stats['evals_per_second']:.3g} выч/с, "
+            f"{stats['bytes_pickled']:.0f} Б pickle, дисбаланс {stats['imbalance']:.2f}")
+
+
+def environment() -> Dict[str, Any]:
+    """Описание машины, на которой получены результаты."""
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'gil_enabled': gil_enabled(),
+    }
+
+
+def save_results(results: List[Dict[str, Any]], json_path: Optional[Path] = None) -> Path:
+    """
+    Сохраняет результаты в json_path и рядом в CSV с тем же именем
+    (по умолчанию results/benchmark.json и results/benchmark.csv).
+    """
+    json_path = Path(json_path or RESULTS_DIR / "benchmark.json")
+    json_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump({'environment': environment(), 'results': results}, f,
+                  ensure_ascii=False, indent=2)
+    with open(json_path.with_suffix('.csv'), 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(results)
+    print(f"Результаты сохранены: {json_path} (+ .csv)")
+    return json_path
+
+
+def save_calibration(results: List[Dict[str, Any]], path: Path = CALIBRATION_FILE) -> Path:
+    """Сохраняет калибровку src.autotune по результатам матрицы."""
+    calibration = fit_calibration(results, measure_task_overhead(), environment())
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(calibration, f, ensure_ascii=False, indent=2)
+    print(f"Калибровка сохранена: {path}")
+    return path
+
+
+def find_regressions(results: List[Dict[str, Any]], baseline: List[Dict[str, Any]],
+                     threshold: float) -> List[Dict[str, Any]]:
+    """
+    Сравнивает минимальное время с базовым для совпадающих точек матрицы.
     
     Returns:
-        Словарь {n_iter: среднее_время_сек}
+        Точки, замедлившиеся больше чем на threshold (доля, 0.1 = 10%)
     """
-    print("Замеры производительности базовой функции integrate()")
-    print(f"{'n_iter':>8} | {'Время (сек)':>12} | {'±σ (сек)':>10}")
-    print("-" * 35)
-    
-    timings = {}
+    key = lambda row: (row['backend'], row['n_iter'], row['n_jobs'])
+    old = {key(row): row for row in baseline}
+    regressions = []
+    for row in results:
+        base = old.get(key(row))
+        if base is None or base['min_sec'] <= 0:
+            continue
+        ratio = row['min_sec'] / base['min_sec']
+        if ratio > 1 + threshold:
+            regressions.append({**row, 'baseline_sec': base['min_sec'], 'ratio': ratio})
+    return regressions
+
+
+def load_baseline(path: Path) -> Optional[List[Dict[str, Any]]]:
+    """Читает базовый файл, если он есть."""
+    if not path.exists():
+        return None
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)['results']
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Бенчмарк бэкендов integrate")
+    parser.add_argument('--backends', nargs='+', choices=sorted(BACKENDS), default=list(BACKENDS))
+    parser.add_argument('--n-iter', nargs='+', type=int, default=[10000, 100000, 1000000])
+    parser.add_argument('--n-jobs', nargs='+', type=int, default=[1, 2, 4])
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('--baseline', type=Path, default=BASELINE_FILE,
+                        help="файл для сравнения (по умолчанию results/baseline.json)")
+    parser.add_argument('--save-baseline', action='store_true',
+                        help="сохранить результаты как новый базовый файл")
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="допустимое замедление относительно базы (доля)")
+    parser.add_argument('--report', nargs='*', choices=sorted(REPORTS), default=[],
+                        help="дополнительные отчеты")
+    parser.add_argument('--stats', action='store_true',
+                        help="собрать статистику фаз (return_stats) и сохранить в JSON")
+    parser.add_argument('--calibrate', action='store_true',
+                        help="замерить python и параллельные бэкенды и записать "
+                             "калибровку для integrate_auto (results/calibration.json)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    start = time.perf_counter()
+    if args.calibrate:
+        backends = [name for name in ('python',) + CALIBRATED if name in BACKENDS]
+        save_calibration(run_matrix(backends, args.n_iter, sorted({1, *args.n_jobs}),
+                                    args.repeats, args.warmup))
+        print(f"Готово за {time.perf_counter() - start:.1f} сек")
+        return 0
     
-    for n_iter in n_iters:
-        # Функция для замера (lambda для timeit)
-        test_func = lambda: integrate(math.cos, 0, math.pi, n_iter=n_iter)
-        
-        # Очистка GC и разогрев
-        gc.disable()
-        for _ in range(3):  # warmup
-            test_func()
-        gc.enable()
-        
-        # Основной замер
-        times = timeit.repeat(
-            test_func,
-            number=1,  # 1 вызов функции за итерацию
-            repeat=repeats,
-            globals=globals()
-        )
-        
-        avg_time = sum(times) / len(times)
-        std_time = (sum((x - avg_time) ** 2 for x in times) / len(times)) ** 0.5
-        
-        timings[n_iter] = avg_time
-        
-        print(f"{n_iter:8d} | {avg_time:12.4f} | {std_time:10.4f}")
+    results = run_matrix(args.backends, args.n_iter, args.n_jobs, args.repeats, args.warmup,
+                         args.stats)
+    save_results(results)
     
-    return timings
-
-def save_results(timings: Dict[int, float], filename: str = "timings.csv"):
-    """Сохраняет результаты в CSV."""
-    filepath = RESULTS_DIR / filename
-    with open(filepath, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        writer.writerow(['n_iter', 'time_sec', 'method'])
-        for n_iter, time_sec in timings.items():
-            writer.writerow([n_iter, f"{time_sec:.6f}", "baseline_python"])
+    for name in args.report:
+        REPORTS[name](results)
     
-    print(f"Результаты сохранены: {filepath}")
+    status = 0
+    if args.save_baseline:
+        save_results(results, args.baseline)
+    else:
+        baseline = load_baseline(args.baseline)
+        if baseline is None:
+            print(f"Базовый файл {args.baseline} не найден (создайте: --save-baseline)")
+        else:
+            regressions = find_regressions(results, baseline, args.threshold)
+            for row in regressions:
+                print(f"РЕГРЕССИЯ: {row['backend']} n_iter={row['n_iter']} n_jobs={row['n_jobs']}: "
+                      f"{row['baseline_sec'] * 1000:.2f}мс -> {row['min_sec'] * 1000:.2f}мс "
+                      f"({row['ratio']:.2f}x)")
+            if regressions:
+                status = 1
+            else:
+                print(f"Регрессий больше {args.threshold:.0%} нет")
+    print(f"Готово за {time.perf_counter() - start:.1f} сек")
+    return status
 
-def print_summary(timings: Dict[int, float]):
-    """Печатает краткую сводку."""
-    print("\nСВОДКА (Итерация 1):")
-    print(f"  n_iter=100000: {timings.get(100000, 'N/A'):>8.2f} сек")
-    print(f"  Ускорение: 1.0x (базовый уровень)")
 
 if __name__ == "__main__":
-    # Наборы для тестирования (Итерация 1)
-    N_ITERS = [1000, 10000, 100000]
-    
-    timings = benchmark_integrate(N_ITERS)
-    save_results(timings)
-    print_summary(timings)
+    freeze_support()  # ФИКС multiprocessing для Windows
+    sys.exit(main())
@@ -1,8 +1,59 @@
 """
-Cython модули через pyximport (работает без setup.py)
+Cython модули, предварительно собранные командой
+python run_cython.py build_ext --inplace
+
+Расширение загружается лениво, при первом обращении к его функциям,
+а не при импорте пакета. Если оно не собрано, используется модуль
+integrate_python с тем же API на numpy.
 """
-import pyximport
-pyximport.install()
+import importlib
+import time
+
+__all__ = [
+    'Kernel', 'kernel', 'poly', 'const', 'integrate_kernel', 'cfunc_offset_sum',
+    'integrate_cos', 'integrate_cos_nogil',
+]
+
+_extension = None
+_loaded = False
+
+# Время загрузки расширения (сек), None - еще не загружалось
+load_time = None
+
+
+def load():
+    """
+    Загружает собранное расширение integrate_cython.
+    
+    Returns:
+        Модуль расширения или None, если оно не собрано
+    """
+    global _extension, _loaded, load_time
+    if not _loaded:
+        start = time.perf_counter()
+        try:
+            _extension = importlib.import_module('.integrate_cython', __name__)
+        except ImportError:
+            _extension = None
+        load_time = time.perf_counter() - start
+        _loaded = True
+    return _extension
+
+
+def available() -> bool:
+    """True, если используется собранное Cython-расширение."""
+    return load() is not None
+
+
+def implementation():
+    """Модуль, реализующий API: расширение или integrate_python."""
+    extension = load()
+    if extension is not None:
+        return extension
+    return importlib.import_module('.integrate_python', __name__)
+
 
-from .integrate_cython import integrate_cos_cython, integrate_python
-__all__ = ['integrate_cos_cython', 'integrate_python']
+def __getattr__(name):
+    if name in __all__:
+        return getattr(implementation(), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,7 +1,298 @@
-#cython: language_level=3
+#cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Cython-ядра для интегрирования.
+
+Kernel - подынтегральная функция уровня C: программа для стековой
+машины (x, константы, + - * / **, sin, cos, exp, log, ...), которая
+вычисляется без обращения к Python и без GIL. Kernel собираются из
+каталога по имени и комбинируются арифметикой:
+
+    kernel("sin") * poly([1, 0, 2]) + 3   # sin(x) * (1 + 2x^2) + 3
+"""
+
+from cpython.array cimport array
+from libc.math cimport sin, cos, tan, exp, log, sqrt, pow, fabs
+
+cdef enum:
+    OP_X
+    OP_CONST
+    OP_ADD
+    OP_SUB
+    OP_MUL
+    OP_DIV
+    OP_POW
+    OP_NEG
+    OP_SIN
+    OP_COS
+    OP_TAN
+    OP_EXP
+    OP_LOG
+    OP_SQRT
+    OP_ABS
+
+cdef enum:
+    MAX_STACK = 64
+
+UNARY = {
+    'sin': OP_SIN,
+    'cos': OP_COS,
+    'tan': OP_TAN,
+    'exp': OP_EXP,
+    'log': OP_LOG,
+    'sqrt': OP_SQRT,
+    'abs': OP_ABS,
+}
+
+BINARY = {
+    '+': OP_ADD,
+    '-': OP_SUB,
+    '*': OP_MUL,
+    '/': OP_DIV,
+    '**': OP_POW,
+}
+
+# Изменение глубины стека для каждой операции
+cdef dict STACK_EFFECT = {OP_X: 1, OP_CONST: 1, OP_NEG: 0}
+for _op in UNARY.values():
+    STACK_EFFECT[_op] = 0
+for _op in BINARY.values():
+    STACK_EFFECT[_op] = -1
+
+
+cdef double run_program(const int* ops, Py_ssize_t n_ops,
+                        const double* consts, double x) noexcept nogil:
+    """Выполняет программу Kernel для одной точки x."""
+    cdef double stack[MAX_STACK]
+    cdef Py_ssize_t i
+    cdef int sp = 0
+    cdef int ci = 0
+    cdef int op
+    for i in range(n_ops):
+        op = ops[i]
+        if op == OP_X:
+            stack[sp] = x
+            sp += 1
+        elif op == OP_CONST:
+            stack[sp] = consts[ci]
+            ci += 1
+            sp += 1
+        elif op == OP_ADD:
+            sp -= 1
+            stack[sp - 1] = stack[sp - 1] + stack[sp]
+        elif op == OP_SUB:
+            sp -= 1
+            stack[sp - 1] = stack[sp - 1] - stack[sp]
+        elif op == OP_MUL:
+            sp -= 1
+            stack[sp - 1] = stack[sp - 1] * stack[sp]
+        elif op == OP_DIV:
+            sp -= 1
+            stack[sp - 1] = stack[sp - 1] / stack[sp]
+        elif op == OP_POW:
+            sp -= 1
+            stack[sp - 1] = pow(stack[sp - 1], stack[sp])
+        elif op == OP_NEG:
+            stack[sp - 1] = -stack[sp - 1]
+        elif op == OP_SIN:
+            stack[sp - 1] = sin(stack[sp - 1])
+        elif op == OP_COS:
+            stack[sp - 1] = cos(stack[sp - 1])
+        elif op == OP_TAN:
+            stack[sp - 1] = tan(stack[sp - 1])
+        elif op == OP_EXP:
+            stack[sp - 1] = exp(stack[sp - 1])
+        elif op == OP_LOG:
+            stack[sp - 1] = log(stack[sp - 1])
+        elif op == OP_SQRT:
+            stack[sp - 1] = sqrt(stack[sp - 1])
+        elif op == OP_ABS:
+            stack[sp - 1] = fabs(stack[sp - 1])
+    return stack[0]
+
+
+cdef class Kernel:
+    """
+    Подынтегральная функция уровня C.
+    
+    Создается через kernel(), poly(), const() и арифметику над Kernel и
+    числами. Вызов k(x) вычисляет значение в точке, а offset_sum()
+    считает сумму для integrate() целиком в C без GIL.
+    """
+    cdef readonly array ops
+    cdef readonly array consts
+    
+    def __init__(self, ops, consts=()):
+        self.ops = array('i', ops)
+        self.consts = array('d', consts)
+        self._validate()
+    
+    cdef _validate(self):
+        cdef int depth = 0
+        cdef int max_depth = 0
+        cdef Py_ssize_t n_consts = 0
+        for op in self.ops:
+            if op not in STACK_EFFECT:
+                raise ValueError(f"Неизвестная операция: {op}")
+            if op != OP_X and op != OP_CONST and depth < (2 if op in BINARY.values() else 1):
+                raise ValueError("Некорректная программа: не хватает операндов")
+            n_consts += op == OP_CONST
+            depth += STACK_EFFECT[op]
+            max_depth = max(max_depth, depth)
+        if depth != 1 or n_consts != len(self.consts):
+            raise ValueError("Некорректная программа Kernel")
+        if max_depth > MAX_STACK:
+            raise ValueError(f"Слишком сложное выражение (глубина стека > {MAX_STACK})")
+    
+    def __call__(self, double x):
+        return run_program(self.ops.data.as_ints, len(self.ops),
+                           self.consts.data.as_doubles, x)
+    
+    def offset_sum(self, double a, double step, long n_iter, double offset=0.0):
+        """
+        Сумма k(a + (i + offset) * step) * step по i = 0..n_iter-1.
+        
+        Цикл выполняется без GIL, поэтому потоки считают параллельно.
+        """
+        cdef const int* ops = self.ops.data.as_ints
+        cdef Py_ssize_t n_ops = len(self.ops)
+        cdef const double* consts = self.consts.data.as_doubles
+        cdef double acc = 0.0
+        cdef long i
+        with nogil:
+            for i in range(n_iter):
+                acc += run_program(ops, n_ops, consts, a + (i + offset) * step) * step
+        return acc
+    
+    def apply(self, str name):
+        """Композиция с функцией из каталога: k.apply("sin") == sin(k(x))."""
+        if name not in UNARY:
+            raise ValueError(f"Неизвестная функция: {name!r}, доступны {tuple(UNARY)}")
+        return Kernel(list(self.ops) + [UNARY[name]], self.consts)
+    
+    def _binary(self, other, str op, bint reflected=False):
+        if not isinstance(other, Kernel):
+            other = const(other)
+        left, right = (other, self) if reflected else (self, other)
+        return Kernel(list(left.ops) + list(right.ops) + [BINARY[op]],
+                      list(left.consts) + list(right.consts))
+    
+    def __add__(self, other):
+        return self._binary(other, '+')
+    
+    def __radd__(self, other):
+        return self._binary(other, '+', True)
+    
+    def __sub__(self, other):
+        return self._binary(other, '-')
+    
+    def __rsub__(self, other):
+        return self._binary(other, '-', True)
+    
+    def __mul__(self, other):
+        return self._binary(other, '*')
+    
+    def __rmul__(self, other):
+        return self._binary(other, '*', True)
+    
+    def __truediv__(self, other):
+        return self._binary(other, '/')
+    
+    def __rtruediv__(self, other):
+        return self._binary(other, '/', True)
+    
+    def __pow__(self, other):
+        return self._binary(other, '**')
+    
+    def __rpow__(self, other):
+        return self._binary(other, '**', True)
+    
+    def __neg__(self):
+        return Kernel(list(self.ops) + [OP_NEG], self.consts)
+    
+    def __reduce__(self):
+        return _restore_kernel, (list(self.ops), list(self.consts))
+    
+    def __repr__(self):
+        return f"Kernel(ops={list(self.ops)}, consts={list(self.consts)})"
+
+
+def _restore_kernel(ops, consts):
+    """Восстанавливает Kernel при распаковке pickle."""
+    return Kernel(ops, consts)
+
+# Модуль собирается под именем cyext.integrate_cython (см. run_cython.py),
+# а импортируется как cython.integrate_cython: pickle должен ссылаться
+# на фактическое имя модуля
+_restore_kernel.__module__ = __name__
+
+
+def kernel(str name):
+    """
+    Kernel из каталога по имени: "x" или одна из функций UNARY от x.
+    
+    Raises:
+        ValueError: Если имя неизвестно
+    """
+    if name == 'x':
+        return Kernel([OP_X])
+    if name not in UNARY:
+        raise ValueError(f"Неизвестная функция: {name!r}, доступны {('x',) + tuple(UNARY)}")
+    return Kernel([OP_X, UNARY[name]])
+
+
+def const(double value):
+    """Kernel-константа."""
+    return Kernel([OP_CONST], [value])
+
+
+def poly(coeffs):
+    """
+    Многочлен c0 + c1*x + c2*x^2 + ... (коэффициенты от младшего),
+    вычисляемый по схеме Горнера.
+    """
+    coeffs = [float(c) for c in coeffs]
+    if not coeffs:
+        raise ValueError("Нужен хотя бы один коэффициент")
+    ops = [OP_CONST]
+    for _ in range(len(coeffs) - 1):
+        ops += [OP_X, OP_MUL, OP_CONST, OP_ADD]
+    return Kernel(ops, list(reversed(coeffs)))
+
+
+def integrate_kernel(Kernel k, double a, double b, long n):
+    """Левая сумма Римана для Kernel целиком в C без GIL."""
+    return k.offset_sum(a, (b - a) / n, n)
+
+
+ctypedef double (*cfunc_t)(double) noexcept nogil
+ctypedef double (*cfunc_data_t)(double, void*) noexcept nogil
+
+
+def cfunc_offset_sum(size_t address, size_t user_data, bint with_data,
+                     double a, double step, long n_iter, double offset=0.0):
+    """
+    Сумма f(a + (i + offset) * step) * step для C-функции по адресу.
+    
+    Функция имеет сигнатуру double(double) или, если with_data,
+    double(double, void*) и получает user_data вторым аргументом.
+    Цикл вызывает указатель напрямую без GIL.
+    """
+    if address == 0:
+        raise ValueError("Нулевой указатель на функцию")
+    cdef cfunc_t func = <cfunc_t>address
+    cdef cfunc_data_t func_data = <cfunc_data_t>address
+    cdef void* data = <void*>user_data
+    cdef double acc = 0.0
+    cdef long i
+    with nogil:
+        if with_data:
+            for i in range(n_iter):
+                acc += func_data(a + (i + offset) * step, data) * step
+        else:
+            for i in range(n_iter):
+                acc += func(a + (i + offset) * step) * step
+    return acc
 
-cdef extern from "math.h":
-    double cos(double x)
 
 def integrate_cos(double a, double b, int n):
     cdef double sum = 0.0
@@ -10,3 +301,19 @@ def integrate_cos(double a, double b, int n):
     for i in range(n):
         sum += cos(a + i * h) * h
     return sum
+
+def integrate_cos_nogil(double a, double b, Py_ssize_t n):
+    """
+    Левая сумма Римана для cos(x) без удержания GIL.
+    
+    Цикл выполняется в блоке nogil, поэтому несколько потоков
+    ThreadPoolExecutor считают свои части интервала параллельно.
+    n и индекс цикла - Py_ssize_t: n больше 2**31 - 1 не переполняется.
+    """
+    cdef double sum = 0.0
+    cdef double h = (b - a) / n
+    cdef Py_ssize_t i
+    with nogil:
+        for i in range(n):
+            sum += cos(a + i * h) * h
+    return sum
@@ -0,0 +1,223 @@
+"""
+Чистый Python/NumPy вариант API integrate_cython.
+
+Используется, если Cython-расширение не собрано: те же функции и
+Kernel, но программа Kernel вычисляется numpy на блоках точек.
+"""
+
+import ctypes
+import math
+import operator
+
+import numpy as np
+
+# Коды операций совпадают с enum в integrate_cython.pyx
+(OP_X, OP_CONST, OP_ADD, OP_SUB, OP_MUL, OP_DIV, OP_POW, OP_NEG,
+ OP_SIN, OP_COS, OP_TAN, OP_EXP, OP_LOG, OP_SQRT, OP_ABS) = range(15)
+
+MAX_STACK = 64
+
+# Число точек в одном блоке numpy
+CHUNK_SIZE = 65536
+
+UNARY = {
+    'sin': OP_SIN,
+    'cos': OP_COS,
+    'tan': OP_TAN,
+    'exp': OP_EXP,
+    'log': OP_LOG,
+    'sqrt': OP_SQRT,
+    'abs': OP_ABS,
+}
+
+BINARY = {
+    '+': OP_ADD,
+    '-': OP_SUB,
+    '*': OP_MUL,
+    '/': OP_DIV,
+    '**': OP_POW,
+}
+
+_UNARY_FUNCS = {
+    OP_NEG: np.negative,
+    OP_SIN: np.sin,
+    OP_COS: np.cos,
+    OP_TAN: np.tan,
+    OP_EXP: np.exp,
+    OP_LOG: np.log,
+    OP_SQRT: np.sqrt,
+    OP_ABS: np.abs,
+}
+
+_BINARY_FUNCS = {
+    OP_ADD: operator.add,
+    OP_SUB: operator.sub,
+    OP_MUL: operator.mul,
+    OP_DIV: operator.truediv,
+    OP_POW: np.power,
+}
+
+
+class Kernel:
+    """
+    Подынтегральная функция в виде программы стековой машины.
+    
+    Тот же интерфейс, что у Cython Kernel; k(x) принимает число
+    или массив numpy, offset_sum() считает сумму блоками numpy.
+    """
+    
+    def __init__(self, ops, consts=()):
+        self.ops = [int(op) for op in ops]
+        self.consts = [float(c) for c in consts]
+        self._validate()
+    
+    def _validate(self):
+        depth = max_depth = n_consts = 0
+        for op in self.ops:
+            if op in (OP_X, OP_CONST):
+                depth += 1
+                n_consts += op == OP_CONST
+            elif op in _UNARY_FUNCS:
+                if depth < 1:
+                    raise ValueError("Некорректная программа: не хватает операндов")
+            elif op in _BINARY_FUNCS:
+                if depth < 2:
+                    raise ValueError("Некорректная программа: не хватает операндов")
+                depth -= 1
+            else:
+                raise ValueError(f"Неизвестная операция: {op}")
+            max_depth = max(max_depth, depth)
+        if depth != 1 or n_consts != len(self.consts):
+            raise ValueError("Некорректная программа Kernel")
+        if max_depth > MAX_STACK:
+            raise ValueError(f"Слишком сложное выражение (глубина стека > {MAX_STACK})")
+    
+    def __call__(self, x):
+        scalar = np.ndim(x) == 0
+        x = np.asarray(x, dtype=float)
+        stack = []
+        consts = iter(self.consts)
+        with np.errstate(all='ignore'):
+            for op in self.ops:
+                if op == OP_X:
+                    stack.append(x)
+                elif op == OP_CONST:
+                    stack.append(next(consts))
+                elif op in _UNARY_FUNCS:
+                    stack.append(_UNARY_FUNCS[op](stack.pop()))
+                else:
+                    right = stack.pop()
+                    stack.append(_BINARY_FUNCS[op](stack.pop(), right))
+        result = np.broadcast_to(stack[0], x.shape)
+        return float(result) if scalar else result
+    
+    def offset_sum(self, a, step, n_iter, offset=0.0):
+        """Сумма k(a + (i + offset) * step) * step по i = 0..n_iter-1."""
+        acc = 0.0
+        for start in range(0, n_iter, CHUNK_SIZE):
+            stop = min(start + CHUNK_SIZE, n_iter)
+            acc += float(np.sum(self(a + (np.arange(start, stop) + offset) * step))) * step
+        return acc
+    
+    def apply(self, name):
+        """Композиция с функцией из каталога: k.apply("sin") == sin(k(x))."""
+        if name not in UNARY:
+            raise ValueError(f"Неизвестная функция: {name!r}, доступны {tuple(UNARY)}")
+        return Kernel(self.ops + [UNARY[name]], self.consts)
+    
+    def _binary(self, other, op, reflected=False):
+        if not isinstance(other, Kernel):
+            other = const(other)
+        left, right = (other, self) if reflected else (self, other)
+        return Kernel(left.ops + right.ops + [BINARY[op]], left.consts + right.consts)
+    
+    def __add__(self, other):
+        return self._binary(other, '+')
+    
+    def __radd__(self, other):
+        return self._binary(other, '+', True)
+    
+    def __sub__(self, other):
+        return self._binary(other, '-')
+    
+    def __rsub__(self, other):
+        return self._binary(other, '-', True)
+    
+    def __mul__(self, other):
+        return self._binary(other, '*')
+    
+    def __rmul__(self, other):
+        return self._binary(other, '*', True)
+    
+    def __truediv__(self, other):
+        return self._binary(other, '/')
+    
+    def __rtruediv__(self, other):
+        return self._binary(other, '/', True)
+    
+    def __pow__(self, other):
+        return self._binary(other, '**')
+    
+    def __rpow__(self, other):
+        return self._binary(other, '**', True)
+    
+    def __neg__(self):
+        return Kernel(self.ops + [OP_NEG], self.consts)
+    
+    def __repr__(self):
+        return f"Kernel(ops={self.ops}, consts={self.consts})"
+
+
+def kernel(name):
+    """Kernel из каталога по имени: "x" или одна из функций UNARY от x."""
+    if name == 'x':
+        return Kernel([OP_X])
+    if name not in UNARY:
+        raise ValueError(f"Неизвестная функция: {name!r}, доступны {('x',) + tuple(UNARY)}")
+    return Kernel([OP_X, UNARY[name]])
+
+
+def const(value):
+    """Kernel-константа."""
+    return Kernel([OP_CONST], [value])
+
+
+def poly(coeffs):
+    """Многочлен c0 + c1*x + c2*x^2 + ... (коэффициенты от младшего)."""
+    coeffs = [float(c) for c in coeffs]
+    if not coeffs:
+        raise ValueError("Нужен хотя бы один коэффициент")
+    ops = [OP_CONST]
+    for _ in range(len(coeffs) - 1):
+        ops += [OP_X, OP_MUL, OP_CONST, OP_ADD]
+    return Kernel(ops, list(reversed(coeffs)))
+
+
+def integrate_kernel(k, a, b, n):
+    """Левая сумма Римана для Kernel."""
+    return k.offset_sum(a, (b - a) / n, n)
+
+
+def cfunc_offset_sum(address, user_data, with_data, a, step, n_iter, offset=0.0):
+    """Сумма для C-функции по адресу с вызовами через ctypes."""
+    if address == 0:
+        raise ValueError("Нулевой указатель на функцию")
+    if with_data:
+        func = ctypes.CFUNCTYPE(ctypes.c_double, ctypes.c_double, ctypes.c_void_p)(address)
+        args = (user_data,)
+    else:
+        func = ctypes.CFUNCTYPE(ctypes.c_double, ctypes.c_double)(address)
+        args = ()
+    acc = 0.0
+    for i in range(n_iter):
+        acc += func(a + (i + offset) * step, *args) * step
+    return acc
+
+
+def integrate_cos(a, b, n):
+    """Левая сумма Римана для cos(x) на numpy."""
+    return kernel('cos').offset_sum(a, (b - a) / n, n)
+
+
+# numpy отпускает GIL внутри np.cos и np.sum
+integrate_cos_nogil = integrate_cos
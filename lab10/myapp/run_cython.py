@@ -1,7 +1,25 @@
-from distutils.core import setup, Extension
-from Cython.Distutils import build_ext
+"""
+Сборка Cython-расширения: python run_cython.py build_ext --inplace
+
+Каталог cython/ проекта совпадает с именем модуля cython из пакета Cython,
+а Cython запрещает модули с именем cython.*. Поэтому каталог проекта
+убирается из sys.path, а расширение собирается под именем
+cyext.integrate_cython и кладется в cython/ (package_dir), откуда
+импортируется как cython.integrate_cython.
+"""
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.resolve()
+sys.path = [p for p in sys.path if Path(p or '.').resolve() != ROOT]
+
+from setuptools import setup, Extension
+from Cython.Build import cythonize
 
 setup(
-    cmdclass={'build_ext': build_ext},
-    ext_modules=[Extension("cython.integrate_cython", ["cython/integrate_cython.pyx"])]
+    package_dir={'cyext': 'cython'},
+    ext_modules=cythonize(
+        [Extension("cyext.integrate_cython", ["cython/integrate_cython.pyx"])],
+        language_level=3,
+    ),
 )
@@ -4,13 +4,44 @@
 """
 
 from .integrate import integrate
-from .integrate_async import integrate_threads, integrate_processes
+from .integrate_async import integrate_threads, integrate_processes, IntegratorPool, integrate_many
+from .integrate_adaptive import integrate_adaptive, AdaptiveResult
+from .lowlevel import LowLevelCallable
+from .integrate_nd import integrate_nd, NDResult
+from .integrate_cache import IntegralCache
+from .expression import Expression, compile_expression
+from .stats import IntegrationStats
+from .cluster import integrate_cluster
+from .integrate_samples import integrate_samples
+from .integrate_sweep import integrate_sweep
+from .cumulative import cumulative_integrate, CumulativeIntegral
+from .autotune import integrate_auto
+# Имя модуля src.integrate_async занято, поэтому корутина экспортируется как aintegrate
+from .integrate_aio import integrate_async as aintegrate
 
 # Публичный API пакета
 __all__ = [
     'integrate',
     'integrate_threads', 
-    'integrate_processes'
+    'integrate_processes',
+    'IntegratorPool',
+    'integrate_many',
+    'integrate_adaptive',
+    'AdaptiveResult',
+    'LowLevelCallable',
+    'integrate_nd',
+    'NDResult',
+    'IntegralCache',
+    'Expression',
+    'compile_expression',
+    'IntegrationStats',
+    'integrate_cluster',
+    'integrate_samples',
+    'integrate_sweep',
+    'cumulative_integrate',
+    'CumulativeIntegral',
+    'integrate_auto',
+    'aintegrate'
 ]
 
 # Версия пакета
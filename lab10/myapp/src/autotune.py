@@ -0,0 +1,395 @@
+"""
+Автоматический выбор бэкенда, числа рабочих и размера куска.
+
+integrate_auto коротко замеряет стоимость одного шага для f (бэкенды
+"python" и "numpy" на небольшом n_iter) и по калибровке машины
+прогнозирует время каждого варианта:
+
+    время = накладные расходы(бэкенд, n_jobs) + n_iter * шаг(f) * доля(бэкенд, n_jobs)
+
+где накладные расходы и доля (во сколько раз параллельный шаг быстрее
+последовательного) получены бенчмарком на math.cos:
+
+    python benchmarks/benchmark.py --calibrate
+
+Калибровка сохраняется в results/calibration.json (путь можно задать
+переменной окружения INTEGRATE_CALIBRATION). Без нее используется
+осторожная оценка DEFAULT_CALIBRATION. Выбранный вариант пишется в
+журнал logging (логгер src.autotune, уровень INFO).
+"""
+
+import concurrent.futures as ftres
+import json
+import logging
+import math
+import os
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+
+from src.expression import as_expression
+from src.integrate import integrate
+from src.integrate_async import (CHUNKS_PER_WORKER, default_chunksize, gil_enabled,
+                                 integrate_processes, integrate_threads, thread_chunks_per_worker,
+                                 warm_up)
+from src.lowlevel import as_low_level
+from src.registry import resolve
+from src.stats import IntegrationStats
+
+logger = logging.getLogger(__name__)
+
+CALIBRATION_FILE = Path(os.environ.get(
+    'INTEGRATE_CALIBRATION', Path(__file__).parent.parent / 'results' / 'calibration.json'))
+
+# Бэкенды, которые выбирает integrate_auto
+BACKENDS = ('python', 'numpy', 'threads', 'processes', 'cython')
+
+# Бэкенды бенчмарка, по которым строится калибровка
+CALIBRATED = ('threads', 'processes', 'cython')
+
+# Замер стоимости f: начальное число шагов, бюджет времени (сек)
+# и наибольшая доля n_iter, которую можно потратить на замер
+SAMPLE_STEPS = 4
+SAMPLE_SECONDS = 0.02
+SAMPLE_FRACTION = 0.05
+
+# Во сколько раз параллельный вариант должен обгонять последовательный
+# по прогнозу: меньший выигрыш в пределах шума калибровки
+MIN_SPEEDUP = 1.2
+
+# Кусок должен считаться хотя бы во столько раз дольше, чем пересылка задачи
+TASK_OVERHEAD_RATIO = 20
+
+# Оценка без калибровки: накладные расходы пула (сек) и доля шага;
+# под GIL потоки с Python-кодом не ускоряют вычисление
+DEFAULT_CALIBRATION: Dict[str, Any] = {
+    'task_overhead': 1e-4,
+    'backends': {
+        'threads': {str(n): {'overhead': 2e-4 * n, 'ratio': 1.0 if gil_enabled() else 1.0 / n}
+                    for n in (1, 2, 4)},
+        'processes': {str(n): {'overhead': 0.05 + 0.02 * n, 'ratio': 1.0 / n} for n in (1, 2, 4)},
+        'cython': {str(n): {'overhead': 2e-4 * n, 'ratio': 1.0 / n} for n in (1, 2, 4)},
+    },
+}
+
+Calibration = Dict[str, Any]
+
+
+class CostSample(NamedTuple):
+    """Стоимость одного шага f (сек) и поддержка ядра без GIL."""
+    scalar: float
+    vector: float
+    nogil: bool
+
+
+@dataclass(frozen=True)
+class Plan:
+    """
+    Выбранный способ вычисления.
+    
+    Attributes:
+        backend: Один из BACKENDS
+        n_jobs: Число рабочих (1 для "python" и "numpy")
+        chunksize: Число шагов в куске для параллельных бэкендов
+        predicted: Прогноз времени вызова (сек)
+    """
+    backend: str
+    n_jobs: int = 1
+    chunksize: Optional[int] = None
+    predicted: float = 0.0
+
+
+def sample_cost(f: Union[Callable[[float], float], str],
+                a: float,
+                b: float,
+                *,
+                steps: int = SAMPLE_STEPS,
+                budget: float = SAMPLE_SECONDS,
+                max_steps: Optional[int] = None) -> CostSample:
+    """
+    Замеряет стоимость одного шага integrate для f на [a, b].
+    
+    Число шагов растет в 10 раз, пока замер не займет заметного
+    времени, не исчерпается бюджет или не будет достигнуто max_steps,
+    как в timeit.autorange. Начинается с нескольких шагов, чтобы
+    дорогая f не тратила на замер больше самого интеграла.
+    
+    Args:
+        f: Интегрируемая функция, строка-выражение или IntegrandRef
+        a, b: Границы интегрирования
+        steps: Начальное число шагов
+        budget: Бюджет времени на оба замера (сек)
+        max_steps: Наибольшее число шагов одного замера (без ограничения
+            по умолчанию)
+    
+    Returns:
+        CostSample: секунды на шаг для бэкендов "python" и "numpy"
+        (если f не векторизована, "numpy" сводится к циклу) и признак
+        того, что f считается в C без GIL (Cython Kernel, C-функция,
+        строка-выражение)
+    """
+    f = as_low_level(as_expression(resolve(f)))
+    nogil = hasattr(f, 'offset_sum')
+    max_steps = max_steps or math.inf
+    steps = max(1, min(steps, max_steps))
+    scalar = _step_time(f, a, b, steps, budget / 2, max_steps, 'python')
+    vector = _step_time(f, a, b, steps, budget / 2, max_steps, 'numpy')
+    return CostSample(scalar, vector, nogil)
+
+
+def _step_time(f: Callable, a: float, b: float, steps: int, budget: float,
+               max_steps: float, backend: str) -> float:
+    """Время одного шага (сек) по самому длинному замеру в пределах бюджета."""
+    spent = 0.0
+    while True:
+        start = time.perf_counter()
+        integrate(f, a, b, n_iter=steps, backend=backend)
+        elapsed = time.perf_counter() - start
+        spent += elapsed
+        if elapsed >= budget / 10 or spent + 10 * elapsed > budget or steps >= max_steps:
+            return elapsed / steps
+        steps = int(min(steps * 10, max_steps))
+
+
+def load_calibration(path: Union[str, os.PathLike, None] = None) -> Optional[Calibration]:
+    """
+    Читает калибровку, записанную benchmark.py --calibrate.
+    
+    Returns:
+        Словарь калибровки или None, если файла нет
+    """
+    path = Path(path or CALIBRATION_FILE)
+    try:
+        mtime = path.stat().st_mtime
+    except OSError:
+        return None
+    return _read_calibration(str(path), mtime)
+
+
+@lru_cache(maxsize=8)
+def _read_calibration(path: str, mtime: float) -> Calibration:
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)
+
+
+def fit_calibration(results: List[Dict[str, Any]],
+                    task_overhead: float,
+                    environment: Optional[Dict[str, Any]] = None) -> Calibration:
+    """
+    Строит калибровку по строкам бенчмарка (backend, n_iter, n_jobs, min_sec).
+    
+    Для каждого бэкенда и n_jobs время приближается прямой
+    overhead + n_iter * step по всем n_iter (МНК). ratio - отношение
+    step к шагу последовательного бэкенда на той же функции: "python"
+    для потоков и процессов, "cython" с n_jobs=1 для ядра без GIL.
+    
+    Args:
+        results: Строки benchmark.run_matrix, в том числе backend="python"
+        task_overhead: Время пересылки одной пустой задачи в пул процессов (сек)
+        environment: Описание машины
+    
+    Raises:
+        ValueError: Если нет замеров бэкенда "python"
+    """
+    lines = {}
+    for backend in ('python',) + CALIBRATED:
+        for n_jobs in sorted({row['n_jobs'] for row in results if row['backend'] == backend}):
+            points = [(row['n_iter'], row['min_sec']) for row in results
+                      if row['backend'] == backend and row['n_jobs'] == n_jobs]
+            lines[backend, n_jobs] = _fit_line(points)
+    if ('python', 1) not in lines:
+        raise ValueError("Для калибровки нужны замеры бэкенда python")
+    python_step = lines['python', 1][1]
+    
+    backends: Dict[str, Dict[str, Dict[str, float]]] = {}
+    for (backend, n_jobs), (overhead, step) in lines.items():
+        if backend == 'python':
+            continue
+        base = lines.get((backend, 1), (0.0, python_step))[1] if backend == 'cython' else python_step
+        backends.setdefault(backend, {})[str(n_jobs)] = {
+            'overhead': overhead, 'step': step, 'ratio': step / base,
+        }
+    return {
+        'environment': environment or {},
+        'python_step': python_step,
+        'task_overhead': task_overhead,
+        'backends': backends,
+    }
+
+
+def _fit_line(points: List[Tuple[int, float]]) -> Tuple[float, float]:
+    """(overhead, step) прямой t = overhead + n * step; оба не меньше нуля."""
+    n = np.array([point[0] for point in points], dtype=float)
+    t = np.array([point[1] for point in points], dtype=float)
+    if len(set(n)) < 2:
+        return 0.0, float(np.sum(t) / np.sum(n))
+    step, overhead = np.polyfit(n, t, 1)
+    if overhead < 0 or step <= 0:
+        return 0.0, float(np.sum(t) / np.sum(n))
+    return float(overhead), float(step)
+
+
+def measure_task_overhead(n_jobs: int = 2, tasks: int = 200) -> float:
+    """Время пересылки одной пустой задачи в запущенный пул процессов (сек)."""
+    with ftres.ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        warm_up(executor, n_jobs)
+        start = time.perf_counter()
+        for future in [executor.submit(os.getpid) for _ in range(tasks)]:
+            future.result()
+        return (time.perf_counter() - start) / tasks
+
+
+def choose_plan(f: Union[Callable[[float], float], str],
+                a: float,
+                b: float,
+                *,
+                n_iter: int = 100000,
+                max_jobs: Optional[int] = None,
+                calibration: Union[Calibration, str, os.PathLike, None] = None,
+                cost: Optional[CostSample] = None) -> Plan:
+    """
+    Выбирает вариант с наименьшим прогнозом времени.
+    
+    Параллельный вариант выбирается, только если по прогнозу он хотя бы
+    в MIN_SPEEDUP раз быстрее последовательного.
+    
+    Args:
+        f: Интегрируемая функция, строка-выражение или IntegrandRef
+        a, b: Границы интегрирования
+        n_iter: Количество шагов
+        max_jobs: Наибольшее число рабочих (по умолчанию os.cpu_count())
+        calibration: Словарь калибровки или путь к файлу
+            (по умолчанию CALIBRATION_FILE)
+        cost: Готовый замер sample_cost (по умолчанию замеряется не больше
+            чем на SAMPLE_FRACTION * n_iter шагах)
+    
+    Returns:
+        Plan: Бэкенд, число рабочих, размер куска и прогноз
+    """
+    if not isinstance(calibration, dict):
+        calibration = load_calibration(calibration)
+        if calibration is None:
+            logger.info("Калибровка не найдена, используется оценка по умолчанию "
+                        "(python benchmarks/benchmark.py --calibrate)")
+            calibration = DEFAULT_CALIBRATION
+    if cost is None:
+        cost = sample_cost(f, a, b, max_steps=max(1, int(n_iter * SAMPLE_FRACTION)))
+    max_jobs = max_jobs or os.cpu_count() or 1
+    min_chunk_seconds = TASK_OVERHEAD_RATIO * calibration.get('task_overhead', 0.0)
+    
+    plans = [Plan('python', predicted=n_iter * cost.scalar),
+             Plan('numpy', predicted=n_iter * cost.vector)]
+    for backend, by_jobs in calibration['backends'].items():
+        if backend not in CALIBRATED or (backend == 'cython') != cost.nogil:
+            # Ядро без GIL - только для f, считаемых в C; потоки - для остальных
+            continue
+        step = cost.scalar
+        chunks_per_worker = thread_chunks_per_worker() if backend == 'threads' else CHUNKS_PER_WORKER
+        for key, model in by_jobs.items():
+            n_jobs = int(key)
+            if n_jobs < 2 or n_jobs > max_jobs or n_jobs > n_iter:
+                continue
+            chunksize = _chunksize(n_iter, n_jobs, chunks_per_worker, step, min_chunk_seconds)
+            predicted = model['overhead'] + n_iter * step * model['ratio']
+            plans.append(Plan(backend, n_jobs, chunksize, predicted))
+    
+    serial = min(plans[:2], key=lambda plan: plan.predicted)
+    best = min(plans, key=lambda plan: plan.predicted)
+    if best.n_jobs > 1 and best.predicted * MIN_SPEEDUP > serial.predicted:
+        best = serial
+    for plan in sorted(plans, key=lambda plan: plan.predicted):
+        logger.debug("  %-9s n_jobs=%d: прогноз %.3g сек", plan.backend, plan.n_jobs,
+                     plan.predicted)
+    return best
+
+
+def _chunksize(n_iter: int, n_jobs: int, chunks_per_worker: int,
+               step: float, min_seconds: float) -> int:
+    """Размер куска: chunks_per_worker на рабочего, но не короче min_seconds."""
+    chunksize = default_chunksize(n_iter, n_jobs, chunks_per_worker)
+    if step > 0 and min_seconds > 0:
+        chunksize = max(chunksize, math.ceil(min_seconds / step))
+    return min(chunksize, math.ceil(n_iter / n_jobs))
+
+
+def integrate_auto(f: Union[Callable[[float], float], str],
+                   a: float,
+                   b: float,
+                   *,
+                   n_iter: int = 100000,
+                   max_jobs: Optional[int] = None,
+                   calibration: Union[Calibration, str, os.PathLike, None] = None,
+                   return_stats: bool = False) -> Union[float, Tuple[float, IntegrationStats]]:
+    """
+    Вычисляет интеграл (левые прямоугольники) самым быстрым для f способом.
+    
+    Вариант выбирает choose_plan; выбор пишется в журнал logging.
+    Результат совпадает с integrate(f, a, b, n_iter=n_iter) с точностью
+    до порядка суммирования кусков.
+    
+    Args:
+        f: Интегрируемая функция, строка-выражение или IntegrandRef
+            (для процессов f должна передаваться в рабочие, см. src.registry)
+        a, b: Границы интегрирования (b > a)
+        n_iter: Количество шагов
+        max_jobs: Наибольшее число рабочих (по умолчанию os.cpu_count())
+        calibration: Словарь калибровки или путь к файлу
+        return_stats: Вернуть также статистику выполнения (см. src.stats)
+    
+    Returns:
+        float: Значение интеграла; при return_stats=True -
+        кортеж (значение, IntegrationStats)
+    
+    Raises:
+        ValueError: Если b <= a или n_iter <= 0
+    
+    Examples:
+        >>> import math
+        >>> round(integrate_auto(math.cos, 0, math.pi / 2, n_iter=10000), 3)
+        1.0
+    """
+    if b <= a or n_iter <= 0:
+        raise ValueError("Требуется b > a и n_iter > 0")
+    plan = choose_plan(f, a, b, n_iter=n_iter, max_jobs=max_jobs, calibration=calibration)
+    logger.info("integrate_auto: %s, n_jobs=%d, chunksize=%s, n_iter=%d "
+                "(прогноз %.3g сек, GIL %s)", plan.backend, plan.n_jobs, plan.chunksize,
+                n_iter, plan.predicted, "включен" if gil_enabled() else "выключен")
+    return run_plan(plan, f, a, b, n_iter=n_iter, return_stats=return_stats)
+
+
+def run_plan(plan: Plan,
+             f: Union[Callable[[float], float], str],
+             a: float,
+             b: float,
+             *,
+             n_iter: int,
+             return_stats: bool = False) -> Union[float, Tuple[float, IntegrationStats]]:
+    """Вычисляет интеграл способом plan."""
+    if plan.backend in ('python', 'numpy'):
+        return integrate(f, a, b, n_iter=n_iter, backend=plan.backend, return_stats=return_stats)
+    if plan.backend == 'processes':
+        return integrate_processes(f, a, b, n_jobs=plan.n_jobs, n_iter=n_iter,
+                                   chunksize=plan.chunksize, return_stats=return_stats)
+    # Потоки вызывают integrate в том же процессе: строки компилируются один раз
+    f = as_low_level(as_expression(resolve(f)))
+    kernel = 'cython_nogil' if plan.backend == 'cython' else 'python'
+    return integrate_threads(f, a, b, n_jobs=plan.n_jobs, n_iter=n_iter, kernel=kernel,
+                             chunksize=plan.chunksize, return_stats=return_stats)
+
+
+# Тестовый запуск для проверки
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG, format="%(message)s")
+    
+    def heavy(x):
+        return sum(math.sin(x * k) for k in range(200))
+    
+    for name, f in (("math.cos", math.cos), ("np.cos", np.cos), ("строка", "sin(x) * exp(-x)"),
+                    ("тяжелая f", heavy)):
+        start = time.perf_counter()
+        value = integrate_auto(f, 0, 1, n_iter=200000)
+        print(f"{name}: {value:.8f} за {time.perf_counter() - start:.3f} сек\n")
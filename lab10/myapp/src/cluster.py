@@ -0,0 +1,369 @@
+"""
+Интегрирование на нескольких машинах через TCP-рабочих.
+
+Рабочий (serve_worker, python -m src.cluster --port 6000) принимает
+куски интервала по multiprocessing.connection и считает их функцией
+integrate. integrate_cluster раздает куски из общей очереди: каждый
+рабочий берет следующий кусок, как только отдал предыдущий, а куски
+упавших рабочих возвращаются в очередь и досчитываются остальными.
+
+Функции и результаты передаются через pickle: кто знает ключ, тот
+выполняет на рабочем произвольный код. Соединения проверяются ключом
+authkey (по умолчанию из переменной окружения INTEGRATE_AUTHKEY).
+Без явного ключа разрешены только адреса loopback: рабочие,
+запущенные start_worker, получают случайный ключ этого процесса.
+"""
+
+import argparse
+import ipaddress
+import multiprocessing as mp
+import os
+import socket
+import sys
+import threading
+import time
+from collections import deque
+from multiprocessing.connection import Client, Connection, Listener
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from src.integrate import GAUSS_ORDER, count_evals, integrate
+from src.integrate_async import CHUNKS_PER_WORKER, default_chunksize, split_steps
+from src.stats import IntegrationStats, pickled_size, timed_call
+
+Address = Tuple[str, int]
+
+AUTHKEY_ENV = 'INTEGRATE_AUTHKEY'
+
+# Случайный ключ для рабочих на этой машине, если INTEGRATE_AUTHKEY не задан
+_LOCAL_AUTHKEY = os.urandom(32)
+
+# Сколько раз кусок может потеряться вместе с рабочим, прежде чем вызов упадет
+RETRIES = 2
+
+
+def parse_address(address: Union[str, Address]) -> Address:
+    """
+    Приводит "host:port" или (host, port) к кортежу.
+    
+    Examples:
+        >>> parse_address("localhost:6000")
+        ('localhost', 6000)
+    """
+    if isinstance(address, str):
+        host, _, port = address.rpartition(':')
+        if not host or not port.isdigit():
+            raise ValueError(f"Адрес должен иметь вид host:port, получено {address!r}")
+        return host, int(port)
+    host, port = address
+    return host, int(port)
+
+
+def resolve_authkey(authkey: Optional[bytes], address: Address) -> bytes:
+    """
+    Ключ для соединения с address.
+    
+    Порядок: явный authkey, переменная окружения INTEGRATE_AUTHKEY,
+    случайный ключ процесса - только для адресов loopback.
+    
+    Raises:
+        ValueError: Если ключ не задан, а адрес доступен по сети
+    """
+    if authkey:
+        return authkey
+    env = os.environ.get(AUTHKEY_ENV)
+    if env:
+        return env.encode()
+    if _is_loopback(address[0]):
+        return _LOCAL_AUTHKEY
+    raise ValueError(f"Адрес {address[0]}:{address[1]} доступен по сети: задайте ключ "
+                     f"authkey или переменную окружения {AUTHKEY_ENV}")
+
+
+def _is_loopback(host: str) -> bool:
+    """True, если host разрешается только в адреса loopback."""
+    if host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        pass
+    try:
+        infos = socket.getaddrinfo(host, None)
+    except OSError:
+        return False
+    return bool(infos) and all(ipaddress.ip_address(info[4][0]).is_loopback for info in infos)
+
+
+def serve_worker(address: Union[str, Address] = ('localhost', 0),
+                 *,
+                 authkey: Optional[bytes] = None,
+                 ready: Optional[Connection] = None) -> None:
+    """
+    Запускает рабочего и обслуживает клиентов до остановки процесса.
+    
+    Каждое соединение обслуживается в своем потоке; по одному
+    соединению клиент присылает куски последовательно.
+    
+    Args:
+        address: Адрес для прослушивания (порт 0 - любой свободный)
+        authkey: Ключ, который должны предъявить клиенты (см. resolve_authkey)
+        ready: Если передан, в него отправляется фактический адрес
+    
+    Raises:
+        ValueError: Если адрес доступен по сети, а ключ не задан
+    """
+    address = parse_address(address)
+    with Listener(address, authkey=resolve_authkey(authkey, address)) as listener:
+        if ready is not None:
+            ready.send(listener.address)
+            ready.close()
+        while True:
+            try:
+                conn = listener.accept()
+            except (OSError, mp.AuthenticationError):
+                continue
+            threading.Thread(target=_serve_connection, args=(conn,), daemon=True).start()
+
+
+def _serve_connection(conn: Connection) -> None:
+    """Отвечает на запросы одного клиента, пока он не закроет соединение."""
+    with conn:
+        while True:
+            try:
+                command, *args = conn.recv()
+            except (EOFError, OSError):
+                return
+            except Exception as exc:
+                # Функцию не удалось восстановить из pickle на этом рабочем
+                conn.send(('error', exc))
+                continue
+            if command == 'ping':
+                conn.send(('ok', os.getpid()))
+                continue
+            f, lo, hi, steps, options = args
+            try:
+                n_evals = count_evals(options.get('method', 'left'), steps,
+                                      options.get('order', GAUSS_ORDER))
+                value, chunk = timed_call(integrate, n_evals, f, lo, hi, n_iter=steps, **options)
+            except Exception as exc:
+                conn.send(('error', exc))
+            else:
+                conn.send(('ok', (value, chunk)))
+
+
+def start_worker(host: str = 'localhost',
+                 port: int = 0,
+                 *,
+                 authkey: Optional[bytes] = None,
+                 timeout: float = 10.0) -> Tuple[mp.Process, Address]:
+    """
+    Запускает рабочего в отдельном процессе на этой машине.
+    
+    Returns:
+        (процесс, фактический адрес рабочего)
+    
+    Raises:
+        ValueError: Если адрес доступен по сети, а ключ не задан
+        RuntimeError: Если рабочий не запустился за timeout секунд
+    """
+    # Ключ определяется здесь: при spawn у дочернего процесса другой случайный ключ
+    authkey = resolve_authkey(authkey, (host, port))
+    receiver, sender = mp.Pipe(duplex=False)
+    process = mp.Process(target=serve_worker, args=((host, port),),
+                         kwargs={'authkey': authkey, 'ready': sender}, daemon=True)
+    process.start()
+    sender.close()
+    if not receiver.poll(timeout):
+        process.terminate()
+        raise RuntimeError(f"Рабочий на {host}:{port} не запустился за {timeout} сек")
+    return process, receiver.recv()
+
+
+class _Dispatcher:
+    """Общая очередь кусков для потоков, обслуживающих рабочих."""
+    
+    def __init__(self, n_chunks: int, n_workers: int, retries: int) -> None:
+        self.pending = deque(range(n_chunks))
+        self.results: Dict[int, Tuple[float, Any]] = {}
+        self.attempts = [0] * n_chunks
+        self.n_chunks = n_chunks
+        self.alive = n_workers
+        self.retries = retries
+        self.error: Optional[BaseException] = None
+        self.bytes_pickled = 0
+        self.condition = threading.Condition()
+    
+    @property
+    def finished(self) -> bool:
+        return self.error is not None or len(self.results) == self.n_chunks
+    
+    def take(self) -> Optional[int]:
+        """Следующий кусок; None, когда вызов завершен."""
+        with self.condition:
+            while not self.pending and not self.finished:
+                self.condition.wait()
+            return None if self.finished else self.pending.popleft()
+    
+    def done(self, index: int, result: Tuple[float, Any], n_bytes: int) -> None:
+        with self.condition:
+            self.results[index] = result
+            self.bytes_pickled += n_bytes
+            self.condition.notify_all()
+    
+    def abort(self, error: BaseException) -> None:
+        """Ошибка самой функции: повторять на другом рабочем бесполезно."""
+        with self.condition:
+            if self.error is None:
+                self.error = error
+            self.condition.notify_all()
+    
+    def worker_lost(self, index: Optional[int], failure: BaseException) -> None:
+        """Рабочий недоступен; его кусок возвращается в очередь."""
+        with self.condition:
+            self.alive -= 1
+            if index is not None:
+                self.attempts[index] += 1
+                if self.attempts[index] > self.retries:
+                    self._fail(f"Кусок {index} потерян {self.attempts[index]} раз", failure)
+                else:
+                    self.pending.appendleft(index)
+            if self.alive == 0 and not self.finished:
+                self._fail("Не осталось доступных рабочих", failure)
+            self.condition.notify_all()
+    
+    def _fail(self, message: str, failure: BaseException) -> None:
+        if self.error is None:
+            self.error = RuntimeError(message)
+            self.error.__cause__ = failure
+
+
+def _drive_worker(address: Address,
+                  dispatcher: _Dispatcher,
+                  chunks: List[Tuple[float, float, int]],
+                  f: Callable[[float], float],
+                  options: Dict[str, Any],
+                  authkey: bytes,
+                  timeout: Optional[float]) -> None:
+    """Отправляет куски одному рабочему по одному соединению."""
+    try:
+        conn = Client(address, authkey=authkey)
+    except (OSError, mp.AuthenticationError) as exc:
+        dispatcher.worker_lost(None, exc)
+        return
+    with conn:
+        while (index := dispatcher.take()) is not None:
+            lo, hi, steps = chunks[index]
+            message = ('integrate', f, lo, hi, steps, options)
+            try:
+                conn.send(message)
+                if timeout is not None and not conn.poll(timeout):
+                    raise TimeoutError(f"Рабочий {address[0]}:{address[1]} не ответил "
+                                       f"за {timeout} сек")
+                status, payload = conn.recv()
+            except (OSError, EOFError) as exc:
+                dispatcher.worker_lost(index, exc)
+                return
+            if status == 'error':
+                dispatcher.abort(payload)
+                return
+            dispatcher.done(index, payload, pickled_size(*message) + pickled_size(payload))
+
+
+def integrate_cluster(f: Union[Callable[[float], float], str],
+                      a: float,
+                      b: float,
+                      *,
+                      workers: Sequence[Union[str, Address]],
+                      n_iter: int = 1000,
+                      chunksize: Optional[int] = None,
+                      retries: int = RETRIES,
+                      timeout: Optional[float] = None,
+                      authkey: Optional[bytes] = None,
+                      return_stats: bool = False,
+                      **options: Any) -> Union[float, Tuple[float, IntegrationStats]]:
+    """
+    Вычисляет интеграл на удаленных рабочих (serve_worker).
+    
+    n_iter шагов точно делятся на куски по chunksize. Для каждого
+    рабочего открывается одно соединение, и куски раздаются из общей
+    очереди по мере освобождения рабочих, поэтому быстрые машины
+    получают больше кусков. Если рабочий отвалился или не ответил за
+    timeout, его кусок досчитывают остальные (не больше retries
+    повторов на кусок). Результаты суммируются в порядке кусков.
+    
+    Args:
+        f: Интегрируемая функция (сериализуемая pickle и импортируемая
+            на рабочих) или строка-выражение
+        a, b: Границы интегрирования (b > a)
+        workers: Адреса рабочих: "host:port" или (host, port)
+        n_iter: Общее количество шагов
+        chunksize: Число шагов в куске (по умолчанию около
+            CHUNKS_PER_WORKER кусков на рабочего)
+        retries: Сколько раз кусок может быть отправлен повторно
+        timeout: Максимальное время ответа на один кусок (сек)
+        authkey: Ключ доступа к рабочим (см. resolve_authkey)
+        return_stats: Вернуть также статистику выполнения (см. src.stats)
+        **options: Дополнительные аргументы integrate (method, backend, ...)
+    
+    Returns:
+        float: Значение интеграла; при return_stats=True -
+        кортеж (значение, IntegrationStats)
+    
+    Raises:
+        ValueError: Если b <= a, n_iter <= 0, список рабочих пуст или
+            для сетевого адреса не задан ключ
+        RuntimeError: Если не осталось рабочих или кусок потерян больше retries раз
+        Exception: Ошибка вычисления f на рабочем передается как есть
+    """
+    if b <= a or n_iter <= 0:
+        raise ValueError("Требуется b > a и n_iter > 0")
+    addresses = [parse_address(worker) for worker in workers]
+    if not addresses:
+        raise ValueError("Нужен хотя бы один рабочий")
+    if chunksize is None:
+        chunksize = default_chunksize(n_iter, len(addresses), CHUNKS_PER_WORKER)
+    chunks = split_steps(a, b, n_iter, chunksize)
+    keys = {address: resolve_authkey(authkey, address) for address in addresses}
+    
+    start = time.perf_counter()
+    dispatcher = _Dispatcher(len(chunks), len(addresses), retries)
+    threads = [
+        threading.Thread(target=_drive_worker, daemon=True,
+                         args=(address, dispatcher, chunks, f, options, keys[address], timeout))
+        for address in addresses
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if dispatcher.error is not None:
+        raise dispatcher.error
+    
+    results = [dispatcher.results[index] for index in range(len(chunks))]
+    value = sum(part for part, _ in results)
+    if not return_stats:
+        return value
+    elapsed = time.perf_counter() - start
+    stats = IntegrationStats('cluster', n_jobs=len(addresses),
+                             n_evals=sum(chunk.n_evals for _, chunk in results),
+                             compute=elapsed, total=elapsed,
+                             bytes_pickled=dispatcher.bytes_pickled)
+    stats.chunks.extend(chunk for _, chunk in results)
+    return value, stats
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Рабочий для integrate_cluster")
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--port', type=int, default=6000)
+    args = parser.parse_args(argv)
+    if not os.environ.get(AUTHKEY_ENV):
+        # Случайный ключ процесса не знает ни один клиент
+        sys.exit(f"Задайте общий с клиентами ключ в переменной окружения {AUTHKEY_ENV}")
+    print(f"Рабочий слушает {args.host}:{args.port} (ключ из {AUTHKEY_ENV})")
+    serve_worker((args.host, args.port))
+
+
+# Запуск рабочего: INTEGRATE_AUTHKEY=<секрет> python -m src.cluster --host 0.0.0.0 --port 6000
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Таблица первообразной F(t) = ∫_a^t f(x) dx для многократных запросов.
+Таблица строится один раз за O(n) векторизованно, после чего F(t)
+и F(t2) - F(t1) вычисляются интерполяцией без повторного интегрирования.
+"""
+
+import os
+from typing import Callable, Union
+
+import numpy as np
+
+from src.expression import as_expression
+from src.registry import resolve
+
+ArrayLike = Union[float, np.ndarray]
+
+
+class CumulativeIntegral:
+    """
+    Значения F и f = F' в узлах a + i * h, i = 0..n.
+    
+    Между узлами F восстанавливается кубическим интерполянтом Эрмита
+    по значениям и производным на концах части: погрешность O(h^4),
+    как у формулы Симпсона, по которой строится таблица. Узлы
+    равномерные, поэтому часть находится за O(1).
+    
+    Объект сериализуется pickle (только массивы numpy), а также
+    сохраняется в файл .npz методом save.
+    
+    Attributes:
+        a, b: Границы таблицы
+        values: F в узлах (values[0] = 0)
+        derivatives: f в узлах
+    """
+    
+    def __init__(self, a: float, b: float,
+                 values: np.ndarray, derivatives: np.ndarray) -> None:
+        values = np.asarray(values, dtype=float)
+        derivatives = np.asarray(derivatives, dtype=float)
+        if b <= a or values.ndim != 1 or len(values) < 2 or values.shape != derivatives.shape:
+            raise ValueError("Требуется b > a и одинаковые массивы хотя бы из двух узлов")
+        self.a = float(a)
+        self.b = float(b)
+        self.values = values
+        self.derivatives = derivatives
+        self.step = (self.b - self.a) / (len(values) - 1)
+    
+    @property
+    def total(self) -> float:
+        """∫_a^b f(x) dx."""
+        return float(self.values[-1])
+    
+    def __call__(self, t: ArrayLike) -> ArrayLike:
+        """
+        F(t) = ∫_a^t f(x) dx для числа или массива t из [a, b].
+        
+        Raises:
+            ValueError: Если t вне [a, b]
+        """
+        t = np.asarray(t, dtype=float)
+        if np.any((t < self.a) | (t > self.b)):
+            raise ValueError(f"t должно лежать в [{self.a}, {self.b}]")
+        position = (t - self.a) / self.step
+        i = np.clip(np.floor(position).astype(np.intp), 0, len(self.values) - 2)
+        s = position - i
+        h = self.step
+        # Базисные многочлены Эрмита на [0, 1]
+        h00 = (1 + 2 * s) * (1 - s) ** 2
+        h10 = s * (1 - s) ** 2
+        h01 = s ** 2 * (3 - 2 * s)
+        h11 = s ** 2 * (s - 1)
+        result = (h00 * self.values[i] + h10 * h * self.derivatives[i]
+                  + h01 * self.values[i + 1] + h11 * h * self.derivatives[i + 1])
+        return float(result) if result.ndim == 0 else result
+    
+    def between(self, t1: ArrayLike, t2: ArrayLike) -> ArrayLike:
+        """∫_{t1}^{t2} f(x) dx = F(t2) - F(t1)."""
+        return self(t2) - self(t1)
+    
+    def save(self, path: Union[str, os.PathLike]) -> None:
+        """Сохраняет таблицу в файл .npz."""
+        np.savez(path, bounds=np.array([self.a, self.b]),
+                 values=self.values, derivatives=self.derivatives)
+    
+    @classmethod
+    def load(cls, path: Union[str, os.PathLike]) -> 'CumulativeIntegral':
+        """Загружает таблицу, сохраненную save."""
+        with np.load(path) as data:
+            a, b = data['bounds']
+            return cls(a, b, data['values'], data['derivatives'])
+    
+    def __repr__(self) -> str:
+        return (f"CumulativeIntegral(a={self.a}, b={self.b}, "
+                f"n_iter={len(self.values) - 1}, total={self.total})")
+
+
+def cumulative_integrate(f: Union[Callable[[float], float], str],
+                         a: float,
+                         b: float,
+                         n_iter: int = 1000) -> CumulativeIntegral:
+    """
+    Строит таблицу F(t) = ∫_a^t f(x) dx на n_iter частях [a, b].
+    
+    f вычисляется один раз в 2 * n_iter + 1 точках (узлы и середины
+    частей, векторизованно, если f принимает массивы); приращения F
+    по частям считаются формулой Симпсона и накапливаются np.cumsum.
+    
+    Args:
+        f: Интегрируемая функция, строка-выражение или IntegrandRef
+        a, b: Границы (b > a)
+        n_iter: Число частей
+    
+    Returns:
+        CumulativeIntegral: Таблица с запросами F(t) и between(t1, t2)
+    
+    Raises:
+        ValueError: Если b <= a или n_iter <= 0
+    
+    Examples:
+        >>> import numpy as np
+        >>> F = cumulative_integrate(np.cos, 0, np.pi, n_iter=1000)
+        >>> round(F(np.pi / 2), 10), round(F.between(0.5, 1.0), 10)
+        (1.0, 0.3620454462)
+    """
+    if b <= a or n_iter <= 0:
+        raise ValueError("Требуется b > a и n_iter > 0")
+    f = as_expression(resolve(f))
+    y = _evaluate(f, np.linspace(a, b, 2 * n_iter + 1))
+    h = (b - a) / n_iter
+    increments = h / 6 * (y[0:-1:2] + 4 * y[1::2] + y[2::2])
+    values = np.concatenate(([0.0], np.cumsum(increments)))
+    return CumulativeIntegral(a, b, values, y[::2].copy())
+
+
+def _evaluate(f: Callable, x: np.ndarray) -> np.ndarray:
+    """f на массиве точек; скалярные функции вызываются в цикле."""
+    try:
+        with np.errstate(all='ignore'):
+            y = np.asarray(f(x), dtype=float)
+        if y.shape == x.shape:
+            return y
+    except (TypeError, ValueError):
+        pass
+    return np.fromiter((f(float(point)) for point in x), dtype=float, count=len(x))
+
+
+# Тестовый запуск для проверки
+if __name__ == "__main__":
+    import math
+    import time
+    
+    F = cumulative_integrate(math.exp, 0, 5, n_iter=100000)
+    queries = np.random.default_rng(0).uniform(0, 5, 1_000_000)
+    start = time.perf_counter()
+    results = F(queries)
+    elapsed = time.perf_counter() - start
+    error = np.max(np.abs(results - (np.exp(queries) - 1)))
+    print(f"{F}\n{len(queries)} запросов F(t) за {elapsed * 1000:.1f} мс, макс. ошибка {error:.2e}")
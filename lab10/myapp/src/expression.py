@@ -0,0 +1,171 @@
+"""
+Подынтегральные функции в виде строк: "x**2 + 2*x + 1".
+
+Выражение разбирается один раз (ast), проверяется по белому списку
+и компилируется в цепочку ufunc numpy и в Cython Kernel; результат
+кэшируется по тексту. При интегрировании значения считаются Kernel
+(в C, а без собранного расширения - блоками numpy), без вызова
+Python-функции на каждую точку.
+"""
+
+import ast
+import math
+from functools import lru_cache
+from typing import Any, Callable
+
+import numpy as np
+
+VARIABLE = 'x'
+
+FUNCTIONS = {
+    'sin': np.sin,
+    'cos': np.cos,
+    'tan': np.tan,
+    'exp': np.exp,
+    'log': np.log,
+    'sqrt': np.sqrt,
+    'abs': np.abs,
+}
+
+CONSTANTS = {
+    'pi': math.pi,
+    'e': math.e,
+}
+
+BINARY_OPS = {
+    ast.Add: ('+', np.add),
+    ast.Sub: ('-', np.subtract),
+    ast.Mult: ('*', np.multiply),
+    ast.Div: ('/', np.divide),
+    ast.Pow: ('**', np.power),
+}
+
+MAX_LENGTH = 1000
+
+
+class Expression:
+    """
+    Скомпилированное арифметическое выражение от x.
+    
+    Args:
+        source: Текст выражения: числа, x, pi, e, + - * / **,
+            функции из FUNCTIONS с одним аргументом
+    
+    Raises:
+        ValueError: Если выражение содержит что-то кроме разрешенного
+    
+    Examples:
+        >>> f = Expression("x**2 + 2*x + 1")
+        >>> f(3.0), f.source
+        (16.0, 'x ** 2 + 2 * x + 1')
+    """
+    
+    def __init__(self, source: str) -> None:
+        if len(source) > MAX_LENGTH:
+            raise ValueError(f"Выражение длиннее {MAX_LENGTH} символов")
+        try:
+            tree = ast.parse(source.strip(), mode='eval').body
+        except SyntaxError as exc:
+            raise ValueError(f"Синтаксическая ошибка в выражении {source!r}") from exc
+        self._tree = tree
+        self.source = ast.unparse(tree)
+        self._numpy = _compile_numpy(tree)
+        self._kernel = None
+    
+    def __call__(self, x: Any) -> Any:
+        """Значение в точке или на массиве numpy."""
+        with np.errstate(all='ignore'):
+            result = np.broadcast_to(self._numpy(np.asarray(x, dtype=float)), np.shape(x))
+        return float(result) if np.ndim(result) == 0 else result
+    
+    @property
+    def kernel(self) -> Any:
+        """Cython Kernel того же выражения (собирается при первом обращении)."""
+        if self._kernel is None:
+            self._kernel = _compile_kernel(self._tree)
+        return self._kernel
+    
+    def offset_sum(self, a: float, step: float, n_iter: int, offset: float = 0.0) -> float:
+        """Сумма f(a + (i + offset) * step) * step; протокол integrate()."""
+        return self.kernel.offset_sum(a, step, n_iter, offset)
+    
+    def __reduce__(self):
+        return compile_expression, (self.source,)
+    
+    def __repr__(self) -> str:
+        return f"Expression({self.source!r})"
+
+
+@lru_cache(maxsize=256)
+def compile_expression(source: str) -> Expression:
+    """Компилирует выражение с кэшированием по тексту."""
+    return Expression(source)
+
+
+def as_expression(f: Any) -> Any:
+    """Компилирует строку в Expression; остальные f возвращает как есть."""
+    return compile_expression(f) if isinstance(f, str) else f
+
+
+def _compile_numpy(node: ast.AST) -> Callable[[np.ndarray], Any]:
+    """Строит замыкание из ufunc numpy, проверяя каждый узел."""
+    if isinstance(node, ast.Constant):
+        value = _number(node)
+        return lambda x: value
+    if isinstance(node, ast.Name):
+        if node.id == VARIABLE:
+            return lambda x: x
+        if node.id in CONSTANTS:
+            value = CONSTANTS[node.id]
+            return lambda x: value
+        raise ValueError(f"Неизвестное имя: {node.id!r}")
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+        operand = _compile_numpy(node.operand)
+        if isinstance(node.op, ast.USub):
+            return lambda x: np.negative(operand(x))
+        return operand
+    if isinstance(node, ast.BinOp) and type(node.op) in BINARY_OPS:
+        ufunc = BINARY_OPS[type(node.op)][1]
+        left, right = _compile_numpy(node.left), _compile_numpy(node.right)
+        return lambda x: ufunc(left(x), right(x))
+    if isinstance(node, ast.Call):
+        name = _function_name(node)
+        ufunc = FUNCTIONS[name]
+        argument = _compile_numpy(node.args[0])
+        return lambda x: ufunc(argument(x))
+    raise ValueError(f"Недопустимая конструкция в выражении: {ast.unparse(node)!r}")
+
+
+def _compile_kernel(node: ast.AST) -> Any:
+    """Переводит проверенное дерево в Cython Kernel (или его numpy-замену)."""
+    import cython
+    if isinstance(node, ast.Constant):
+        return cython.const(_number(node))
+    if isinstance(node, ast.Name):
+        if node.id == VARIABLE:
+            return cython.kernel('x')
+        return cython.const(CONSTANTS[node.id])
+    if isinstance(node, ast.UnaryOp):
+        operand = _compile_kernel(node.operand)
+        return -operand if isinstance(node.op, ast.USub) else operand
+    if isinstance(node, ast.BinOp):
+        left, right = _compile_kernel(node.left), _compile_kernel(node.right)
+        symbol = BINARY_OPS[type(node.op)][0]
+        return {'+': left.__add__, '-': left.__sub__, '*': left.__mul__,
+                '/': left.__truediv__, '**': left.__pow__}[symbol](right)
+    return _compile_kernel(node.args[0]).apply(_function_name(node))
+
+
+def _number(node: ast.Constant) -> float:
+    if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+        raise ValueError(f"Допустимы только числа: {node.value!r}")
+    return float(node.value)
+
+
+def _function_name(node: ast.Call) -> str:
+    if not isinstance(node.func, ast.Name) or node.func.id not in FUNCTIONS:
+        raise ValueError(f"Неизвестная функция: {ast.unparse(node.func)!r}, "
+                         f"доступны {tuple(FUNCTIONS)}")
+    if len(node.args) != 1 or node.keywords:
+        raise ValueError(f"Функция {node.func.id} принимает ровно один аргумент")
+    return node.func.id
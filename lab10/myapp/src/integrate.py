@@ -1,16 +1,44 @@
 """
 Модуль для численного интегрирования методом прямоугольников.
 Итерация 1 лабораторной работы 10: Базовая реализация.
+Бэкенд "numpy" вычисляет f сразу на массивах точек (векторизация).
+Параметр method выбирает квадратурную формулу более высокого порядка.
+Cython Kernel (cython.kernel, cython.poly) считаются целиком в C.
+Строка "x**2 + 1" компилируется в Kernel (см. src.expression).
 """
 
 import math
-from typing import Callable
+from functools import lru_cache, partial
+from typing import Callable, Tuple, Union
 
-def integrate(f: Callable[[float], float], 
+import numpy as np
+
+from src.expression import as_expression
+from src.lowlevel import as_low_level
+from src.registry import resolve
+from src.stats import ChunkStats, IntegrationStats, worker_id
+
+# Максимальное число точек, вычисляемых за один вызов f в бэкенде numpy.
+# Ограничивает потребление памяти при любом n_iter.
+CHUNK_SIZE = 65536
+
+BACKENDS = ('python', 'numpy')
+
+METHODS = ('left', 'midpoint', 'trapezoid', 'simpson', 'gauss')
+
+GAUSS_ORDER = 3
+
+
+def integrate(f: Union[Callable[[float], float], str], 
               a: float, 
               b: float, 
               *, 
-              n_iter: int = 100000) -> float:
+              n_iter: int = 100000,
+              backend: str = 'python',
+              chunk_size: int = CHUNK_SIZE,
+              method: str = 'left',
+              order: int = GAUSS_ORDER,
+              return_stats: bool = False) -> Union[float, Tuple[float, IntegrationStats]]:
     """
     Вычисляет определенный интеграл функции f на интервале [a, b] 
     методом прямоугольников (левая сумма Римана).
@@ -18,18 +46,37 @@ def integrate(f: Callable[[float], float],
     Метод разбивает интервал [a, b] на n_iter равных частей и 
     аппроксимирует площадь под кривой f(x) суммой площадей 
     lевых прямоугольников. Точность O(h) возрастает с увеличением n_iter.
+    Остальные формулы (method) применяются к тем же n_iter частям:
+    
+    - "midpoint": средние прямоугольники, O(h^2)
+    - "trapezoid": трапеции, O(h^2)
+    - "simpson": формула Симпсона на каждой части, O(h^4)
+    - "gauss": Гаусс-Лежандр с order узлами на каждой части, O(h^(2*order))
     
     Args:
         f: Интегрируемая функция float -> float (должна быть векторизована)
+            или Cython Kernel - тогда суммы считаются в C без вызовов Python,
+            или указатель ctypes на C-функцию double(double) / LowLevelCallable,
+            или строка-выражение от x ("x**2 + 2*x + 1", "sin(x) * exp(-x)"),
+            или IntegrandRef из src.registry
         a: Нижняя граница интегрирования (float)
         b: Верхняя граница интегрирования (float, b > a обязательно)
         n_iter: Количество разбиений интервала (int > 0, по умолчанию 100000)
+        backend: "python" (цикл по точкам) или "numpy" (векторизованное
+            вычисление f на массивах; если f не принимает массивы,
+            автоматически используется цикл)
+        chunk_size: Число точек в одном массиве для бэкенда "numpy"
+        method: Квадратурная формула (см. METHODS, по умолчанию "left")
+        order: Число узлов Гаусса на часть для method="gauss"
+        return_stats: Вернуть также статистику выполнения (см. src.stats)
     
     Returns:
-        float: Приближенное значение ∫_a^b f(x) dx
+        float: Приближенное значение ∫_a^b f(x) dx;
+        при return_stats=True - кортеж (значение, IntegrationStats)
         
     Raises:
-        ValueError: Если b <= a или n_iter <= 0
+        ValueError: Если b <= a, n_iter <= 0, бэкенд или метод неизвестен,
+            выражение недопустимо
         
     Examples:
         >>> import math
@@ -40,19 +87,154 @@ def integrate(f: Callable[[float], float],
         ...     return x**2 + 2*x + 1
         >>> integrate(quadratic, 0, 1, n_iter=10000)
         1.7500625006248446
+        >>> round(integrate("x**2 + 2*x + 1", 0, 1, n_iter=10000), 4)
+        2.3332
     """
     if b <= a or n_iter <= 0:
         raise ValueError("Требуется b > a и n_iter > 0")
+    if backend not in BACKENDS:
+        raise ValueError(f"Неизвестный бэкенд: {backend!r}, доступны {BACKENDS}")
+    if method not in METHODS:
+        raise ValueError(f"Неизвестный метод: {method!r}, доступны {METHODS}")
+    if return_stats:
+        stats = IntegrationStats(backend, n_evals=count_evals(method, n_iter, order))
+        with stats.phase('compute'):
+            value = integrate(f, a, b, n_iter=n_iter, backend=backend,
+                              chunk_size=chunk_size, method=method, order=order)
+        stats.total = stats.compute
+        stats.chunks.append(ChunkStats(worker_id(), stats.n_evals, stats.compute))
+        return value, stats
     
-    acc = 0.0
+    f = as_low_level(as_expression(resolve(f)))
     step = (b - a) / n_iter
+    offset_sum = _offset_summer(f, a, step, n_iter, backend, chunk_size)
+    
+    if method == 'left':
+        return offset_sum(0)
+    if method == 'midpoint':
+        return offset_sum(0.5)
+    if method == 'gauss':
+        nodes, weights = gauss_legendre(order)
+        return sum(w * offset_sum(t) for t, w in zip(nodes, weights))
+    
+    trapezoid = offset_sum(0) + (float(f(b)) - float(f(a))) * step / 2
+    if method == 'trapezoid':
+        return trapezoid
+    # Симпсон на каждой части: S = (T + 2M) / 3
+    return (trapezoid + 2 * offset_sum(0.5)) / 3
+
+
+def panel_sum(f: Union[Callable[[float], float], str],
+              a: float,
+              b: float,
+              *,
+              n_iter: int,
+              offset: float = 0.0,
+              backend: str = 'python',
+              chunk_size: int = CHUNK_SIZE) -> float:
+    """
+    Сумма f(a + (i + offset) * h) * h по i = 0..n_iter-1, где h = (b - a) / n_iter.
+    
+    Строительный блок всех формул integrate: offset=0 - левые
+    прямоугольники, offset=0.5 - средние. Используется для уточнения
+    уже вычисленных сумм новыми узлами (см. integrate_cache).
+    
+    Raises:
+        ValueError: Если b <= a, n_iter <= 0 или бэкенд неизвестен
+    """
+    if b <= a or n_iter <= 0:
+        raise ValueError("Требуется b > a и n_iter > 0")
+    if backend not in BACKENDS:
+        raise ValueError(f"Неизвестный бэкенд: {backend!r}, доступны {BACKENDS}")
+    f = as_low_level(as_expression(resolve(f)))
+    return _offset_summer(f, a, (b - a) / n_iter, n_iter, backend, chunk_size)(offset)
+
+
+def _offset_summer(f: Callable, a: float, step: float, n_iter: int,
+                   backend: str, chunk_size: int) -> Callable[[float], float]:
+    """Выбирает реализацию суммы по узлам со сдвигом offset внутри частей."""
+    if hasattr(f, 'offset_sum'):
+        # Cython Kernel или C-функция: цикл целиком в C, бэкенд не важен
+        return partial(f.offset_sum, a, step, n_iter)
+    if backend == 'numpy' and _is_vectorized(f, a):
+        if chunk_size <= 0:
+            raise ValueError("chunk_size должен быть > 0")
+        return partial(_offset_sum_numpy, f, a, step, n_iter, chunk_size)
+    return partial(_offset_sum_python, f, a, step, n_iter)
+
+
+def count_evals(method: str, n_iter: int, order: int = GAUSS_ORDER) -> int:
+    """Число вычислений f формулой method на n_iter частях."""
+    if method in ('left', 'midpoint'):
+        return n_iter
+    if method == 'trapezoid':
+        return n_iter + 2
+    if method == 'simpson':
+        return 2 * n_iter + 2
+    return order * n_iter
+
+
+@lru_cache(maxsize=None)
+def gauss_legendre(order: int) -> Tuple[Tuple[float, ...], Tuple[float, ...]]:
+    """
+    Узлы и веса квадратуры Гаусса-Лежандра, перенесенные на отрезок [0, 1].
+    
+    Таблица вычисляется один раз для каждого порядка и кэшируется.
+    
+    Args:
+        order: Число узлов (int > 0)
+    
+    Returns:
+        Tuple: (узлы, веса); сумма весов равна 1
+    """
+    if order <= 0:
+        raise ValueError("order должен быть > 0")
+    nodes, weights = np.polynomial.legendre.leggauss(order)
+    return tuple((nodes + 1) / 2), tuple(weights / 2)
+
+
+def _offset_sum_python(f: Callable, a: float, step: float,
+                       n_iter: int, offset: float) -> float:
+    """Сумма f(a + (i + offset) * step) * step по i в цикле Python."""
+    acc = 0.0
     for i in range(n_iter):
-        acc += f(a + i * step) * step
+        acc += f(a + (i + offset) * step) * step
+    return acc
+
+
+def _offset_sum_numpy(f: Callable, a: float, step: float, n_iter: int,
+                      chunk_size: int, offset: float) -> float:
+    """Та же сумма, но f вычисляется на блоках из chunk_size точек."""
+    acc = 0.0
+    for start in range(0, n_iter, chunk_size):
+        stop = min(start + chunk_size, n_iter)
+        x = a + (np.arange(start, stop) + offset) * step
+        acc += float(np.sum(f(x))) * step
     return acc
 
 
+def _is_vectorized(f: Callable, a: float) -> bool:
+    """
+    Проверяет, что f принимает массив и возвращает массив той же формы.
+    
+    Скалярные функции (math.cos, константы) падают на массиве
+    или возвращают скаляр - для них используется цикл.
+    """
+    probe = np.array([a, a], dtype=float)
+    try:
+        y = f(probe)
+    except (TypeError, ValueError):
+        return False
+    return np.shape(y) == probe.shape
+
+
 # Тестовый запуск для проверки
 if __name__ == "__main__":
     print("Итерация 1: Базовая версия")
     result = integrate(math.cos, 0, math.pi, n_iter=1000)
     print(f"∫cos(x)dx от 0 до π = {result:.6f} (ожидается ~1.0)")
+    result = integrate(np.cos, 0, math.pi, n_iter=1000, backend='numpy')
+    print(f"numpy: ∫cos(x)dx от 0 до π = {result:.6f}")
+    for method in METHODS:
+        result = integrate(math.exp, 0, 1, n_iter=10, method=method)
+        print(f"{method:>9}: ∫exp(x)dx от 0 до 1, n_iter=10, ошибка {abs(result - (math.e - 1)):.2e}")
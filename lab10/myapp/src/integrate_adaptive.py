@@ -0,0 +1,143 @@
+"""
+Адаптивное интегрирование методом Симпсона с контролем погрешности.
+Вычисления тратятся только там, где функция меняется быстро.
+"""
+
+import math
+import warnings
+from typing import Callable, NamedTuple, Tuple, Union
+
+from src.stats import ChunkStats, IntegrationStats, worker_id
+
+
+# Бюджет вычислений f по умолчанию
+MAX_EVALS = 1_000_000
+
+
+class AdaptiveResult(NamedTuple):
+    """Результат адаптивного интегрирования."""
+    value: float
+    error: float
+    n_evals: int
+
+
+def integrate_adaptive(f: Callable[[float], float],
+                       a: float,
+                       b: float,
+                       *,
+                       tol: float = 1e-10,
+                       rtol: float = 1e-10,
+                       max_depth: int = 50,
+                       max_evals: int = MAX_EVALS,
+                       return_stats: bool = False) -> Union[AdaptiveResult,
+                                                            Tuple[AdaptiveResult, IntegrationStats]]:
+    """
+    Вычисляет ∫_a^b f(x) dx адаптивным методом Симпсона.
+    
+    Отрезок делится пополам до тех пор, пока разность между формулой
+    Симпсона на целом отрезке и на двух половинах не станет меньше
+    допуска (допуск при делении тоже делится пополам). К принятому
+    значению добавляется поправка Ричардсона (S2 - S1) / 15.
+    Каждое деление требует только 2 новых вычислений f.
+    
+    Допуск - max(tol, rtol * |S|), где S - формула Симпсона на всем
+    отрезке, поэтому для больших по модулю интегралов не требуется
+    недостижимая в double абсолютная точность. Когда число вычислений
+    f достигает max_evals, отрезки больше не делятся (начатые
+    досчитываются, это не больше 2 * max_depth вычислений сверх
+    бюджета), а выдается RuntimeWarning; для недоделенных отрезков в error
+    входит |S(left) + S(right) - S| без деления на 15. Отрезки, принятые
+    на глубине max_depth без достижения допуска, тоже дают RuntimeWarning.
+    
+    Args:
+        f: Интегрируемая функция float -> float
+        a: Нижняя граница интегрирования
+        b: Верхняя граница интегрирования (b > a)
+        tol: Допустимая абсолютная погрешность (> 0)
+        rtol: Допустимая относительная погрешность (>= 0)
+        max_depth: Максимальная глубина деления отрезка
+        max_evals: Бюджет вычислений f
+        return_stats: Вернуть также статистику выполнения (см. src.stats)
+    
+    Returns:
+        AdaptiveResult: значение интеграла, оценка погрешности
+        и число вычислений f; при return_stats=True - кортеж
+        (AdaptiveResult, IntegrationStats)
+    
+    Raises:
+        ValueError: Если b <= a, tol <= 0, rtol < 0 или max_evals < 3
+    
+    Warns:
+        RuntimeWarning: Если бюджет max_evals исчерпан или глубина max_depth
+            достигнута до достижения допуска
+    
+    Examples:
+        >>> import math
+        >>> result = integrate_adaptive(math.cos, 0, math.pi / 2, tol=1e-10)
+        >>> round(result.value, 10), result.n_evals < 500
+        (1.0, True)
+    """
+    if b <= a or tol <= 0 or rtol < 0:
+        raise ValueError("Требуется b > a, tol > 0 и rtol >= 0")
+    if max_evals < 3:
+        raise ValueError("max_evals должен быть не меньше 3")
+    if return_stats:
+        stats = IntegrationStats('adaptive')
+        with stats.phase('compute'):
+            result = integrate_adaptive(f, a, b, tol=tol, rtol=rtol, max_depth=max_depth,
+                                        max_evals=max_evals)
+        stats.total = stats.compute
+        stats.n_evals = result.n_evals
+        stats.chunks.append(ChunkStats(worker_id(), result.n_evals, stats.compute))
+        return result, stats
+    
+    m = (a + b) / 2
+    fa, fm, fb = f(a), f(m), f(b)
+    n_evals = 3
+    whole = (b - a) / 6 * (fa + 4 * fm + fb)
+    
+    value = 0.0
+    error = 0.0
+    exhausted = False
+    too_deep = 0
+    # Стек вместо рекурсии: (a, b, f(a), f(m), f(b), S(a, b), допуск, глубина)
+    stack = [(a, b, fa, fm, fb, whole, max(tol, rtol * abs(whole)), 0)]
+    while stack:
+        lo, hi, f_lo, f_mid, f_hi, whole, seg_tol, depth = stack.pop()
+        mid = (lo + hi) / 2
+        f_lmid = f((lo + mid) / 2)
+        f_rmid = f((mid + hi) / 2)
+        n_evals += 2
+        left = (mid - lo) / 6 * (f_lo + 4 * f_lmid + f_mid)
+        right = (hi - mid) / 6 * (f_mid + 4 * f_rmid + f_hi)
+        delta = left + right - whole
+        
+        converged = abs(delta) <= 15 * seg_tol
+        if not converged and n_evals >= max_evals:
+            # Поправка Ричардсона на грубом отрезке ненадежна - погрешность |delta|
+            exhausted = True
+            value += left + right
+            error += abs(delta)
+        elif converged or depth >= max_depth:
+            too_deep += not converged
+            value += left + right + delta / 15
+            error += abs(delta) / 15
+        else:
+            stack.append((mid, hi, f_mid, f_rmid, f_hi, right, seg_tol / 2, depth + 1))
+            stack.append((lo, mid, f_lo, f_lmid, f_mid, left, seg_tol / 2, depth + 1))
+    
+    if exhausted:
+        warnings.warn(f"integrate_adaptive: бюджет max_evals={max_evals} исчерпан, "
+                      f"оценка погрешности {error:.3g}", RuntimeWarning, stacklevel=2)
+    if too_deep:
+        warnings.warn(f"integrate_adaptive: на {too_deep} отрезках достигнута глубина "
+                      f"max_depth={max_depth} без достижения допуска, "
+                      f"оценка погрешности {error:.3g}", RuntimeWarning, stacklevel=2)
+    return AdaptiveResult(value, error, n_evals)
+
+
+# Тестовый запуск для проверки
+if __name__ == "__main__":
+    result = integrate_adaptive(math.sqrt, 0, 1, tol=1e-8)
+    print(f"∫sqrt(x)dx от 0 до 1 = {result.value:.10f} (ожидается {2 / 3:.10f})")
+    print(f"Оценка погрешности: {result.error:.2e}, вычислений f: {result.n_evals}")
@@ -0,0 +1,184 @@
+"""
+Асинхронное интегрирование для приложений на asyncio.
+Вычисления выполняются кусками в общем пуле, не блокируя цикл событий.
+"""
+
+import asyncio
+import math
+import os
+import threading
+from functools import partial
+from typing import Any, Callable, Iterable, Optional, Tuple, Union
+
+from src.integrate import GAUSS_ORDER, count_evals, integrate
+from src.integrate_async import IntegratorPool, split_steps
+from src.stats import IntegrationStats, pickled_size, timed_call
+
+# Число шагов в одном куске по умолчанию
+CHUNKSIZE = 50000
+
+_shared_pool: Optional[IntegratorPool] = None
+_shared_pool_lock = threading.Lock()
+
+
+def shared_pool() -> IntegratorPool:
+    """
+    Общий пул процессов для integrate_async (создается при первом вызове).
+    
+    Запуск процессов блокирует вызывающий поток, поэтому integrate_async
+    вызывает эту функцию в потоке run_in_executor, а не в цикле событий.
+    Одновременные вызовы создают один пул.
+    
+    Returns:
+        IntegratorPool с os.cpu_count() процессами
+    """
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = IntegratorPool(n_jobs=os.cpu_count() or 1)
+        return _shared_pool
+
+
+def shutdown_shared_pool() -> None:
+    """Останавливает общий пул; следующий вызов integrate_async создаст новый."""
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is not None:
+            _shared_pool.shutdown(cancel_futures=True)
+            _shared_pool = None
+
+
+async def integrate_async(f: Callable[[float], float],
+                          a: float,
+                          b: float,
+                          *,
+                          n_iter: int = 1000,
+                          chunksize: int = CHUNKSIZE,
+                          timeout: Optional[float] = None,
+                          pool: Optional[IntegratorPool] = None,
+                          max_in_flight: Optional[int] = None,
+                          return_stats: bool = False,
+                          **options: Any) -> Union[float, Tuple[float, IntegrationStats]]:
+    """
+    Вычисляет интеграл в пуле, не блокируя цикл событий asyncio.
+    
+    n_iter шагов точно делятся на куски по chunksize. Запрос держит в
+    очереди пула не больше max_in_flight кусков и отправляет следующий,
+    когда какой-то завершится, поэтому одновременные запросы делят пул
+    по очереди, а не ждут, пока один запрос займет его целиком.
+    При отмене или таймауте еще не начатые куски отменяются,
+    а новые не отправляются.
+    
+    Args:
+        f: Интегрируемая функция (для пула процессов - сериализуемая pickle)
+        a, b: Границы интегрирования (b > a)
+        n_iter: Общее количество шагов
+        chunksize: Число шагов в одном куске
+        timeout: Максимальное время вычисления (сек), None - без ограничения
+        pool: IntegratorPool; по умолчанию общий пул процессов (shared_pool,
+            при первом вызове создается вне цикла событий)
+        max_in_flight: Максимум одновременно отправленных кусков
+            (по умолчанию число рабочих пула)
+        return_stats: Вернуть также статистику выполнения (см. src.stats)
+        **options: Дополнительные аргументы integrate (method, backend, ...)
+    
+    Returns:
+        float: Значение интеграла; при return_stats=True -
+        кортеж (значение, IntegrationStats)
+    
+    Raises:
+        ValueError: Если b <= a, n_iter <= 0 или chunksize <= 0
+        asyncio.TimeoutError: Если вычисление не уложилось в timeout
+    
+    Examples:
+        >>> import asyncio, math
+        >>> with IntegratorPool(n_jobs=2, kind="threads") as pool:
+        ...     value = asyncio.run(integrate_async(math.cos, 0, math.pi / 2,
+        ...                                         n_iter=10000, chunksize=1000, pool=pool))
+        >>> round(value, 3)
+        1.0
+    """
+    if b <= a or n_iter <= 0:
+        raise ValueError("Требуется b > a и n_iter > 0")
+    chunks = split_steps(a, b, n_iter, chunksize)
+    if pool is None:
+        pool = _shared_pool or await asyncio.get_running_loop().run_in_executor(None, shared_pool)
+    if max_in_flight is None:
+        max_in_flight = pool.n_jobs
+    
+    part = partial(integrate, f, **options)
+    if not return_stats:
+        return await asyncio.wait_for(_run_chunks(pool, part, chunks, max_in_flight), timeout)
+    # Число вычислений f в куске зависит от формулы (см. count_evals)
+    count = partial(count_evals, options.get('method', 'left'),
+                    order=options.get('order', GAUSS_ORDER))
+    stats = IntegrationStats(f"async_{pool.kind}", n_jobs=pool.n_jobs,
+                             n_evals=sum(count(steps) for _, _, steps in chunks))
+    with stats.phase('total'):
+        value = await asyncio.wait_for(
+            _run_chunks(pool, part, chunks, max_in_flight, stats, count), timeout)
+    return value, stats
+
+
+async def _run_chunks(pool: IntegratorPool,
+                      part: Callable[..., float],
+                      chunks: Iterable[Tuple[float, float, int]],
+                      max_in_flight: int,
+                      stats: Optional[IntegrationStats] = None,
+                      count: Callable[[int], int] = lambda steps: steps) -> float:
+    """
+    Отправляет куски в пул не более max_in_flight за раз и суммирует результаты.
+    
+    Со stats фаза submit - время постановки кусков в пул, compute -
+    ожидание их завершения, reduce - сложение результатов; count дает
+    число вычислений f в куске из steps шагов.
+    """
+    chunks = iter(chunks)
+    pending = set()
+    total = 0.0
+    try:
+        while True:
+            while len(pending) < max_in_flight:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    break
+                lo, hi, steps = chunk
+                if stats is None:
+                    future = pool.submit(part, lo, hi, n_iter=steps)
+                else:
+                    with stats.phase('submit'):
+                        future = pool.submit(timed_call, part, count(steps), lo, hi,
+                                             n_iter=steps)
+                    if pool.kind == 'processes':
+                        stats.bytes_pickled += pickled_size(timed_call, part, count(steps), lo, hi,
+                                                            {'n_iter': steps})
+                pending.add(asyncio.wrap_future(future))
+            if not pending:
+                return total
+            if stats is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                total += sum(task.result() for task in done)
+                continue
+            with stats.phase('compute'):
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            with stats.phase('reduce'):
+                results = [task.result() for task in done]
+                total += sum(value for value, _ in results)
+            stats.chunks.extend(chunk for _, chunk in results)
+            if pool.kind == 'processes':
+                stats.bytes_pickled += sum(pickled_size(result) for result in results)
+    finally:
+        # Отмена asyncio-обертки отменяет и еще не начатую задачу пула
+        for task in pending:
+            task.cancel()
+
+
+# Тестовый запуск для проверки
+if __name__ == "__main__":
+    async def main():
+        requests = [integrate_async(math.sin, 0, b, n_iter=200000) for b in (1, 2, 3)]
+        for b, value in zip((1, 2, 3), await asyncio.gather(*requests)):
+            print(f"∫sin(x)dx от 0 до {b} = {value:.6f} (ожидается {1 - math.cos(b):.6f})")
+        shutdown_shared_pool()
+    
+    asyncio.run(main())
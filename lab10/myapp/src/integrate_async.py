@@ -1,85 +1,529 @@
 """
 Итерации 2-3: Параллельное интегрирование с потоками и процессами.
 Сравнение ThreadPoolExecutor vs ProcessPoolExecutor.
+IntegratorPool держит рабочие потоки/процессы между вызовами.
+integrate_many распределяет пакет интегралов по одному пулу.
 """
 
 import concurrent.futures as ftres
+import math
+import sys
+import time
 from functools import partial
-from typing import Callable
+from typing import Any, Callable, Hashable, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
+import numpy as np
 from src.integrate import integrate
+from src.lowlevel import as_low_level
+from src.registry import IntegrandRef, register, resolve, unregister, worker_options
+from src.stats import IntegrationStats, pickled_size, timed_call
+
+
+KERNELS = ('python', 'cython_nogil')
+
+
+def _integrate_cos_nogil(a: float, b: float, *, n_iter: int) -> float:
+    """
+    Обертка над Cython-ядром cos, отпускающим GIL на время цикла.
+    
+    Без собранного расширения используется numpy-вариант из cython.integrate_python.
+    """
+    from cython import integrate_cos_nogil
+    return integrate_cos_nogil(a, b, n_iter)
+
+
+def _thread_kernel(f: Callable[[float], float], kernel: str) -> Callable[..., float]:
+    """Возвращает функцию (a, b, n_iter=...) для интегрирования части интервала."""
+    if kernel == 'python':
+        return partial(integrate, f)
+    if kernel == 'cython_nogil':
+        f = as_low_level(f)
+        if hasattr(f, 'offset_sum'):
+            # Cython Kernel и C-функции сами отпускают GIL в integrate
+            return partial(integrate, f)
+        if f not in (math.cos, np.cos):
+            raise ValueError("Ядро cython_nogil поддерживает только f = cos, "
+                             "Cython Kernel и C-функции")
+        return _integrate_cos_nogil
+    raise ValueError(f"Неизвестное ядро: {kernel!r}, доступны {KERNELS}")
+
+
+# Число кусков на один процесс по умолчанию: запас для балансировки,
+# если стоимость f зависит от x
+CHUNKS_PER_WORKER = 8
+
+
+def gil_enabled() -> bool:
+    """
+    Выполняются ли потоки под GIL.
+    
+    False только на free-threaded сборке CPython (3.13t и новее),
+    запущенной без GIL (PYTHON_GIL=0 или по умолчанию).
+    """
+    is_enabled = getattr(sys, '_is_gil_enabled', None)
+    return True if is_enabled is None else is_enabled()
+
+
+def thread_chunks_per_worker() -> int:
+    """
+    Число кусков на поток по умолчанию.
+    
+    Под GIL потоки с Python-кодом все равно выполняются по очереди, и
+    лишние куски дают только накладные расходы - по одному на поток.
+    Без GIL потоки считают параллельно, и куски дробятся, как у процессов.
+    """
+    return 1 if gil_enabled() else CHUNKS_PER_WORKER
+
+
+def _submit_chunks(executor: ftres.Executor,
+                   integrate_part: Callable[..., float],
+                   a: float,
+                   b: float,
+                   n_iter: int,
+                   chunksize: int) -> List[ftres.Future]:
+    """
+    Точно разбивает n_iter шагов на куски по chunksize и отправляет их в executor.
+    
+    integrate_part вызывается как integrate_part(a_i, b_i, n_iter=...).
+    Куски ставятся в общую очередь: освободившийся рабочий берет следующий.
+    """
+    return [
+        executor.submit(integrate_part, lo, hi, n_iter=steps)
+        for lo, hi, steps in split_steps(a, b, n_iter, chunksize)
+    ]
+
+
+def _sum_chunks(executor: ftres.Executor,
+                integrate_part: Callable[..., float],
+                a: float,
+                b: float,
+                n_iter: int,
+                chunksize: int,
+                stats: Optional[IntegrationStats] = None) -> float:
+    """
+    Считает все куски в executor и суммирует их в порядке отправки.
+    
+    Со stats каждый кусок замеряется в рабочем (timed_call), фазы
+    submit/compute/reduce замеряются здесь, а для пула процессов
+    подсчитывается объем задач и результатов после pickle.
+    """
+    if stats is None:
+        futures = _submit_chunks(executor, integrate_part, a, b, n_iter, chunksize)
+        return sum(f.result() for f in futures)
+    chunks = split_steps(a, b, n_iter, chunksize)
+    with stats.phase('submit'):
+        futures = [executor.submit(timed_call, integrate_part, steps, lo, hi, n_iter=steps)
+                   for lo, hi, steps in chunks]
+    with stats.phase('compute'):
+        results = [f.result() for f in futures]
+    with stats.phase('reduce'):
+        value = sum(part for part, _ in results)
+    stats.n_evals += n_iter
+    stats.chunks.extend(chunk for _, chunk in results)
+    if isinstance(executor, ftres.ProcessPoolExecutor):
+        stats.bytes_pickled += sum(
+            pickled_size(timed_call, integrate_part, steps, lo, hi, {'n_iter': steps})
+            for lo, hi, steps in chunks
+        ) + sum(pickled_size(result) for result in results)
+    return value
+
+
+def _integrate_in(executor_class: Callable[..., ftres.Executor],
+                  n_jobs: int,
+                  integrate_part: Callable[..., float],
+                  a: float,
+                  b: float,
+                  n_iter: int,
+                  chunksize: int,
+                  stats: Optional[IntegrationStats] = None) -> float:
+    """
+    Создает executor на один вызов, считает куски и останавливает его.
+    
+    Со stats рабочие запускаются заранее (фаза spawn), чтобы время
+    их старта не смешивалось с вычислением.
+    """
+    if stats is None:
+        with executor_class(max_workers=n_jobs) as executor:
+            return _sum_chunks(executor, integrate_part, a, b, n_iter, chunksize)
+    with stats.phase('spawn'):
+        executor = executor_class(max_workers=n_jobs)
+        warm_up(executor, n_jobs)
+    with executor:
+        return _sum_chunks(executor, integrate_part, a, b, n_iter, chunksize, stats)
+
+
+def default_chunksize(n_iter: int, n_jobs: int, chunks_per_worker: int) -> int:
+    """Размер куска, дающий около n_jobs * chunks_per_worker кусков."""
+    return max(1, math.ceil(n_iter / (n_jobs * chunks_per_worker)))
+
+
+def split_steps(a: float, b: float, n_iter: int,
+                chunksize: int) -> List[Tuple[float, float, int]]:
+    """
+    Точно разбивает n_iter шагов на куски по chunksize шагов (последний короче).
+    
+    Returns:
+        Список (a_i, b_i, n_iter_i); сумма n_iter_i равна n_iter, а узлы
+        каждого куска совпадают с узлами исходной сетки на [a, b]
+    """
+    if n_iter <= 0 or chunksize <= 0:
+        raise ValueError("Требуется n_iter > 0 и chunksize > 0")
+    step = (b - a) / n_iter
+    return [
+        (a + start * step, a + min(start + chunksize, n_iter) * step,
+         min(chunksize, n_iter - start))
+        for start in range(0, n_iter, chunksize)
+    ]
+
+
+def _noop() -> None:
+    """Пустая задача для запуска рабочих процессов заранее."""
+
+
+def warm_up(executor: ftres.Executor, n_jobs: int) -> None:
+    """Запускает рабочих executor, не дожидаясь первой настоящей задачи."""
+    for future in [executor.submit(_noop) for _ in range(n_jobs)]:
+        future.result()
 
 def integrate_threads(f: Callable[[float], float], 
                      a: float, 
                      b: float, 
                      *, 
                      n_jobs: int = 2, 
-                     n_iter: int = 1000) -> float:
+                     n_iter: int = 1000,
+                     kernel: str = 'python',
+                     chunksize: Optional[int] = None,
+                     return_stats: bool = False) -> Union[float, Tuple[float, IntegrationStats]]:
     """
     Вычисляет интеграл параллельно с помощью потоков (ThreadPoolExecutor).
     
-    Разбивает интервал [a,b] на n_jobs частей и распределяет вычисления по потокам.
+    Разбивает n_iter шагов на куски (по умолчанию по одному на поток)
+    и распределяет вычисления по потокам.
     
     Args:
         f: Интегрируемая функция
         a, b: Границы интегрирования (b > a)
         n_jobs: Количество потоков (по умолчанию 2)
-        n_iter: Общее количество итераций (каждый поток получает n_iter//n_jobs)
+        n_iter: Общее количество итераций (все шаги, включая остаток от деления)
+        kernel: "python" (функция integrate) или "cython_nogil"
+            (Cython-цикл без GIL, для f = cos, Cython Kernel или C-функции)
+        chunksize: Число шагов в одном куске (по умолчанию
+            ceil(n_iter / n_jobs), без GIL - CHUNKS_PER_WORKER кусков на поток)
+        return_stats: Вернуть также статистику выполнения (см. src.stats)
     
     Returns:
-        float: Значение интеграла
+        float: Значение интеграла; при return_stats=True -
+        кортеж (значение, IntegrationStats)
+    
+    Raises:
+        ValueError: Если ядро неизвестно или не поддерживает f
     
     Note:
-        Из-за GIL потоки не дают ускорения для CPU-bound задач.
+        Из-за GIL потоки с ядром "python" не дают ускорения для CPU-bound задач.
+        Ядро "cython_nogil" отпускает GIL, и потоки выполняются параллельно.
+        На free-threaded CPython (gil_enabled() == False) параллельно
+        выполняется и ядро "python".
     """
-    executor = ftres.ThreadPoolExecutor(max_workers=n_jobs)
-    
-    step = (b - a) / n_jobs
-    partial_integrate = partial(integrate, f, n_iter=n_iter // n_jobs)
-    
-    futures = [
-        executor.submit(partial_integrate, a + i * step, a + (i + 1) * step)
-        for i in range(n_jobs)
-    ]
-    
-    executor.shutdown()
-    return sum(f.result() for f in futures)
+    integrate_part = _thread_kernel(f, kernel)
+    if chunksize is None:
+        chunksize = default_chunksize(n_iter, n_jobs, thread_chunks_per_worker())
+    if not return_stats:
+        return _integrate_in(ftres.ThreadPoolExecutor, n_jobs, integrate_part,
+                             a, b, n_iter, chunksize)
+    stats = IntegrationStats('threads' if gil_enabled() else 'threads_nogil', n_jobs=n_jobs)
+    with stats.phase('total'):
+        value = _integrate_in(ftres.ThreadPoolExecutor, n_jobs, integrate_part,
+                              a, b, n_iter, chunksize, stats)
+    return value, stats
 
 def integrate_processes(f: Callable[[float], float], 
                        a: float, 
                        b: float, 
                        *, 
                        n_jobs: int = 2, 
-                       n_iter: int = 1000) -> float:
+                       n_iter: int = 1000,
+                       chunksize: Optional[int] = None,
+                       return_stats: bool = False) -> Union[float, Tuple[float, IntegrationStats]]:
     """
     Вычисляет интеграл параллельно с помощью процессов (ProcessPoolExecutor).
     
+    n_iter шагов точно делятся на куски по chunksize шагов; кусков
+    намного больше, чем процессов, и освободившийся процесс берет
+    следующий кусок. Если f на части интервала считается дольше,
+    остальные процессы не простаивают до конца вызова.
+    
     Args:
-        f: Интегрируемая функция
+        f: Интегрируемая функция или IntegrandRef
         a, b: Границы интегрирования
         n_jobs: Количество процессов (по умолчанию 2)
-        n_iter: Общее количество итераций
+        n_iter: Общее количество итераций (все шаги, включая остаток от деления)
+        chunksize: Число шагов в одном куске
+            (по умолчанию около CHUNKS_PER_WORKER кусков на процесс)
+        return_stats: Вернуть также статистику выполнения (см. src.stats)
     
     Returns:
-        float: Значение интеграла
+        float: Значение интеграла; при return_stats=True -
+        кортеж (значение, IntegrationStats)
     
     Note:
         Процессы обходит GIL, обеспечивая настоящее параллельное выполнение.
+        f регистрируется в src.registry на время вызова: задачи содержат
+        только id и границы, а рабочие получают f при старте (при fork -
+        наследованием, поэтому подходят лямбды и замыкания).
+    """
+    if chunksize is None:
+        chunksize = default_chunksize(n_iter, n_jobs, CHUNKS_PER_WORKER)
+    # Задачи несут только ссылку на функцию; рабочие получают f при старте
+    ref = f if isinstance(f, IntegrandRef) else register(f)
+    try:
+        executor_class = partial(ftres.ProcessPoolExecutor, **worker_options([ref]))
+        if not return_stats:
+            return _integrate_in(executor_class, n_jobs, partial(integrate, ref),
+                                 a, b, n_iter, chunksize)
+        stats = IntegrationStats('processes', n_jobs=n_jobs)
+        with stats.phase('total'):
+            value = _integrate_in(executor_class, n_jobs, partial(integrate, ref),
+                                  a, b, n_iter, chunksize, stats)
+        return value, stats
+    finally:
+        if ref is not f:
+            unregister(ref)
+
+
+class IntegratorPool:
     """
-    with ftres.ProcessPoolExecutor(max_workers=n_jobs) as executor:
-        step = (b - a) / n_jobs
-        partial_integrate = partial(integrate, f, n_iter=n_iter // n_jobs)
+    Переиспользуемый пул потоков или процессов для многократного интегрирования.
+    
+    В отличие от integrate_threads/integrate_processes, которые создают
+    новый executor на каждый вызов, пул запускает рабочих один раз и
+    использует их для любого числа интегралов. Время старта процессов
+    платится один раз и амортизируется по всем вызовам.
+    
+    Функции из integrands регистрируются (src.registry) до запуска
+    рабочих; для них pool.integrate(ref, ...) передает в задачах только
+    id, а не pickle функции.
+    
+    Args:
+        n_jobs: Количество рабочих (по умолчанию 2)
+        kind: "processes" или "threads"
+        integrands: Функции или IntegrandRef, известные рабочим с момента старта
+        start_method: Способ запуска процессов (по умолчанию текущий)
+    
+    Attributes:
+        refs: IntegrandRef для integrands в том же порядке
+    
+    Examples:
+        >>> import math
+        >>> with IntegratorPool(n_jobs=2, kind="threads") as pool:
+        ...     round(pool.integrate(math.cos, 0, math.pi / 2, n_iter=10000), 3)
+        1.0
+    """
+    
+    KINDS = {
+        'processes': ftres.ProcessPoolExecutor,
+        'threads': ftres.ThreadPoolExecutor,
+    }
+    
+    def __init__(self, n_jobs: int = 2, *, kind: str = 'processes',
+                 integrands: Iterable[Any] = (),
+                 start_method: Optional[str] = None) -> None:
+        if kind not in self.KINDS:
+            raise ValueError(f"Неизвестный тип пула: {kind!r}, доступны {tuple(self.KINDS)}")
+        if n_jobs <= 0:
+            raise ValueError("n_jobs должен быть > 0")
+        self.n_jobs = n_jobs
+        self.kind = kind
+        self.calls = 0
+        self.total_time = 0.0
+        integrands = list(integrands)
+        self.refs = [f if isinstance(f, IntegrandRef) else register(f) for f in integrands]
+        self._owned_refs = [ref for f, ref in zip(integrands, self.refs) if ref is not f]
+        
+        start = time.perf_counter()
+        options = worker_options(self.refs, start_method) if kind == 'processes' else {}
+        self._executor = self.KINDS[kind](max_workers=n_jobs, **options)
+        # Запускаем всех рабочих сразу, а не при первом интеграле
+        warm_up(self._executor, n_jobs)
+        self.startup_time = time.perf_counter() - start
+    
+    def integrate(self,
+                  f: Callable[[float], float],
+                  a: float,
+                  b: float,
+                  *,
+                  n_iter: int = 1000,
+                  chunksize: Optional[int] = None,
+                  return_stats: bool = False) -> Union[float, Tuple[float, IntegrationStats]]:
+        """
+        Вычисляет интеграл на уже запущенных рабочих.
+        
+        Args:
+            f: Интегрируемая функция (для процессов должна сериализоваться pickle)
+                или IntegrandRef из refs
+            a, b: Границы интегрирования
+            n_iter: Общее количество итераций
+            chunksize: Число шагов в одном куске (по умолчанию как в
+                integrate_processes для процессов и как integrate_threads для потоков)
+            return_stats: Вернуть также статистику выполнения; фаза spawn
+                равна 0 - старт пула учтен в startup_time
         
-        futures = [
-            executor.submit(partial_integrate, a + i * step, a + (i + 1) * step)
-            for i in range(n_jobs)
-        ]
+        Returns:
+            float: Значение интеграла; при return_stats=True -
+            кортеж (значение, IntegrationStats)
         
-        return sum(f.result() for f in ftres.as_completed(futures))
+        Raises:
+            RuntimeError: Если пул уже закрыт
+        """
+        if self._executor is None:
+            raise RuntimeError("Пул закрыт")
+        if chunksize is None:
+            per_worker = (CHUNKS_PER_WORKER if self.kind == 'processes'
+                          else thread_chunks_per_worker())
+            chunksize = default_chunksize(n_iter, self.n_jobs, per_worker)
+        stats = IntegrationStats(f"pool_{self.kind}", n_jobs=self.n_jobs) if return_stats else None
+        start = time.perf_counter()
+        result = _sum_chunks(self._executor, partial(integrate, f), a, b, n_iter, chunksize, stats)
+        elapsed = time.perf_counter() - start
+        self.calls += 1
+        self.total_time += elapsed
+        if stats is None:
+            return result
+        stats.total = elapsed
+        return result, stats
+    
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> ftres.Future:
+        """
+        Отправляет произвольную задачу рабочим пула.
+        
+        Raises:
+            RuntimeError: Если пул уже закрыт
+        """
+        if self._executor is None:
+            raise RuntimeError("Пул закрыт")
+        return self._executor.submit(fn, *args, **kwargs)
+    
+    @property
+    def amortized_time(self) -> float:
+        """Среднее время вызова с учетом старта пула (сек)."""
+        if self.calls == 0:
+            return self.startup_time
+        return (self.startup_time + self.total_time) / self.calls
+    
+    def shutdown(self, *, cancel_futures: bool = False) -> None:
+        """
+        Останавливает рабочих и удаляет из реестра зарегистрированные
+        пулом функции. Повторный вызов безопасен.
+        
+        Args:
+            cancel_futures: Отменить задачи, которые еще не начали выполняться
+        """
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=cancel_futures)
+            self._executor = None
+            for ref in self._owned_refs:
+                unregister(ref)
+    
+    def __enter__(self) -> 'IntegratorPool':
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.shutdown()
+
+
+Job = Tuple[Any, ...]  # (f, a, b) или (f, a, b, {аргументы integrate})
+
+
+def _integrate_batch(batch: List[Tuple[Hashable, Job]],
+                     n_iter: int,
+                     return_stats: bool = False) -> List[Tuple[Hashable, Any]]:
+    """Вычисляет пакет заданий в одном рабочем процессе."""
+    results = []
+    for job_id, job in batch:
+        f, a, b, *rest = job
+        options = {'n_iter': n_iter, **(rest[0] if rest else {})}
+        results.append((job_id, integrate(f, a, b, return_stats=return_stats, **options)))
+    return results
+
+
+def integrate_many(jobs: Union[Mapping[Hashable, Job], Iterable[Job]],
+                   *,
+                   n_jobs: int = 2,
+                   chunksize: int = 1,
+                   n_iter: int = 1000,
+                   pool: Optional[IntegratorPool] = None,
+                   return_stats: bool = False) -> Iterator[Tuple[Hashable, Any]]:
+    """
+    Вычисляет много интегралов на одном пуле и отдает результаты по готовности.
+    
+    Задания группируются в пакеты по chunksize и все сразу ставятся в
+    очередь пула: освободившийся рабочий берет следующий пакет, поэтому
+    долгие задания не задерживают остальные (динамическая балансировка).
+    Результаты выдаются в порядке завершения, а не в порядке заданий.
+    
+    Функции заданий регистрируются (src.registry) до запуска временного
+    пула, поэтому подходят лямбды и замыкания, а в пакетах передаются
+    только IntegrandRef. Для переданного pool ссылки подставляются для
+    функций из pool.refs, остальные функции передаются pickle.
+    
+    Args:
+        jobs: Словарь {job_id: задание} или последовательность заданий
+            (тогда job_id - индекс). Задание - (f, a, b) или
+            (f, a, b, {аргументы integrate}), например {"method": "simpson"}
+        n_jobs: Количество процессов, если pool не передан
+        chunksize: Число заданий в одном пакете (больше - меньше накладных
+            расходов, меньше - лучше балансировка)
+        n_iter: n_iter по умолчанию для всех заданий
+        pool: Уже запущенный IntegratorPool; иначе создается временный пул процессов
+        return_stats: Выдавать также статистику каждого задания (см. src.stats):
+            фаза compute и кусок замеряются в рабочем, n_evals - по методу
+            задания, bytes_pickled - задание и результат
+    
+    Yields:
+        Tuple[job_id, float]: идентификатор задания и значение интеграла;
+        при return_stats=True - (job_id, (значение, IntegrationStats))
+    
+    Examples:
+        >>> import math
+        >>> jobs = {"cos": (math.cos, 0, math.pi / 2), "sin": (math.sin, 0, math.pi)}
+        >>> with IntegratorPool(n_jobs=2, kind="threads") as pool:
+        ...     results = dict(integrate_many(jobs, pool=pool, n_iter=10000))
+        >>> round(results["cos"], 3), round(results["sin"], 3)
+        (1.0, 2.0)
+    """
+    if chunksize <= 0:
+        raise ValueError("chunksize должен быть > 0")
+    items = list(jobs.items() if isinstance(jobs, Mapping) else enumerate(jobs))
+    
+    own_pool = pool is None
+    if own_pool:
+        functions = {id(job[0]): job[0] for _, job in items
+                     if not isinstance(job[0], IntegrandRef)}
+        pool = IntegratorPool(n_jobs=n_jobs, integrands=functions.values())
+        refs = dict(zip(functions, pool.refs))
+    else:
+        refs = {id(resolve(ref)): ref for ref in pool.refs}
+    items = [(job_id, (refs.get(id(job[0]), job[0]), *job[1:])) for job_id, job in items]
+    batches = [items[i:i + chunksize] for i in range(0, len(items), chunksize)]
+    jobs_by_id = dict(items)
+    try:
+        futures = [pool.submit(_integrate_batch, batch, n_iter, return_stats)
+                   for batch in batches]
+        for future in ftres.as_completed(futures):
+            if not return_stats:
+                yield from future.result()
+                continue
+            for job_id, (value, stats) in future.result():
+                stats.backend = f"many_{pool.kind}"
+                stats.n_jobs = pool.n_jobs
+                if pool.kind == 'processes':
+                    stats.bytes_pickled = pickled_size(jobs_by_id[job_id], (value, stats))
+                yield job_id, (value, stats)
+    finally:
+        if own_pool:
+            pool.shutdown(cancel_futures=True)
+
 
 # Тестирование
 if __name__ == "__main__":
-    import math
-    
     print("Итерация 2-3: Тестирование потоков и процессов")
     print("∫cos(x)dx от 0 до π")
     
@@ -0,0 +1,316 @@
+"""
+Кэш результатов integrate с уточнением по уже вычисленным узлам.
+
+Ключ - устойчивый идентификатор функции (модуль, имя и хэш байткода,
+констант, замыкания, используемых глобальных имен и состояния
+связанного объекта), границы, метод и n_iter. Функции, для которых
+ключ построить нельзя, вычисляются без кэша. Хранение - LRU в памяти
+и, по желанию, файл shelve на диске.
+"""
+
+import functools
+import hashlib
+import shelve
+import types
+from collections import OrderedDict
+from typing import Any, Callable, NamedTuple, Optional, Set, Tuple
+
+import numpy as np
+
+from src.expression import Expression, as_expression
+from src.integrate import integrate, panel_sum, CHUNK_SIZE, GAUSS_ORDER
+
+
+class CacheInfo(NamedTuple):
+    """Статистика кэша (как у functools.lru_cache)."""
+    hits: int
+    misses: int
+    refined: int  # результаты, полученные уточнением более грубых
+    currsize: int
+    maxsize: int
+
+
+def function_key(f: Any) -> str:
+    """
+    Устойчивый идентификатор функции, одинаковый между запусками.
+    
+    - Python-функции: модуль, qualname и хэш байткода, констант,
+      значений по умолчанию, переменных замыкания и глобальных имен,
+      на которые ссылается код
+    - связанные методы: ключ функции и состояние __self__
+    - functools.partial: ключ func, args и keywords
+    - встроенные функции и ufunc numpy: модуль и имя
+    - Cython Kernel: программа стековой машины
+    - строки-выражения: нормализованный текст выражения
+    - прочие вызываемые объекты: класс, код __call__ и атрибуты экземпляра
+    
+    Значения хэшируются целиком (массивы numpy - по байтам данных),
+    а не по repr, который для больших массивов сокращается; модули и
+    классы - по имени.
+    
+    Raises:
+        TypeError: Если для объекта нельзя построить устойчивый ключ
+    """
+    return _function_key(as_expression(f), set())
+
+
+def _function_key(f: Any, seen: Set[int]) -> str:
+    if isinstance(f, Expression):
+        return f"expr:{f.source}"
+    if hasattr(f, 'ops') and hasattr(f, 'consts'):
+        return f"kernel:{list(f.ops)}:{list(f.consts)}"
+    if isinstance(f, functools.partial):
+        digest = hashlib.sha256()
+        _hash_value(digest, (f.args, f.keywords or {}), seen)
+        return f"partial:{_function_key(f.func, seen)}:{digest.hexdigest()[:16]}"
+    if isinstance(f, types.MethodType):
+        digest = hashlib.sha256()
+        _hash_value(digest, f.__self__, seen)
+        return f"method:{_function_key(f.__func__, seen)}:{digest.hexdigest()[:16]}"
+    if isinstance(f, types.FunctionType):
+        digest = hashlib.sha256()
+        _hash_function(digest, f, seen)
+        return f"{f.__module__}:{f.__qualname__}:{digest.hexdigest()[:16]}"
+    if isinstance(f, (types.BuiltinFunctionType, np.ufunc)):
+        owner = getattr(f, '__self__', None)
+        name = f"{getattr(f, '__module__', None) or type(f).__module__}:{f.__qualname__}" \
+            if hasattr(f, '__qualname__') else f"numpy:{f.__name__}"
+        if owner is None or isinstance(owner, types.ModuleType):
+            return name
+        # Встроенный метод объекта (например, метод генератора случайных чисел)
+        digest = hashlib.sha256()
+        _hash_value(digest, owner, seen)
+        return f"{name}:{digest.hexdigest()[:16]}"
+    if callable(f) and hasattr(f, '__dict__') and not isinstance(f, type):
+        digest = hashlib.sha256()
+        call = getattr(type(f), '__call__', None)
+        if isinstance(call, types.FunctionType):
+            _hash_function(digest, call, seen)
+        _hash_value(digest, vars(f), seen)
+        return f"{type(f).__module__}:{type(f).__qualname__}:{digest.hexdigest()[:16]}"
+    raise TypeError(f"Нельзя построить ключ кэша для {f!r}")
+
+
+def _hash_function(digest: Any, f: types.FunctionType, seen: Set[int]) -> None:
+    """Байткод, умолчания, замыкание и используемые глобальные имена функции."""
+    if id(f) in seen:
+        # Рекурсивная функция: ссылка на себя уже учтена
+        digest.update(f"<rec {f.__qualname__}>".encode())
+        return
+    seen.add(id(f))
+    _hash_code(digest, f.__code__)
+    _hash_value(digest, (f.__defaults__, f.__kwdefaults__), seen)
+    for cell in f.__closure__ or ():
+        try:
+            _hash_value(digest, cell.cell_contents, seen)
+        except ValueError:
+            digest.update(b"<empty cell>")
+    for name in sorted(_global_names(f.__code__)):
+        if name in f.__globals__:
+            digest.update(name.encode())
+            _hash_value(digest, f.__globals__[name], seen)
+
+
+def _global_names(code: types.CodeType) -> Set[str]:
+    """Имена, которые код (и вложенные функции) может взять из глобальных."""
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names |= _global_names(const)
+    return names
+
+
+def _hash_value(digest: Any, value: Any, seen: Set[int]) -> None:
+    """
+    Добавляет в хэш значение целиком.
+    
+    Raises:
+        TypeError: Если состояние значения нельзя описать надежно
+    """
+    if value is None or isinstance(value, (bool, int, float, complex, str, bytes, np.generic)):
+        digest.update(f"{type(value).__name__}:{value!r};".encode())
+    elif isinstance(value, np.ndarray):
+        digest.update(f"ndarray:{value.dtype.str}:{value.shape};".encode())
+        digest.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, (tuple, list, frozenset, set)):
+        items = sorted(value, key=repr) if isinstance(value, (set, frozenset)) else value
+        digest.update(f"{type(value).__name__}:{len(items)}(".encode())
+        for item in items:
+            _hash_value(digest, item, seen)
+        digest.update(b")")
+    elif isinstance(value, dict):
+        digest.update(f"dict:{len(value)}(".encode())
+        for key in sorted(value, key=repr):
+            _hash_value(digest, key, seen)
+            _hash_value(digest, value[key], seen)
+        digest.update(b")")
+    elif isinstance(value, types.ModuleType):
+        digest.update(f"module:{value.__name__};".encode())
+    elif isinstance(value, type):
+        digest.update(f"type:{value.__module__}:{value.__qualname__};".encode())
+    elif callable(value):
+        digest.update(f"callable:{_function_key(value, seen)};".encode())
+    elif hasattr(value, '__dict__'):
+        if id(value) in seen:
+            digest.update(b"<cycle>")
+            return
+        seen.add(id(value))
+        digest.update(f"object:{type(value).__module__}:{type(value).__qualname__}".encode())
+        _hash_value(digest, vars(value), seen)
+    else:
+        raise TypeError(f"Нельзя построить ключ кэша по значению {type(value).__name__}")
+
+
+def _hash_code(digest: Any, code: types.CodeType) -> None:
+    """Добавляет в хэш байткод и константы (включая вложенные функции)."""
+    digest.update(code.co_code)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            _hash_code(digest, const)
+        else:
+            digest.update(repr(const).encode())
+    digest.update(repr(code.co_names).encode())
+
+
+class IntegralCache:
+    """
+    Мемоизация integrate с LRU-вытеснением и необязательным хранением на диске.
+    
+    При удвоении n_iter для методов "left" и "trapezoid" новые узлы -
+    это середины старых частей: R(2n) = (R(n) + M(n)) / 2, где M(n) -
+    средние прямоугольники, поэтому вычисляются только n новых значений f
+    вместо 2n. Для "midpoint" узлы вкладываются при утроении n_iter:
+    M(3n) = (M(n) + S(1/6) + S(5/6)) / 3.
+    
+    Args:
+        maxsize: Максимум записей в памяти
+        path: Файл shelve для хранения между запусками (None - только память)
+    
+    Examples:
+        >>> import math
+        >>> cache = IntegralCache()
+        >>> first = cache.integrate(math.sin, 0, 1, n_iter=1000, method='trapezoid')
+        >>> second = cache.integrate(math.sin, 0, 1, n_iter=2000, method='trapezoid')
+        >>> cache.info().refined, abs(second - (1 - math.cos(1))) < 1e-7
+        (1, True)
+    """
+    
+    def __init__(self, maxsize: int = 256, path: Optional[str] = None) -> None:
+        if maxsize <= 0:
+            raise ValueError("maxsize должен быть > 0")
+        self.maxsize = maxsize
+        self._memory: "OrderedDict[Tuple, float]" = OrderedDict()
+        self._disk = shelve.open(path) if path is not None else None
+        self._hits = self._misses = self._refined = 0
+    
+    def integrate(self,
+                  f: Callable[[float], float],
+                  a: float,
+                  b: float,
+                  *,
+                  n_iter: int = 100000,
+                  method: str = 'left',
+                  order: int = GAUSS_ORDER,
+                  backend: str = 'python',
+                  chunk_size: int = CHUNK_SIZE) -> float:
+        """
+        integrate() с кэшированием; аргументы те же.
+        
+        backend и chunk_size не входят в ключ: они не меняют значение
+        интеграла (кроме погрешности округления). Если для f нельзя
+        построить надежный ключ (function_key выбрасывает TypeError),
+        интеграл вычисляется без кэша.
+        """
+        compute = dict(backend=backend, chunk_size=chunk_size)
+        try:
+            key = function_key(f)
+        except TypeError:
+            self._misses += 1
+            options = {'order': order} if method == 'gauss' else {}
+            return integrate(f, a, b, n_iter=n_iter, method=method, **options, **compute)
+        base = (key, float(a), float(b), order if method == 'gauss' else None)
+        return self._get(f, base, method, n_iter, compute)
+    
+    def _get(self, f, base, method, n_iter, compute) -> float:
+        key = base + (method, n_iter)
+        value = self._lookup(key)
+        if value is not None:
+            self._hits += 1
+            return value
+        self._misses += 1
+        
+        _, a, b, order = base
+        if method in ('left', 'trapezoid') and n_iter % 2 == 0 \
+                and self._has_coarse(base, method, n_iter // 2, 2):
+            coarse = self._get(f, base, method, n_iter // 2, compute)
+            midpoint = self._get(f, base, 'midpoint', n_iter // 2, compute)
+            value = (coarse + midpoint) / 2
+            self._refined += 1
+        elif method == 'midpoint' and n_iter % 3 == 0 \
+                and self._has_coarse(base, method, n_iter // 3, 3):
+            coarse = self._get(f, base, method, n_iter // 3, compute)
+            new = sum(panel_sum(f, a, b, n_iter=n_iter // 3, offset=t, **compute)
+                      for t in (1 / 6, 5 / 6))
+            value = (coarse + new) / 3
+            self._refined += 1
+        else:
+            options = {'order': order} if method == 'gauss' else {}
+            value = integrate(f, a, b, n_iter=n_iter, method=method, **options, **compute)
+        self._store(key, value)
+        return value
+    
+    def _has_coarse(self, base, method, n_iter, factor) -> bool:
+        """Есть ли в кэше результат для n_iter, n_iter / factor, ..."""
+        while n_iter > 0:
+            if self._lookup(base + (method, n_iter), touch=False) is not None:
+                return True
+            if n_iter % factor:
+                return False
+            n_iter //= factor
+        return False
+    
+    def _lookup(self, key, touch: bool = True) -> Optional[float]:
+        if key in self._memory:
+            if touch:
+                self._memory.move_to_end(key)
+            return self._memory[key]
+        if self._disk is not None:
+            value = self._disk.get(repr(key))
+            if value is not None and touch:
+                self._remember(key, value)
+            return value
+        return None
+    
+    def _store(self, key, value: float) -> None:
+        self._remember(key, value)
+        if self._disk is not None:
+            self._disk[repr(key)] = value
+    
+    def _remember(self, key, value: float) -> None:
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+    
+    def info(self) -> CacheInfo:
+        """Статистика попаданий, промахов и уточнений."""
+        return CacheInfo(self._hits, self._misses, self._refined,
+                         len(self._memory), self.maxsize)
+    
+    def clear(self) -> None:
+        """Очищает кэш в памяти и на диске."""
+        self._memory.clear()
+        if self._disk is not None:
+            self._disk.clear()
+    
+    def close(self) -> None:
+        """Закрывает файл на диске."""
+        if self._disk is not None:
+            self._disk.close()
+            self._disk = None
+    
+    def __enter__(self) -> 'IntegralCache':
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
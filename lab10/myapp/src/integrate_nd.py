@@ -0,0 +1,231 @@
+"""
+Многомерное интегрирование по прямоугольным областям.
+Сетка средних точек, Монте-Карло и квази-Монте-Карло (рандомизированная
+последовательность Холтона); точки обрабатываются пакетами numpy.
+"""
+
+import concurrent.futures as ftres
+import math
+from functools import partial
+from typing import Callable, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from src.integrate_async import warm_up
+from src.stats import IntegrationStats, pickled_size, timed_call
+
+METHODS = ('grid', 'mc', 'qmc')
+
+# Число точек в одном пакете (ограничивает память)
+BATCH_SIZE = 65536
+
+# Число независимых сдвигов последовательности Холтона для оценки погрешности
+QMC_REPLICAS = 8
+
+_PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+
+
+class NDResult(NamedTuple):
+    """Результат многомерного интегрирования."""
+    value: float
+    error: Optional[float]  # None для сетки
+    n_evals: int
+
+
+def integrate_nd(f: Callable[..., np.ndarray],
+                 bounds: Sequence[Tuple[float, float]],
+                 *,
+                 method: str = 'grid',
+                 n_points: int = 100000,
+                 n_jobs: int = 1,
+                 batch_size: int = BATCH_SIZE,
+                 seed: Optional[int] = None,
+                 return_stats: bool = False) -> Union[NDResult, Tuple[NDResult, IntegrationStats]]:
+    """
+    Вычисляет интеграл f по прямоугольной области bounds.
+    
+    f векторизована: получает d массивов координат одинаковой длины
+    f(x1, x2, ..., xd) и возвращает массив значений.
+    
+    - "grid": сетка средних точек, m = n_points^(1/d) узлов по каждой оси
+    - "mc": Монте-Карло, погрешность - стандартная ошибка среднего
+    - "qmc": квази-Монте-Карло по последовательности Холтона со случайными
+      сдвигами; погрешность - разброс между QMC_REPLICAS сдвигами
+    
+    Args:
+        f: Векторизованная функция d переменных
+        bounds: Границы [(a1, b1), ..., (ad, bd)], ai < bi
+        method: "grid", "mc" или "qmc"
+        n_points: Общее число точек
+        n_jobs: Число процессов (> 1 - пакеты считаются в ProcessPoolExecutor,
+            f должна сериализоваться pickle)
+        batch_size: Число точек в одном пакете
+        seed: Зерно генератора для "mc" и "qmc"
+        return_stats: Вернуть также статистику выполнения (см. src.stats)
+    
+    Returns:
+        NDResult: значение, оценка погрешности и число вычислений f;
+        при return_stats=True - кортеж (NDResult, IntegrationStats)
+    
+    Raises:
+        ValueError: Если границы, метод или параметры некорректны
+    
+    Examples:
+        >>> result = integrate_nd(lambda x, y: x * y, [(0, 1), (0, 2)], n_points=10000)
+        >>> round(result.value, 6), result.error, result.n_evals
+        (1.0, None, 10000)
+    """
+    lows = np.array([lo for lo, _ in bounds], dtype=float)
+    highs = np.array([hi for _, hi in bounds], dtype=float)
+    dim = len(lows)
+    if dim == 0 or np.any(highs <= lows):
+        raise ValueError("Требуется хотя бы одна ось и a < b по каждой оси")
+    if method not in METHODS:
+        raise ValueError(f"Неизвестный метод: {method!r}, доступны {METHODS}")
+    if n_points <= 0 or batch_size <= 0 or n_jobs <= 0:
+        raise ValueError("n_points, batch_size и n_jobs должны быть > 0")
+    if method == 'qmc' and dim > len(_PRIMES):
+        raise ValueError(f"qmc поддерживает до {len(_PRIMES)} измерений")
+    if return_stats:
+        stats = IntegrationStats(f"nd_{method}", n_jobs=n_jobs)
+        with stats.phase('total'):
+            result = _integrate_nd(f, lows, highs, method, n_points, n_jobs,
+                                   batch_size, seed, stats)
+        stats.n_evals = result.n_evals
+        return result, stats
+    return _integrate_nd(f, lows, highs, method, n_points, n_jobs, batch_size, seed)
+
+
+def _integrate_nd(f: Callable[..., np.ndarray], lows: np.ndarray, highs: np.ndarray,
+                  method: str, n_points: int, n_jobs: int, batch_size: int,
+                  seed: Optional[int],
+                  stats: Optional[IntegrationStats] = None) -> NDResult:
+    """Тело integrate_nd после проверки аргументов."""
+    dim = len(lows)
+    volume = float(np.prod(highs - lows))
+    
+    if method == 'grid':
+        per_axis = max(1, round(n_points ** (1 / dim)))
+        total = per_axis ** dim
+        tasks = [(start, min(start + batch_size, total))
+                 for start in range(0, total, batch_size)]
+        worker = partial(_grid_batch, f, lows, highs, per_axis)
+        sums = _run(worker, tasks, n_jobs, stats)
+        return NDResult(volume * sum(s for s, _ in sums) / total, None, total)
+    
+    seeds = np.random.SeedSequence(seed)
+    if method == 'mc':
+        tasks = [(start, min(start + batch_size, n_points), child)
+                 for start, child in zip(range(0, n_points, batch_size),
+                                         seeds.spawn(math.ceil(n_points / batch_size)))]
+        worker = partial(_mc_batch, f, lows, highs)
+        moments = _run(worker, tasks, n_jobs, stats)
+        total_sum = sum(s for s, _ in moments)
+        total_sq = sum(q for _, q in moments)
+        mean = total_sum / n_points
+        variance = max(total_sq / n_points - mean ** 2, 0.0)
+        return NDResult(volume * mean, volume * math.sqrt(variance / n_points), n_points)
+    
+    # qmc: одни и те же точки Холтона с разными случайными сдвигами
+    replicas = min(QMC_REPLICAS, n_points)
+    per_replica = n_points // replicas
+    shifts = np.random.default_rng(seeds).random((replicas, dim))
+    tasks = [(start, min(start + batch_size, per_replica), replica)
+             for replica in range(replicas)
+             for start in range(0, per_replica, batch_size)]
+    worker = partial(_qmc_batch, f, lows, highs, shifts)
+    sums = _run(worker, tasks, n_jobs, stats)
+    estimates = np.zeros(replicas)
+    for (_, _, replica), (s, _) in zip(tasks, sums):
+        estimates[replica] += s
+    estimates *= volume / per_replica
+    error = float(np.std(estimates, ddof=1) / math.sqrt(replicas)) if replicas > 1 else math.inf
+    return NDResult(float(np.mean(estimates)), error, per_replica * replicas)
+
+
+def halton(indices: np.ndarray, dim: int) -> np.ndarray:
+    """
+    Точки последовательности Холтона с номерами indices в [0, 1)^dim.
+    
+    Координата j - обращение номера в системе счисления с j-м простым основанием.
+    """
+    points = np.zeros((len(indices), dim))
+    for j, base in enumerate(_PRIMES[:dim]):
+        n = np.asarray(indices, dtype=np.int64) + 1  # пропускаем нулевую точку
+        factor = 1.0 / base
+        while np.any(n > 0):
+            n, digit = np.divmod(n, base)
+            points[:, j] += digit * factor
+            factor /= base
+    return points
+
+
+def _evaluate(f: Callable, points: np.ndarray) -> np.ndarray:
+    """Вычисляет f на точках (n, d) и приводит результат к массиву длины n."""
+    return np.broadcast_to(np.asarray(f(*points.T), dtype=float), (len(points),))
+
+
+def _grid_batch(f, lows, highs, per_axis, task) -> Tuple[float, float]:
+    start, stop = task
+    index = np.unravel_index(np.arange(start, stop), (per_axis,) * len(lows))
+    points = lows + (np.stack(index, axis=1) + 0.5) * (highs - lows) / per_axis
+    return float(np.sum(_evaluate(f, points))), 0.0
+
+
+def _mc_batch(f, lows, highs, task) -> Tuple[float, float]:
+    start, stop, seed = task
+    rng = np.random.default_rng(seed)
+    points = lows + rng.random((stop - start, len(lows))) * (highs - lows)
+    values = _evaluate(f, points)
+    return float(np.sum(values)), float(np.sum(values ** 2))
+
+
+def _qmc_batch(f, lows, highs, shifts, task) -> Tuple[float, float]:
+    start, stop, replica = task
+    unit = (halton(np.arange(start, stop), len(lows)) + shifts[replica]) % 1.0
+    return float(np.sum(_evaluate(f, lows + unit * (highs - lows)))), 0.0
+
+
+def _run(worker: Callable, tasks: List, n_jobs: int,
+         stats: Optional[IntegrationStats] = None) -> List[Tuple[float, float]]:
+    """Выполняет пакеты последовательно или в пуле процессов."""
+    if stats is not None:
+        return _run_timed(worker, tasks, n_jobs, stats)
+    if n_jobs == 1:
+        return [worker(task) for task in tasks]
+    with ftres.ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        return list(executor.map(worker, tasks))
+
+
+def _run_timed(worker: Callable, tasks: List, n_jobs: int,
+               stats: IntegrationStats) -> List[Tuple[float, float]]:
+    """_run с замером фаз и каждого пакета."""
+    sizes = [task[1] - task[0] for task in tasks]
+    if n_jobs == 1:
+        with stats.phase('compute'):
+            results = [timed_call(worker, size, task) for size, task in zip(sizes, tasks)]
+    else:
+        with stats.phase('spawn'):
+            executor = ftres.ProcessPoolExecutor(max_workers=n_jobs)
+            warm_up(executor, n_jobs)
+        with executor:
+            with stats.phase('submit'):
+                futures = [executor.submit(timed_call, worker, size, task)
+                           for size, task in zip(sizes, tasks)]
+            with stats.phase('compute'):
+                results = [future.result() for future in futures]
+        stats.bytes_pickled += sum(pickled_size(timed_call, worker, size, task)
+                                   for size, task in zip(sizes, tasks))
+        stats.bytes_pickled += sum(pickled_size(result) for result in results)
+    stats.chunks.extend(chunk for _, chunk in results)
+    return [value for value, _ in results]
+
+
+# Тестовый запуск для проверки
+if __name__ == "__main__":
+    gauss = lambda *xs: np.exp(-sum(x ** 2 for x in xs))
+    exact = (math.sqrt(math.pi) * math.erf(1)) ** 4  # ∫exp(-|x|^2) по [-1, 1]^4
+    for method in METHODS:
+        result = integrate_nd(gauss, [(-1, 1)] * 4, method=method, n_points=200000, seed=1)
+        print(f"{method:>4}: {result.value:.6f} ± {result.error} "
+              f"(точно {exact:.6f}, вычислений {result.n_evals})")
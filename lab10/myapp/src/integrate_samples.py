@@ -0,0 +1,187 @@
+"""
+Интегрирование записанных сигналов: отсчетов с постоянным шагом dx.
+Файлы с сырыми float64 отображаются в память (np.memmap) и сводятся
+блоками, поэтому файл любого размера не загружается в RAM целиком.
+"""
+
+import concurrent.futures as ftres
+import os
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+
+from src.stats import IntegrationStats, pickled_size, timed_call
+
+METHODS = ('left', 'trapezoid', 'simpson')
+
+# Число отсчетов в одном блоке (8 МБ для float64)
+CHUNK_SIZE = 1 << 20
+
+Samples = Union[str, os.PathLike, np.ndarray]
+
+
+def integrate_samples(samples: Samples,
+                      dx: float,
+                      *,
+                      method: str = 'trapezoid',
+                      dtype: np.dtype = np.float64,
+                      offset: int = 0,
+                      chunk_size: int = CHUNK_SIZE,
+                      n_jobs: int = 1,
+                      return_stats: bool = False) -> Union[float, Tuple[float, IntegrationStats]]:
+    """
+    Вычисляет интеграл по отсчетам y_0, ..., y_{n-1} с шагом dx.
+    
+    Каждый блок сводится к двум суммам - по четным и нечетным
+    номерам отсчетов; из них и крайних отсчетов собираются все формулы:
+    
+    - "left": левые прямоугольники, dx * (y_0 + ... + y_{n-2})
+    - "trapezoid": трапеции
+    - "simpson": формула Симпсона; при четном n последний интервал
+      считается трапецией
+    
+    Args:
+        samples: Путь к файлу с сырыми отсчетами или одномерный массив
+            (в том числе np.memmap)
+        dx: Шаг между отсчетами (> 0)
+        method: Квадратурная формула (см. METHODS)
+        dtype: Тип отсчетов в файле
+        offset: Размер заголовка файла в байтах
+        chunk_size: Число отсчетов в одном блоке
+        n_jobs: Число процессов для файла (> 1 - каждый процесс
+            отображает в память только свои блоки); массивы в памяти
+            всегда сводятся в текущем процессе
+        return_stats: Вернуть также статистику выполнения (см. src.stats)
+    
+    Returns:
+        float: Значение интеграла; при return_stats=True -
+        кортеж (значение, IntegrationStats)
+    
+    Raises:
+        ValueError: Если dx <= 0, отсчетов меньше двух, массив
+            не одномерный или метод неизвестен
+    
+    Examples:
+        >>> import numpy as np
+        >>> x = np.linspace(0, 1, 101)
+        >>> round(integrate_samples(x ** 2, 0.01, method="simpson"), 12)
+        0.333333333333
+    """
+    if method not in METHODS:
+        raise ValueError(f"Неизвестный метод: {method!r}, доступны {METHODS}")
+    if dx <= 0 or chunk_size <= 0 or n_jobs <= 0:
+        raise ValueError("dx, chunk_size и n_jobs должны быть > 0")
+    path = None
+    if isinstance(samples, (str, os.PathLike)):
+        path = os.fspath(samples)
+        samples = np.memmap(path, dtype=dtype, mode='r', offset=offset)
+    samples = np.asarray(samples)
+    if samples.ndim != 1 or len(samples) < 2:
+        raise ValueError("Требуется одномерный массив хотя бы из двух отсчетов")
+    
+    n = len(samples)
+    bounds = [(start, min(start + chunk_size, n)) for start in range(0, n, chunk_size)]
+    stats = None
+    if return_stats:
+        stats = IntegrationStats(f"samples_{method}", n_jobs=n_jobs, n_evals=n)
+    if stats is None:
+        sums = _reduce(samples, path, dtype, offset, bounds, n_jobs)
+    else:
+        with stats.phase('total'):
+            sums = _reduce(samples, path, dtype, offset, bounds, n_jobs, stats)
+    
+    even = odd = 0.0
+    for (start, _), (chunk_even, chunk_odd) in zip(bounds, sums):
+        # Четность внутри блока совпадает с глобальной, если блок начинается с четного номера
+        if start % 2:
+            chunk_even, chunk_odd = chunk_odd, chunk_even
+        even += chunk_even
+        odd += chunk_odd
+    value = _combine(method, even, odd, float(samples[0]), float(samples[-2]),
+                     float(samples[-1]), n, dx)
+    return value if stats is None else (value, stats)
+
+
+def _combine(method: str, even: float, odd: float,
+             first: float, before_last: float, last: float, n: int, dx: float) -> float:
+    """Собирает формулу из сумм по четным и нечетным номерам отсчетов."""
+    total = even + odd
+    if method == 'left':
+        return dx * (total - last)
+    if method == 'trapezoid':
+        return dx * (total - (first + last) / 2)
+    if n == 2:
+        return dx * (first + last) / 2
+    tail = 0.0
+    if n % 2 == 0:
+        # Симпсон по первым n-1 отсчетам и трапеция на последнем интервале
+        tail = dx * (before_last + last) / 2
+        odd -= last
+        last = before_last
+    return dx / 3 * (2 * even + 4 * odd - first - last) + tail
+
+
+def _parity_sums(block: np.ndarray) -> Tuple[float, float]:
+    """Суммы отсчетов блока с четными и нечетными номерами внутри блока."""
+    return (float(np.sum(block[0::2], dtype=np.float64)),
+            float(np.sum(block[1::2], dtype=np.float64)))
+
+
+def _file_block_sums(path: str, dtype: np.dtype, offset: int,
+                     start: int, stop: int) -> Tuple[float, float]:
+    """Отображает в память только блок [start, stop) файла и сводит его."""
+    itemsize = np.dtype(dtype).itemsize
+    block = np.memmap(path, dtype=dtype, mode='r', offset=offset + start * itemsize,
+                      shape=(stop - start,))
+    return _parity_sums(block)
+
+
+def _reduce(samples: np.ndarray, path: Optional[str], dtype: np.dtype, offset: int,
+            bounds: List[Tuple[int, int]], n_jobs: int,
+            stats: Optional[IntegrationStats] = None) -> List[Tuple[float, float]]:
+    """Сводит блоки последовательно или в пуле процессов."""
+    if path is None or n_jobs == 1:
+        if stats is None:
+            return [_parity_sums(samples[start:stop]) for start, stop in bounds]
+        with stats.phase('compute'):
+            results = [timed_call(_parity_sums, stop - start, samples[start:stop])
+                       for start, stop in bounds]
+        stats.chunks.extend(chunk for _, chunk in results)
+        return [sums for sums, _ in results]
+    
+    with ftres.ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        if stats is None:
+            futures = [executor.submit(_file_block_sums, path, dtype, offset, start, stop)
+                       for start, stop in bounds]
+            return [future.result() for future in futures]
+        with stats.phase('submit'):
+            futures = [executor.submit(timed_call, _file_block_sums, stop - start,
+                                       path, dtype, offset, start, stop)
+                       for start, stop in bounds]
+        with stats.phase('compute'):
+            results = [future.result() for future in futures]
+    stats.chunks.extend(chunk for _, chunk in results)
+    stats.bytes_pickled += sum(pickled_size(timed_call, _file_block_sums, stop - start,
+                                            path, dtype, offset, start, stop)
+                               for start, stop in bounds)
+    stats.bytes_pickled += sum(pickled_size(result) for result in results)
+    return [sums for sums, _ in results]
+
+
+# Тестовый запуск для проверки
+if __name__ == "__main__":
+    import math
+    import tempfile
+    
+    n = 10_000_001
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "signal.f64")
+        signal = np.memmap(path, dtype=np.float64, mode='w+', shape=(n,))
+        for start in range(0, n, CHUNK_SIZE):
+            stop = min(start + CHUNK_SIZE, n)
+            signal[start:stop] = np.sin(np.arange(start, stop) * math.pi / (n - 1))
+        signal.flush()
+        del signal
+        for method in METHODS:
+            value = integrate_samples(path, math.pi / (n - 1), method=method, n_jobs=2)
+            print(f"{method:>9}: ∫sin(x)dx от 0 до π по {n} отсчетам = {value:.12f}")
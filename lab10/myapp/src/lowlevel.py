@@ -0,0 +1,94 @@
+"""
+Подынтегральные функции из скомпилированных библиотек (ctypes).
+Аналог scipy.LowLevelCallable: цикл интегрирования вызывает
+C-функцию по указателю без обращения к интерпретатору.
+"""
+
+import ctypes
+from typing import Any, Optional
+
+
+class LowLevelCallable:
+    """
+    Обертка над указателем ctypes на C-функцию double(double)
+    или double(double, void*).
+    
+    Если Cython-расширение собрано, integrate() вызывает функцию прямо
+    из C-цикла без GIL; иначе - через ctypes из цикла Python
+    (cython.integrate_python).
+    Адрес функции действителен только в текущем процессе, поэтому
+    обертка не сериализуется для ProcessPoolExecutor.
+    
+    Args:
+        function: Функция ctypes (из CDLL или CFUNCTYPE) с restype
+            c_double и argtypes (c_double,) или (c_double, c_void_p)
+        user_data: Второй аргумент для double(double, void*): адрес (int),
+            c_void_p или объект ctypes (передается его адрес)
+    
+    Raises:
+        TypeError: Если function не указатель ctypes
+        ValueError: Если сигнатура не поддерживается
+    
+    Examples:
+        >>> import ctypes, ctypes.util, math
+        >>> libm = ctypes.CDLL(ctypes.util.find_library("m"))
+        >>> libm.cos.restype = ctypes.c_double
+        >>> libm.cos.argtypes = (ctypes.c_double,)
+        >>> round(LowLevelCallable(libm.cos)(0.0), 6)
+        1.0
+    """
+    
+    def __init__(self, function: Any, user_data: Any = None) -> None:
+        if not isinstance(function, ctypes._CFuncPtr):
+            raise TypeError("Ожидается функция ctypes (CDLL или CFUNCTYPE)")
+        argtypes = tuple(function.argtypes or ())
+        if function.restype is not ctypes.c_double or argtypes not in (
+                (ctypes.c_double,), (ctypes.c_double, ctypes.c_void_p)):
+            raise ValueError("Поддерживаются сигнатуры double(double) и double(double, void*): "
+                             "задайте restype и argtypes")
+        self.function = function
+        self.with_data = len(argtypes) == 2
+        if user_data is not None and not self.with_data:
+            raise ValueError("user_data требует сигнатуры double(double, void*)")
+        self.address = ctypes.cast(function, ctypes.c_void_p).value
+        self.user_data = _address_of(user_data)
+    
+    def __call__(self, x: float) -> float:
+        if self.with_data:
+            return self.function(x, self.user_data)
+        return self.function(x)
+    
+    def offset_sum(self, a: float, step: float, n_iter: int, offset: float = 0.0) -> float:
+        """
+        Сумма f(a + (i + offset) * step) * step по i = 0..n_iter-1.
+        
+        Тот же протокол, что у Cython Kernel: integrate() использует его
+        вместо собственного цикла.
+        """
+        from cython import cfunc_offset_sum
+        return cfunc_offset_sum(self.address, self.user_data or 0, self.with_data,
+                                a, step, n_iter, offset)
+    
+    def __reduce__(self):
+        raise TypeError("LowLevelCallable содержит адрес в памяти процесса "
+                        "и не может быть передан в другой процесс")
+    
+    def __repr__(self) -> str:
+        signature = "double(double, void*)" if self.with_data else "double(double)"
+        return f"LowLevelCallable({signature} at {self.address:#x})"
+
+
+def as_low_level(f: Any) -> Any:
+    """Оборачивает указатель ctypes в LowLevelCallable, остальное возвращает как есть."""
+    if isinstance(f, ctypes._CFuncPtr):
+        return LowLevelCallable(f)
+    return f
+
+
+def _address_of(user_data: Any) -> Optional[int]:
+    """Адрес для аргумента void*."""
+    if user_data is None or isinstance(user_data, int):
+        return user_data
+    if isinstance(user_data, ctypes.c_void_p):
+        return user_data.value
+    return ctypes.addressof(user_data)
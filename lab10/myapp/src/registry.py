@@ -0,0 +1,201 @@
+"""
+Реестр подынтегральных функций для рабочих процессов.
+
+Функция регистрируется один раз и получает короткий id; в задачи
+пула попадает только IntegrandRef(id) и границы, а не сама функция.
+Рабочие получают функции при старте:
+
+- наследованием при fork (подходит для лямбд и замыканий; не на macOS
+  и не при явно выбранном spawn/forkserver);
+- по пути импорта "модуль:имя" (register_import);
+- по исходному тексту (register_source);
+- одним pickle на процесс через initializer (прочие сериализуемые объекты).
+"""
+
+import importlib
+import itertools
+import multiprocessing as mp
+import pickle
+import sys
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+# Спецификация для передачи в рабочий при старте: (вид, id, данные)
+Spec = Tuple[str, str, Any]
+
+_REGISTRY: Dict[str, Callable] = {}
+_SPECS: Dict[str, Optional[Spec]] = {}
+_ids = itertools.count()
+
+
+class IntegrandRef(NamedTuple):
+    """
+    Ссылка на зарегистрированную функцию.
+    
+    integrate() подставляет вместо ссылки саму функцию, поэтому
+    ссылку можно передавать везде, где ожидается f.
+    """
+    id: str
+    
+    def __call__(self, x: Any) -> Any:
+        return lookup(self.id)(x)
+
+
+def register(f: Callable, *, id: Optional[str] = None) -> IntegrandRef:
+    """
+    Регистрирует функцию в текущем процессе.
+    
+    Args:
+        f: Любая вызываемая функция, в том числе лямбда или замыкание
+        id: Идентификатор (по умолчанию имя функции и номер)
+    
+    Returns:
+        IntegrandRef для передачи в integrate* вместо f
+    
+    Examples:
+        >>> ref = register(lambda x: 2 * x, id="double")
+        >>> ref, ref(3)
+        (IntegrandRef(id='double'), 6)
+        >>> unregister(ref)
+    """
+    return _add(f, None, id or f"{getattr(f, '__qualname__', type(f).__name__)}#{next(_ids)}")
+
+
+def register_import(path: str, *, id: Optional[str] = None) -> IntegrandRef:
+    """
+    Регистрирует функцию по пути импорта "модуль:имя" (например "math:sin").
+    
+    Рабочие импортируют функцию сами, ничего не сериализуя.
+    """
+    return _add(_import(path), ('import', '', path), id or path)
+
+
+def register_source(source: str, name: str, *, id: Optional[str] = None) -> IntegrandRef:
+    """
+    Регистрирует функцию name, определенную в исходном тексте source.
+    
+    Текст выполняется в отдельном пространстве имен в текущем процессе
+    и в каждом рабочем при старте пула.
+    
+    Examples:
+        >>> ref = register_source("import math\\ndef f(x):\\n    return math.exp(-x * x)", "f")
+        >>> ref(0.0)
+        1.0
+        >>> unregister(ref)
+    """
+    return _add(_exec_source(source, name), ('source', '', (source, name)),
+                id or f"{name}#{next(_ids)}")
+
+
+def unregister(ref: IntegrandRef) -> None:
+    """Удаляет функцию из реестра текущего процесса."""
+    _REGISTRY.pop(ref.id, None)
+    _SPECS.pop(ref.id, None)
+
+
+def lookup(id: str) -> Callable:
+    """
+    Функция по id.
+    
+    Raises:
+        LookupError: Если id не зарегистрирован в этом процессе
+    """
+    try:
+        return _REGISTRY[id]
+    except KeyError:
+        raise LookupError(f"Функция {id!r} не зарегистрирована в этом процессе; "
+                          f"регистрируйте функции до создания пула") from None
+
+
+def resolve(f: Any) -> Any:
+    """Подставляет функцию вместо IntegrandRef; остальные f возвращает как есть."""
+    return lookup(f.id) if isinstance(f, IntegrandRef) else f
+
+
+def worker_options(refs: Iterable[IntegrandRef],
+                   start_method: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Аргументы ProcessPoolExecutor, с которыми рабочие знают функции refs.
+    
+    При fork рабочие наследуют реестр целиком. Иначе функции передаются
+    initializer'ом один раз на процесс; функции без пути импорта,
+    исходного текста и поддержки pickle (замыкания) требуют fork.
+    fork выбирается вместо способа по умолчанию, только если способ не
+    задан явно (ни аргументом, ни mp.set_start_method) и платформа не
+    macOS, где fork небезопасен. Глобальный способ запуска не фиксируется.
+    
+    Args:
+        refs: Зарегистрированные функции
+        start_method: Способ запуска процессов (по умолчанию текущий)
+    
+    Raises:
+        ValueError: Если функцию нельзя передать выбранным способом запуска
+    """
+    explicit = start_method or mp.get_start_method(allow_none=True)
+    # Без явного выбора - способ платформы по умолчанию, он в списке первый
+    start_method = explicit or mp.get_all_start_methods()[0]
+    specs = [_spec(ref.id) for ref in refs]
+    if start_method != 'fork' and None in specs:
+        if explicit or sys.platform == 'darwin' or 'fork' not in mp.get_all_start_methods():
+            raise ValueError(f"Замыкания и лямбды без исходного текста не передаются "
+                             f"при запуске {start_method!r}; используйте register_source "
+                             f"или register_import")
+        start_method = 'fork'
+    context = mp.get_context(start_method)
+    if start_method == 'fork':
+        return {'mp_context': context}
+    return {'mp_context': context, 'initializer': install, 'initargs': (specs,)}
+
+
+def install(specs: List[Spec]) -> None:
+    """Initializer рабочего: регистрирует функции из спецификаций."""
+    for kind, id, data in specs:
+        if kind == 'import':
+            _REGISTRY[id] = _import(data)
+        elif kind == 'source':
+            _REGISTRY[id] = _exec_source(*data)
+        else:
+            _REGISTRY[id] = data
+        _SPECS[id] = (kind, id, data)
+
+
+def _add(f: Callable, spec: Optional[Spec], id: str) -> IntegrandRef:
+    _REGISTRY[id] = f
+    _SPECS[id] = None if spec is None else (spec[0], id, spec[2])
+    return IntegrandRef(id)
+
+
+def _spec(id: str) -> Optional[Spec]:
+    """Спецификация для передачи функции в рабочий или None, если нужен fork."""
+    lookup(id)
+    if _SPECS[id] is None:
+        f = _REGISTRY[id]
+        path = f"{getattr(f, '__module__', None)}:{getattr(f, '__qualname__', None)}"
+        try:
+            if _import(path) is f:
+                _SPECS[id] = ('import', id, path)
+        except (ImportError, AttributeError, ValueError):
+            pass
+        if _SPECS[id] is None:
+            try:
+                pickle.dumps(f)
+            except Exception:
+                return None
+            _SPECS[id] = ('object', id, f)
+    return _SPECS[id]
+
+
+def _import(path: str) -> Callable:
+    """Объект по пути "модуль:имя.вложенное_имя"."""
+    module, _, qualname = path.partition(':')
+    if not module or not qualname or module == '__main__' or '<' in qualname:
+        raise ValueError(f"Путь импорта должен иметь вид модуль:имя, получено {path!r}")
+    obj = importlib.import_module(module)
+    for part in qualname.split('.'):
+        obj = getattr(obj, part)
+    return obj
+
+
+def _exec_source(source: str, name: str) -> Callable:
+    namespace = {'__name__': f"integrand_{name}"}
+    exec(compile(source, f"<integrand {name}>", 'exec'), namespace)
+    return namespace[name]
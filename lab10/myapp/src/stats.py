@@ -0,0 +1,155 @@
+"""
+Статистика выполнения интегрирования.
+
+Функции integrate* с return_stats=True возвращают (значение, IntegrationStats):
+время по фазам (запуск рабочих, отправка задач, вычисление, сведение),
+время каждого куска и рабочего, вычислений f в секунду и объем данных,
+переданных процессам через pickle.
+"""
+
+import os
+import pickle
+import statistics
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, ClassVar, Dict, Iterable, Iterator, List, Tuple
+
+
+@dataclass
+class ChunkStats:
+    """Один кусок вычислений: кто считал, сколько точек и сколько времени."""
+    worker: str
+    n_evals: int
+    seconds: float
+
+
+@dataclass
+class IntegrationStats:
+    """
+    Статистика одного вызова integrate*.
+    
+    Фазы (сек, стеночное время в вызывающем потоке):
+    
+    - spawn: создание пула и запуск рабочих
+    - submit: постановка задач в очередь
+    - compute: ожидание результатов после отправки
+    - reduce: сведение результатов
+    - total: весь вызов, включая остановку пула
+    
+    Examples:
+        >>> stats = IntegrationStats('python', n_evals=1000, compute=0.5, total=0.5)
+        >>> stats.evals_per_second
+        2000.0
+    """
+    
+    PHASES: ClassVar[Tuple[str, ...]] = ('spawn', 'submit', 'compute', 'reduce')
+    
+    backend: str
+    n_jobs: int = 1
+    n_evals: int = 0
+    spawn: float = 0.0
+    submit: float = 0.0
+    compute: float = 0.0
+    reduce: float = 0.0
+    total: float = 0.0
+    bytes_pickled: int = 0
+    chunks: List[ChunkStats] = field(default_factory=list)
+    
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Добавляет время выполнения блока with к фазе name."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            setattr(self, name, getattr(self, name) + time.perf_counter() - start)
+    
+    @property
+    def evals_per_second(self) -> float:
+        """Вычислений f в секунду за весь вызов."""
+        return self.n_evals / self.total if self.total > 0 else 0.0
+    
+    @property
+    def worker_times(self) -> Dict[str, float]:
+        """Суммарное время кусков по рабочим ("pid:поток")."""
+        times: Dict[str, float] = {}
+        for chunk in self.chunks:
+            times[chunk.worker] = times.get(chunk.worker, 0.0) + chunk.seconds
+        return times
+    
+    @property
+    def chunk_times(self) -> List[float]:
+        """Время каждого куска в порядке отправки."""
+        return [chunk.seconds for chunk in self.chunks]
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Плоская сводка для таблиц и JSON.
+        
+        imbalance - отношение максимальной загрузки рабочего к средней
+        (1.0 - идеальная балансировка).
+        """
+        workers = list(self.worker_times.values())
+        chunks = self.chunk_times
+        busiest = max(workers, default=0.0)
+        return {
+            'backend': self.backend,
+            'n_jobs': self.n_jobs,
+            'n_evals': self.n_evals,
+            **{name: getattr(self, name) for name in self.PHASES},
+            'total': self.total,
+            'bytes_pickled': self.bytes_pickled,
+            'evals_per_second': self.evals_per_second,
+            'n_chunks': len(chunks),
+            'n_workers': len(workers),
+            'chunk_mean': statistics.fmean(chunks) if chunks else 0.0,
+            'chunk_max': max(chunks, default=0.0),
+            'imbalance': busiest / statistics.fmean(workers) if busiest > 0 else 1.0,
+        }
+
+
+def worker_id() -> str:
+    """Идентификатор текущего рабочего: "pid:имя потока"."""
+    return f"{os.getpid()}:{threading.current_thread().name}"
+
+
+def timed_call(fn: Callable[..., Any], n_evals: int,
+               *args: Any, **kwargs: Any) -> Tuple[Any, ChunkStats]:
+    """
+    Вызывает fn(*args, **kwargs) и замеряет его в рабочем.
+    
+    Функция модульного уровня, поэтому передается в процессы.
+    
+    Returns:
+        (результат fn, ChunkStats)
+    """
+    start = time.perf_counter()
+    value = fn(*args, **kwargs)
+    return value, ChunkStats(worker_id(), n_evals, time.perf_counter() - start)
+
+
+def pickled_size(*objects: Any) -> int:
+    """Размер objects в байтах после pickle."""
+    return len(pickle.dumps(objects, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def aggregate_stats(runs: Iterable[IntegrationStats]) -> Dict[str, Any]:
+    """
+    Усредняет числовые поля as_dict() по нескольким запускам.
+    
+    Returns:
+        Словарь со средними значениями и числом запусков ('runs')
+    
+    Raises:
+        ValueError: Если запусков нет
+    """
+    rows = [run.as_dict() for run in runs]
+    if not rows:
+        raise ValueError("Нет статистики для агрегации")
+    summary: Dict[str, Any] = {'backend': rows[0]['backend'], 'runs': len(rows)}
+    for key, value in rows[0].items():
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            summary[key] = statistics.fmean(row[key] for row in rows)
+    return summary
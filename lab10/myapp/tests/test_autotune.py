@@ -0,0 +1,143 @@
+"""
+Юнит-тесты для автоматического выбора бэкенда (src.autotune).
+"""
+
+import unittest
+import json
+import math
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from src.autotune import (CostSample, Plan, choose_plan, fit_calibration, integrate_auto,
+                          load_calibration, run_plan, sample_cost)
+from src.integrate import integrate
+
+
+def calibration(ratio, overhead=0.01):
+    """Калибровка с одинаковой моделью для всех параллельных бэкендов."""
+    model = {str(n): {'overhead': overhead, 'ratio': ratio / n} for n in (1, 2, 4)}
+    return {'task_overhead': 1e-4,
+            'backends': {'threads': model, 'processes': model, 'cython': model}}
+
+
+class TestChoosePlan(unittest.TestCase):
+    
+    def test_cheap_function_stays_serial(self):
+        """Накладные расходы пула не окупаются на коротком вызове"""
+        cost = CostSample(scalar=1e-7, vector=1e-8, nogil=False)
+        plan = choose_plan(math.cos, 0, 1, n_iter=1000, max_jobs=4,
+                           calibration=calibration(1.0), cost=cost)
+        self.assertEqual(plan, Plan('numpy', predicted=1000 * 1e-8))
+    
+    def test_expensive_function_goes_parallel(self):
+        """Дорогая f распределяется на наибольшее выгодное число рабочих"""
+        cost = CostSample(scalar=1e-4, vector=1e-4, nogil=False)
+        plan = choose_plan(math.cos, 0, 1, n_iter=100000, max_jobs=4,
+                           calibration=calibration(1.0), cost=cost)
+        self.assertIn(plan.backend, ('threads', 'processes'))
+        self.assertEqual(plan.n_jobs, 4)
+        self.assertAlmostEqual(plan.predicted, 0.01 + 100000 * 1e-4 / 4)
+    
+    def test_max_jobs_and_nogil(self):
+        """max_jobs ограничивает рабочих; f в C считается ядром без GIL"""
+        cost = CostSample(scalar=1e-4, vector=1e-4, nogil=True)
+        plan = choose_plan(math.cos, 0, 1, n_iter=100000, max_jobs=2,
+                           calibration=calibration(1.0), cost=cost)
+        self.assertEqual((plan.backend, plan.n_jobs), ('cython', 2))
+    
+    def test_small_gain_is_ignored(self):
+        """Выигрыш в пределах MIN_SPEEDUP не оправдывает пул"""
+        cost = CostSample(scalar=1e-6, vector=1e-6, nogil=False)
+        plan = choose_plan(math.cos, 0, 1, n_iter=100000, max_jobs=2,
+                           calibration=calibration(1.9, overhead=0.0), cost=cost)
+        self.assertEqual(plan.n_jobs, 1)
+    
+    def test_chunk_covers_task_overhead(self):
+        """Кусок считается заметно дольше пересылки задачи"""
+        cost = CostSample(scalar=1e-6, vector=1e-6, nogil=False)
+        plan = choose_plan(math.cos, 0, 1, n_iter=10 ** 6, max_jobs=2,
+                           calibration=calibration(1.0, overhead=0.0), cost=cost)
+        self.assertEqual(plan.n_jobs, 2)
+        self.assertGreaterEqual(plan.chunksize * 1e-6, 20 * 1e-4)
+
+
+class TestCalibration(unittest.TestCase):
+    
+    def test_fit_calibration(self):
+        """Накладные расходы и шаг восстанавливаются по прямой"""
+        rows = []
+        for n_iter in (1000, 10000, 100000):
+            rows.append({'backend': 'python', 'n_iter': n_iter, 'n_jobs': 1,
+                         'min_sec': 1e-6 * n_iter})
+            rows.append({'backend': 'processes', 'n_iter': n_iter, 'n_jobs': 2,
+                         'min_sec': 0.05 + 0.5e-6 * n_iter})
+        result = fit_calibration(rows, task_overhead=1e-4)
+        model = result['backends']['processes']['2']
+        self.assertAlmostEqual(model['overhead'], 0.05)
+        self.assertAlmostEqual(model['ratio'], 0.5)
+        self.assertAlmostEqual(result['python_step'], 1e-6)
+        with self.assertRaises(ValueError):
+            fit_calibration(rows[1::2], task_overhead=1e-4)
+    
+    def test_load_calibration(self):
+        """Файл читается; отсутствующий файл дает None"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'calibration.json')
+            self.assertIsNone(load_calibration(path))
+            with open(path, 'w', encoding='utf-8') as file:
+                json.dump(calibration(1.0), file)
+            self.assertEqual(load_calibration(path), calibration(1.0))
+
+
+class TestIntegrateAuto(unittest.TestCase):
+    
+    def test_sample_cost(self):
+        """Замер положителен; выражения считаются без GIL"""
+        cost = sample_cost(math.cos, 0, 1, budget=0.005)
+        self.assertGreater(cost.scalar, 0)
+        self.assertFalse(cost.nogil)
+        self.assertTrue(sample_cost("sin(x)", 0, 1, budget=0.005).nogil)
+    
+    def test_sample_cost_is_bounded(self):
+        """Замер дорогой f не превышает max_steps и бюджета"""
+        calls = 0
+        def slow(x):
+            nonlocal calls
+            calls += 1
+            time.sleep(0.001)
+            return math.cos(x)
+        
+        start = time.perf_counter()
+        sample_cost(slow, 0, 1, max_steps=2)
+        self.assertLessEqual(calls, 2 * (1 + 2))
+        self.assertLess(time.perf_counter() - start, 0.1)
+    
+    def test_matches_integrate(self):
+        """Результат и журнал выбора"""
+        expected = integrate(np.cos, 0, math.pi / 2, n_iter=20000)
+        with self.assertLogs('src.autotune', level='INFO') as logs:
+            value, stats = integrate_auto(np.cos, 0, math.pi / 2, n_iter=20000,
+                                          calibration=calibration(1.0), return_stats=True)
+        self.assertAlmostEqual(value, expected, places=10)
+        self.assertTrue(any('integrate_auto' in line for line in logs.output))
+        self.assertGreater(stats.total, 0)
+    
+    def test_run_every_plan(self):
+        """Каждый бэкенд дает тот же интеграл"""
+        expected = integrate(math.sin, 0, 1, n_iter=4000)
+        for plan in (Plan('python'), Plan('numpy'), Plan('threads', 2, 1000),
+                     Plan('processes', 2, 1000), Plan('cython', 2, 1000)):
+            f = "sin(x)" if plan.backend == 'cython' else math.sin
+            with self.subTest(backend=plan.backend):
+                self.assertAlmostEqual(run_plan(plan, f, 0, 1, n_iter=4000), expected, places=10)
+    
+    def test_invalid_bounds(self):
+        with self.assertRaises(ValueError):
+            integrate_auto(math.cos, 1, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
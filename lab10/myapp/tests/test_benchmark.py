@@ -0,0 +1,97 @@
+"""
+Юнит-тесты для сравнения бенчмарка с базовым файлом (benchmarks/benchmark.py).
+"""
+
+import unittest
+import io
+import json
+import tempfile
+from contextlib import redirect_stdout
+from pathlib import Path
+from unittest import mock
+
+from benchmarks import benchmark
+from benchmarks.backends import REPORTS
+
+
+def row(backend, min_sec, n_iter=1000, n_jobs=1):
+    """Строка результатов run_matrix."""
+    return {'backend': backend, 'n_iter': n_iter, 'n_jobs': n_jobs, 'mean_sec': min_sec,
+            'min_sec': min_sec, 'std_sec': 0.0, 'repeats': 1, 'value': 1.0}
+
+
+class TestFindRegressions(unittest.TestCase):
+
+    def test_slower_than_threshold(self):
+        """Регрессия - замедление больше threshold для той же точки матрицы"""
+        baseline = [row('python', 1.0), row('numpy', 1.0), row('threads', 0.0)]
+        results = [row('python', 1.2), row('numpy', 1.05), row('threads', 1.0),
+                   row('python', 5.0, n_iter=10)]
+        regressions = benchmark.find_regressions(results, baseline, threshold=0.1)
+        self.assertEqual([r['backend'] for r in regressions], ['python'])
+        self.assertAlmostEqual(regressions[0]['ratio'], 1.2)
+        self.assertEqual(regressions[0]['baseline_sec'], 1.0)
+
+
+class TestReports(unittest.TestCase):
+
+    def test_speedup_against_python(self):
+        """Ускорение считается относительно python с тем же n_iter"""
+        results = [row('python', 1.0), row('numpy', 0.1), row('pool', 0.5, n_jobs=2),
+                   row('numpy', 0.1, n_iter=10)]
+        out = io.StringIO()
+        with redirect_stdout(out):
+            REPORTS['speedup'](results)
+        lines = out.getvalue().splitlines()
+        self.assertTrue(any(line.startswith('numpy') and '10.0x' in line for line in lines))
+        self.assertTrue(any(line.startswith('pool') and '2.0x' in line for line in lines))
+        self.assertFalse(any('|       10 |' in line for line in lines))
+    
+    def test_reports_registered(self):
+        """Отчеты pool и speedup доступны в --report"""
+        self.assertLessEqual({'pool', 'speedup', 'imports', 'evaluations', 'gil'}, set(REPORTS))
+
+
+class TestBaselineFile(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        patcher = mock.patch.object(benchmark, 'RESULTS_DIR', self.dir / 'results')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def test_round_trip(self):
+        """Сохраненный файл читается load_baseline; отсутствующий - None"""
+        path = self.dir / 'nested' / 'base.json'
+        self.assertIsNone(benchmark.load_baseline(path))
+        results = [row('python', 1.0), row('numpy', 0.5)]
+        with redirect_stdout(io.StringIO()):
+            self.assertEqual(benchmark.save_results(results, path), path)
+        self.assertEqual(benchmark.load_baseline(path), results)
+        self.assertTrue(path.with_suffix('.csv').exists())
+    
+    def run_main(self, results, *args):
+        """Запускает main с заданными результатами матрицы; возвращает код выхода."""
+        with mock.patch.object(benchmark, 'run_matrix', return_value=results), \
+                redirect_stdout(io.StringIO()):
+            return benchmark.main(['--backends', 'python', *args])
+    
+    def test_cli_exit_code(self):
+        """--save-baseline пишет в указанный путь; регрессия дает код 1"""
+        path = self.dir / 'ci' / 'baseline.json'
+        self.assertEqual(self.run_main([row('python', 1.0)], '--save-baseline',
+                                       '--baseline', str(path)), 0)
+        with open(path, encoding='utf-8') as f:
+            self.assertEqual(json.load(f)['results'], [row('python', 1.0)])
+        self.assertEqual(self.run_main([row('python', 1.05)], '--baseline', str(path)), 0)
+        self.assertEqual(self.run_main([row('python', 2.0)], '--baseline', str(path)), 1)
+        missing = str(self.dir / 'no.json')
+        self.assertEqual(self.run_main([row('python', 2.0)], '--baseline', missing), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
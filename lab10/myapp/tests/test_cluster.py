@@ -0,0 +1,140 @@
+"""
+Юнит-тесты для integrate_cluster с несколькими рабочими на localhost.
+"""
+
+import unittest
+import math
+import os
+import socket
+import tempfile
+from functools import partial
+from pathlib import Path
+from unittest import mock
+
+from src.cluster import (AUTHKEY_ENV, integrate_cluster, main, parse_address, resolve_authkey,
+                         serve_worker, start_worker)
+from src.integrate import integrate
+
+
+def crash_once(marker: str, x: float) -> float:
+    """Завершает процесс рабочего при первом вызове среди всех процессов."""
+    try:
+        os.close(os.open(marker, os.O_CREAT | os.O_EXCL))
+    except FileExistsError:
+        return math.sin(x)
+    os._exit(1)
+
+
+def free_port() -> int:
+    """Порт, на котором никто не слушает."""
+    with socket.socket() as sock:
+        sock.bind(('localhost', 0))
+        return sock.getsockname()[1]
+
+
+class TestIntegrateCluster(unittest.TestCase):
+    """Раздача кусков, сбои рабочих и ошибки f."""
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.processes, cls.addresses = zip(*(start_worker() for _ in range(2)))
+    
+    @classmethod
+    def tearDownClass(cls):
+        for process in cls.processes:
+            process.terminate()
+            process.join()
+    
+    def test_matches_local(self):
+        """Результат совпадает с integrate, куски достаются обоим рабочим"""
+        value, stats = integrate_cluster(math.sin, 0, math.pi, workers=self.addresses,
+                                         n_iter=10000, return_stats=True)
+        self.assertAlmostEqual(value, integrate(math.sin, 0, math.pi, n_iter=10000), places=12)
+        self.assertEqual(len(stats.chunks), 16)
+        self.assertEqual(len({chunk.worker.split(':')[0] for chunk in stats.chunks}), 2)
+        self.assertGreater(stats.bytes_pickled, 0)
+        self.assertEqual(stats.n_evals, 10000)
+    
+    def test_evals_follow_method(self):
+        """Число вычислений f зависит от формулы, как в integrate"""
+        _, stats = integrate_cluster(math.sin, 0, math.pi, workers=self.addresses, n_iter=1000,
+                                     chunksize=250, method='gauss', return_stats=True)
+        self.assertEqual(stats.n_evals, 3 * 1000)
+        self.assertEqual([chunk.n_evals for chunk in stats.chunks], [3 * 250] * 4)
+    
+    def test_address_strings_and_options(self):
+        """Адреса host:port, строка-выражение и аргументы integrate"""
+        workers = [f"{host}:{port}" for host, port in self.addresses]
+        value = integrate_cluster("x**2", 0, 3, workers=workers, n_iter=300, method='simpson')
+        self.assertAlmostEqual(value, 9.0, places=10)
+    
+    def test_unreachable_worker_skipped(self):
+        """Недоступный рабочий не мешает остальным"""
+        workers = [('localhost', free_port()), *self.addresses]
+        value = integrate_cluster(math.cos, 0, math.pi / 2, workers=workers, n_iter=10000)
+        self.assertAlmostEqual(value, 1.0, places=3)
+    
+    def test_no_workers(self):
+        """Если рабочих нет, вызов падает с RuntimeError"""
+        with self.assertRaises(RuntimeError):
+            integrate_cluster(math.cos, 0, 1, workers=[('localhost', free_port())])
+        with self.assertRaises(ValueError):
+            integrate_cluster(math.cos, 0, 1, workers=[])
+    
+    def test_function_error_propagates(self):
+        """Ошибка f на рабочем передается клиенту без повторов"""
+        with self.assertRaises(ValueError):
+            integrate_cluster(math.log, -2, -1, workers=self.addresses, n_iter=100)
+    
+    def test_worker_dies_mid_chunk(self):
+        """Кусок упавшего рабочего досчитывает другой"""
+        processes, addresses = zip(*(start_worker() for _ in range(2)))
+        try:
+            with tempfile.TemporaryDirectory() as tmp:
+                f = partial(crash_once, str(Path(tmp) / 'crashed'))
+                value = integrate_cluster(f, 0, math.pi, workers=addresses, n_iter=10000)
+            self.assertAlmostEqual(value, integrate(math.sin, 0, math.pi, n_iter=10000),
+                                   places=12)
+            self.assertEqual(sum(process.is_alive() for process in processes), 1)
+        finally:
+            for process in processes:
+                process.terminate()
+                process.join()
+    
+    def test_parse_address(self):
+        """Разбор адресов"""
+        self.assertEqual(parse_address(('h', '80')), ('h', 80))
+        with self.assertRaises(ValueError):
+            parse_address("localhost")
+
+
+class TestAuthkey(unittest.TestCase):
+    """Ключ обязателен для адресов, доступных по сети."""
+    
+    def test_network_address_requires_key(self):
+        """Без ключа нельзя ни слушать, ни подключаться к сетевому адресу"""
+        with mock.patch.dict(os.environ, {AUTHKEY_ENV: ''}):
+            with self.assertRaises(ValueError):
+                resolve_authkey(None, ('0.0.0.0', 6000))
+            with self.assertRaises(ValueError):
+                serve_worker(('0.0.0.0', 0))
+            with self.assertRaises(ValueError):
+                integrate_cluster(math.sin, 0, 1, workers=["192.0.2.1:6000"])
+            self.assertEqual(resolve_authkey(b'secret', ('0.0.0.0', 6000)), b'secret')
+            self.assertEqual(resolve_authkey(None, ('127.0.0.1', 6000)),
+                             resolve_authkey(None, ('localhost', 6000)))
+    
+    def test_environment_key(self):
+        """Ключ из INTEGRATE_AUTHKEY подходит для любых адресов"""
+        with mock.patch.dict(os.environ, {AUTHKEY_ENV: 'shared'}):
+            self.assertEqual(resolve_authkey(None, ('0.0.0.0', 6000)), b'shared')
+    
+    def test_cli_requires_key(self):
+        """Рабочий из командной строки не запускается без ключа"""
+        with mock.patch.dict(os.environ, {AUTHKEY_ENV: ''}):
+            with self.assertRaises(SystemExit):
+                main(['--port', str(free_port())])
+
+
+if __name__ == '__main__':
+    unittest.main()
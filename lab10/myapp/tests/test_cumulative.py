@@ -0,0 +1,68 @@
+"""
+Юнит-тесты для таблиц первообразной (src.cumulative).
+"""
+
+import unittest
+import math
+import pickle
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from src.cumulative import CumulativeIntegral, cumulative_integrate
+from src.integrate import integrate
+
+
+class TestCumulativeIntegrate(unittest.TestCase):
+    
+    def setUp(self):
+        self.table = cumulative_integrate(np.sin, 0, math.pi, n_iter=500)
+    
+    def test_queries_match_exact(self):
+        """F(t) = 1 - cos(t) в узлах и между ними, скаляр и массив"""
+        t = np.linspace(0, math.pi, 777)
+        np.testing.assert_allclose(self.table(t), 1 - np.cos(t), atol=1e-11)
+        self.assertAlmostEqual(self.table(1.2345), 1 - math.cos(1.2345), places=11)
+        self.assertAlmostEqual(self.table.total, 2.0, places=11)
+    
+    def test_between(self):
+        """between(t1, t2) совпадает с integrate на [t1, t2]"""
+        expected = integrate(math.sin, 0.3, 2.1, n_iter=100, method='gauss')
+        self.assertAlmostEqual(self.table.between(0.3, 2.1), expected, places=10)
+        self.assertAlmostEqual(self.table.between(2.1, 0.3), -expected, places=10)
+    
+    def test_fourth_order_convergence(self):
+        """Ошибка между узлами падает как h^4"""
+        t = np.linspace(0, 1, 1001)
+        errors = [np.max(np.abs(cumulative_integrate(np.exp, 0, 1, n_iter=n)(t) - np.expm1(t)))
+                  for n in (10, 20)]
+        self.assertGreater(errors[0] / errors[1], 14)
+    
+    def test_scalar_function_and_expression(self):
+        """Скалярная функция и строка-выражение дают ту же таблицу"""
+        scalar = cumulative_integrate(math.sin, 0, math.pi, n_iter=500)
+        expression = cumulative_integrate("sin(x)", 0, math.pi, n_iter=500)
+        np.testing.assert_allclose(scalar.values, self.table.values, rtol=1e-14)
+        np.testing.assert_allclose(expression.values, self.table.values, rtol=1e-14)
+    
+    def test_serialization(self):
+        """Таблица переживает pickle и save/load"""
+        restored = pickle.loads(pickle.dumps(self.table))
+        self.assertEqual(restored(1.0), self.table(1.0))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'table.npz'
+            self.table.save(path)
+            loaded = CumulativeIntegral.load(path)
+        self.assertEqual(loaded(2.5), self.table(2.5))
+    
+    def test_out_of_range(self):
+        """Запросы вне [a, b] и некорректные параметры"""
+        with self.assertRaises(ValueError):
+            self.table(4.0)
+        with self.assertRaises(ValueError):
+            cumulative_integrate(np.sin, 1, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
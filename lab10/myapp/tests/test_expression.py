@@ -0,0 +1,94 @@
+"""
+Юнит-тесты для строковых выражений (src.expression).
+"""
+
+import unittest
+import math
+import pickle
+
+import numpy as np
+
+from src.expression import Expression, compile_expression
+from src.integrate import integrate, METHODS
+from src.integrate_async import integrate_processes
+from src.integrate_cache import function_key
+
+
+class TestExpression(unittest.TestCase):
+    """Разбор, проверка и вычисление выражений."""
+    
+    def test_matches_python(self):
+        """Значения совпадают с тем же выражением на Python"""
+        cases = {
+            "x**2 + 2*x + 1": lambda x: x**2 + 2*x + 1,
+            "-x / (1 + x*x)": lambda x: -x / (1 + x*x),
+            "sin(x) * exp(-x) + sqrt(abs(x))": lambda x: math.sin(x) * math.exp(-x) + math.sqrt(abs(x)),
+            "log(x + e) - cos(pi * x)": lambda x: math.log(x + math.e) - math.cos(math.pi * x),
+        }
+        for source, python in cases.items():
+            with self.subTest(source=source):
+                expr = compile_expression(source)
+                self.assertAlmostEqual(expr(0.7), python(0.7), places=12)
+                self.assertAlmostEqual(expr.kernel(0.7), python(0.7), places=12)
+    
+    def test_vectorized(self):
+        """На массиве возвращается массив той же формы (и для констант)"""
+        x = np.linspace(0, 1, 5)
+        np.testing.assert_allclose(Expression("x**2")(x), x**2)
+        np.testing.assert_allclose(Expression("2.5")(x), np.full(5, 2.5))
+    
+    def test_rejects_unsafe(self):
+        """Все, кроме арифметики над x, отклоняется до вычисления"""
+        for source in ("__import__('os').system('true')", "x.real", "y + 1",
+                       "x if x else 1", "[x]", "sin(x, 2)", "True", "x +", "'a'",
+                       "(lambda: 1)()", "x" * 2000):
+            with self.subTest(source=source[:40]):
+                with self.assertRaises(ValueError):
+                    Expression(source)
+    
+    def test_compiled_once(self):
+        """Повторная компиляция того же текста берется из кэша"""
+        self.assertIs(compile_expression("x**3 - x"), compile_expression("x**3 - x"))
+    
+    def test_pickle(self):
+        """Выражение передается в процессы по тексту"""
+        expr = pickle.loads(pickle.dumps(compile_expression("x*x + 1")))
+        self.assertEqual(expr.source, "x * x + 1")
+        self.assertAlmostEqual(expr(2.0), 5.0)
+    
+    def test_cache_key(self):
+        """Ключ кэша не зависит от пробелов в тексте"""
+        self.assertEqual(function_key("x**2+1"), function_key("x ** 2 + 1"))
+        self.assertNotEqual(function_key("x**2+1"), function_key("x**2+2"))
+
+
+class TestIntegrateExpression(unittest.TestCase):
+    """integrate() и параллельные версии со строкой вместо функции."""
+    
+    def test_all_methods(self):
+        """Результат совпадает с интегрированием обычной функции"""
+        for method in METHODS:
+            with self.subTest(method=method):
+                self.assertAlmostEqual(
+                    integrate("x**2 + 2*x + 1", 0, 1, n_iter=1000, method=method),
+                    integrate(lambda x: x**2 + 2*x + 1, 0, 1, n_iter=1000, method=method),
+                    places=10)
+    
+    def test_exact_value(self):
+        """∫_0^π sin(x) dx = 2 по формуле Симпсона"""
+        self.assertAlmostEqual(integrate("sin(x)", 0, math.pi, n_iter=100, method='simpson'),
+                               2.0, places=7)
+    
+    def test_processes(self):
+        """Строка передается в процессы и компилируется там"""
+        result = integrate_processes("x**2", 0, 3, n_jobs=2, n_iter=30000)
+        self.assertAlmostEqual(result, 9.0, places=3)
+    
+    def test_invalid(self):
+        """Недопустимое выражение - ValueError из integrate"""
+        with self.assertRaises(ValueError):
+            integrate("open('f')", 0, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,6 +7,7 @@ import unittest
 import math
 import doctest
 from unittest.mock import patch
+import numpy as np
 from src.integrate import integrate
 
 class TestIntegrate(unittest.TestCase):
@@ -59,6 +60,88 @@ class TestIntegrate(unittest.TestCase):
         result = integrate(constant, 0, 5, n_iter=5000)
         self.assertAlmostEqual(result, 5.0, places=3)
 
+class TestIntegrateNumpy(unittest.TestCase):
+    """Векторизованный бэкенд numpy."""
+    
+    def test_matches_python_backend(self):
+        """numpy и python дают одну и ту же левую сумму"""
+        expected = integrate(math.cos, 0, 2, n_iter=10000)
+        result = integrate(np.cos, 0, 2, n_iter=10000, backend='numpy')
+        self.assertAlmostEqual(result, expected, places=10)
+    
+    def test_chunking_does_not_change_result(self):
+        """Разбиение на блоки (в т.ч. с неполным последним) не влияет на сумму"""
+        full = integrate(np.exp, 0, 1, n_iter=10001, backend='numpy',
+                         chunk_size=10**6)
+        chunked = integrate(np.exp, 0, 1, n_iter=10001, backend='numpy',
+                            chunk_size=1000)
+        self.assertAlmostEqual(full, chunked, places=10)
+    
+    def test_scalar_function_fallback(self):
+        """math.cos и функции, возвращающие скаляр, считаются циклом"""
+        expected = integrate(math.cos, 0, 1, n_iter=1000)
+        self.assertEqual(integrate(math.cos, 0, 1, n_iter=1000, backend='numpy'),
+                         expected)
+        result = integrate(lambda x: 1.0, 0, 5, n_iter=1000, backend='numpy')
+        self.assertAlmostEqual(result, 5.0, places=10)
+    
+    def test_unknown_backend(self):
+        """Неизвестный бэкенд - ошибка"""
+        with self.assertRaises(ValueError):
+            integrate(math.cos, 0, 1, backend='fortran')
+
+
+class TestIntegrateMethods(unittest.TestCase):
+    """Формулы высших порядков и скорость их сходимости."""
+    
+    EXACT = math.e - 1  # ∫exp(x)dx от 0 до 1
+    
+    def observed_order(self, method, n_iter=8, **kwargs):
+        """Порядок p из отношения ошибок при n_iter и 2*n_iter: log2(e1/e2)"""
+        e1 = abs(integrate(math.exp, 0, 1, n_iter=n_iter, method=method, **kwargs) - self.EXACT)
+        e2 = abs(integrate(math.exp, 0, 1, n_iter=2 * n_iter, method=method, **kwargs) - self.EXACT)
+        return math.log2(e1 / e2)
+    
+    def test_convergence_orders(self):
+        """Ошибка убывает как h^p с ожидаемым p для каждой формулы"""
+        expected = {'left': 1, 'midpoint': 2, 'trapezoid': 2, 'simpson': 4}
+        for method, order in expected.items():
+            with self.subTest(method=method):
+                self.assertAlmostEqual(self.observed_order(method), order, delta=0.1)
+    
+    def test_gauss_convergence_order(self):
+        """Гаусс-Лежандр с k узлами сходится с порядком 2k"""
+        for order in (1, 2, 3):
+            with self.subTest(order=order):
+                self.assertAlmostEqual(
+                    self.observed_order('gauss', n_iter=4, order=order), 2 * order, delta=0.2)
+    
+    def test_fewer_iterations_for_same_accuracy(self):
+        """Симпсон с n_iter в 1000 раз меньше точнее левых прямоугольников"""
+        left_error = abs(integrate(math.exp, 0, 1, n_iter=100000) - self.EXACT)
+        simpson_error = abs(integrate(math.exp, 0, 1, n_iter=100, method='simpson') - self.EXACT)
+        self.assertLess(simpson_error, left_error)
+    
+    def test_numpy_backend_same_rules(self):
+        """Бэкенд numpy дает те же значения для всех формул"""
+        for method in ('midpoint', 'trapezoid', 'simpson', 'gauss'):
+            with self.subTest(method=method):
+                expected = integrate(math.exp, 0, 1, n_iter=1000, method=method)
+                result = integrate(np.exp, 0, 1, n_iter=1000, method=method, backend='numpy')
+                self.assertAlmostEqual(result, expected, places=12)
+    
+    def test_gauss_table_cached(self):
+        """Узлы и веса Гаусса вычисляются один раз на порядок"""
+        from src.integrate import gauss_legendre
+        self.assertIs(gauss_legendre(4), gauss_legendre(4))
+        self.assertAlmostEqual(sum(gauss_legendre(4)[1]), 1.0, places=14)
+    
+    def test_unknown_method(self):
+        """Неизвестный метод - ошибка"""
+        with self.assertRaises(ValueError):
+            integrate(math.cos, 0, 1, method='romberg')
+
+
 def test_doctests():
     """Запуск doctest из модуля integrate."""
     import sys
@@ -0,0 +1,77 @@
+"""
+Юнит-тесты для адаптивного интегрирования методом Симпсона.
+Покрывает: точность, оценку погрешности, экономию вычислений f.
+"""
+
+import unittest
+import math
+import warnings
+from src.integrate import integrate
+from src.integrate_adaptive import integrate_adaptive
+
+
+class TestIntegrateAdaptive(unittest.TestCase):
+
+    def test_cos_reaches_tolerance(self):
+        """∫cos(x)dx от 0 до π/2 = 1 с заданной точностью"""
+        result = integrate_adaptive(math.cos, 0, math.pi / 2, tol=1e-10)
+        self.assertAlmostEqual(result.value, 1.0, places=10)
+        self.assertLess(result.error, 1e-10)
+    
+    def test_singular_derivative(self):
+        """sqrt(x) имеет бесконечную производную в 0 - деление сгущается там"""
+        result = integrate_adaptive(math.sqrt, 0, 1, tol=1e-8)
+        self.assertAlmostEqual(result.value, 2 / 3, places=7)
+    
+    def test_fewer_evaluations_than_rectangles(self):
+        """Та же точность, что у integrate с 10^5 точками, за сотни вычислений"""
+        calls = 0
+        def counted_exp(x):
+            nonlocal calls
+            calls += 1
+            return math.exp(x)
+        
+        exact = math.e - 1
+        rect_error = abs(integrate(math.exp, 0, 1, n_iter=100000) - exact)
+        result = integrate_adaptive(counted_exp, 0, 1, tol=rect_error)
+        self.assertLess(abs(result.value - exact), rect_error)
+        self.assertEqual(result.n_evals, calls)
+        self.assertLess(result.n_evals, 1000)
+    
+    def test_relative_tolerance(self):
+        """Большой интеграл сходится по rtol, а не по недостижимому абсолютному tol"""
+        result = integrate_adaptive(math.exp, 0, 100)
+        exact = math.expm1(100)
+        self.assertLess(abs(result.value - exact) / exact, 1e-9)
+        self.assertLess(result.n_evals, 10000)
+    
+    def test_evaluation_budget(self):
+        """При исчерпании max_evals деление останавливается с предупреждением"""
+        with self.assertWarns(RuntimeWarning):
+            result = integrate_adaptive(math.exp, 0, 100, rtol=0, max_evals=2000)
+        self.assertLess(result.n_evals, 2000 + 2 * 50)
+        self.assertLess(abs(result.value - math.expm1(100)), result.error)
+    
+    def test_depth_limit_warns(self):
+        """Отрезок, принятый на глубине max_depth без допуска, дает предупреждение"""
+        with self.assertWarns(RuntimeWarning):
+            result = integrate_adaptive(math.sqrt, 0, 1, tol=1e-12, max_depth=3)
+        self.assertAlmostEqual(result.value, 2 / 3, places=2)
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            integrate_adaptive(math.cos, 0, math.pi / 2)
+    
+    def test_invalid_arguments(self):
+        """b <= a, tol <= 0, rtol < 0 или max_evals < 3 - ошибка"""
+        with self.assertRaises(ValueError):
+            integrate_adaptive(math.cos, 1, 0)
+        with self.assertRaises(ValueError):
+            integrate_adaptive(math.cos, 0, 1, tol=0)
+        with self.assertRaises(ValueError):
+            integrate_adaptive(math.cos, 0, 1, rtol=-1)
+        with self.assertRaises(ValueError):
+            integrate_adaptive(math.cos, 0, 1, max_evals=0)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
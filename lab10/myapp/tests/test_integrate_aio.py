@@ -0,0 +1,138 @@
+"""
+Юнит-тесты для асинхронного интегрирования (asyncio).
+Покрывает: точность, таймауты, отмену, совместное использование пула.
+"""
+
+import asyncio
+import math
+import time
+import unittest
+from unittest import mock
+from src import integrate_aio
+from src.integrate import integrate
+from src.integrate_async import IntegratorPool, split_steps
+from src.integrate_aio import integrate_async
+
+
+class TestSplitSteps(unittest.TestCase):
+    
+    def test_exact_partition(self):
+        """Куски покрывают все n_iter шагов, включая остаток"""
+        chunks = split_steps(0, 1, 10, 4)
+        self.assertEqual([steps for _, _, steps in chunks], [4, 4, 2])
+        self.assertEqual(chunks[0][0], 0)
+        self.assertEqual(chunks[-1][1], 1)
+        for (_, hi, _), (lo, _, _) in zip(chunks, chunks[1:]):
+            self.assertEqual(hi, lo)
+
+
+class TestPackageExport(unittest.TestCase):
+    
+    def test_export_does_not_shadow_module(self):
+        """Корутина экспортируется как src.aintegrate, модуль src.integrate_async не перекрыт"""
+        import src
+        import src.integrate_async as module
+        self.assertIs(src.aintegrate, integrate_async)
+        self.assertTrue(hasattr(module, 'CHUNKS_PER_WORKER'))
+        self.assertIs(src.integrate_async, module)
+
+
+class TestIntegrateAsync(unittest.IsolatedAsyncioTestCase):
+    
+    def setUp(self):
+        self.pool = IntegratorPool(n_jobs=2, kind='threads')
+    
+    def tearDown(self):
+        self.pool.shutdown(cancel_futures=True)
+    
+    async def test_invalid_arguments(self):
+        """b <= a или n_iter <= 0 - ошибка до отправки кусков"""
+        for a, b, n_iter in ((1, 0, 100), (0, 1, 0), (0, 1, -5)):
+            with self.subTest(a=a, b=b, n_iter=n_iter):
+                with self.assertRaisesRegex(ValueError, "n_iter > 0"):
+                    await integrate_async(math.cos, a, b, n_iter=n_iter, pool=self.pool)
+    
+    async def test_matches_integrate(self):
+        """Сумма по кускам совпадает с integrate на той же сетке"""
+        expected = integrate(math.exp, 0, 1, n_iter=10001, method='simpson')
+        result = await integrate_async(math.exp, 0, 1, n_iter=10001, chunksize=1000,
+                                       pool=self.pool, method='simpson')
+        self.assertAlmostEqual(result, expected, places=12)
+    
+    async def test_concurrent_requests_share_pool(self):
+        """Несколько запросов одновременно используют один пул"""
+        requests = [integrate_async(math.sin, 0, b, n_iter=20000, chunksize=2000, pool=self.pool)
+                    for b in (1, 2, 3)]
+        results = await asyncio.gather(*requests)
+        for b, result in zip((1, 2, 3), results):
+            self.assertAlmostEqual(result, 1 - math.cos(b), places=3)
+    
+    async def test_timeout_cancels_remaining_chunks(self):
+        """При таймауте оставшиеся куски не выполняются и пул свободен"""
+        calls = 0
+        def slow(x):
+            nonlocal calls
+            calls += 1
+            time.sleep(0.001)
+            return x
+        
+        with self.assertRaises(asyncio.TimeoutError):
+            await integrate_async(slow, 0, 1, n_iter=10000, chunksize=10,
+                                  pool=self.pool, timeout=0.1)
+        await asyncio.sleep(0.05)
+        self.assertLess(calls, 10000)
+        result = await integrate_async(math.cos, 0, 1, n_iter=100, pool=self.pool, timeout=5)
+        self.assertAlmostEqual(result, integrate(math.cos, 0, 1, n_iter=100), places=12)
+    
+    async def test_event_loop_not_blocked(self):
+        """Пока идет интегрирование, цикл событий обслуживает другие задачи"""
+        ticks = 0
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+        
+        task = asyncio.create_task(ticker())
+        await integrate_async(math.cos, 0, 1, n_iter=200000, chunksize=10000, pool=self.pool)
+        task.cancel()
+        self.assertGreater(ticks, 1)
+
+
+class TestIntegrateAsyncProcesses(unittest.IsolatedAsyncioTestCase):
+    
+    async def test_shared_pool_created_off_loop(self):
+        """Общий пул создается в другом потоке, цикл событий не блокируется"""
+        def slow_pool(n_jobs):
+            time.sleep(0.2)
+            return IntegratorPool(n_jobs=n_jobs, kind='threads')
+        
+        ticks = 0
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+        
+        task = asyncio.create_task(ticker())
+        with mock.patch('src.integrate_aio.IntegratorPool', side_effect=slow_pool) as factory:
+            try:
+                requests = [integrate_async(math.cos, 0, 1, n_iter=100) for _ in range(2)]
+                results = await asyncio.gather(*requests)
+                self.assertEqual(factory.call_count, 1)
+            finally:
+                integrate_aio.shutdown_shared_pool()
+        task.cancel()
+        self.assertGreater(ticks, 5)
+        self.assertEqual(results[0], integrate(math.cos, 0, 1, n_iter=100))
+    
+    async def test_process_pool(self):
+        """Работа с пулом процессов"""
+        with IntegratorPool(n_jobs=2) as pool:
+            result = await integrate_async(math.cos, 0, math.pi / 2, n_iter=10000,
+                                           chunksize=1000, pool=pool)
+        self.assertAlmostEqual(result, 1.0, places=3)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,148 @@
+"""
+Юнит-тесты для параллельного интегрирования (Итерации 2-3).
+Покрывает: IntegratorPool (потоки и процессы), переиспользование рабочих.
+"""
+
+import unittest
+import math
+import sys
+from unittest import mock
+from src.integrate import integrate
+from src.integrate_async import (IntegratorPool, integrate_threads, integrate_processes,
+                                 integrate_many, gil_enabled, CHUNKS_PER_WORKER)
+
+
+class TestIntegratorPool(unittest.TestCase):
+    
+    def test_threads_pool_matches_integrate(self):
+        """Пул потоков дает тот же результат, что и последовательный вызов"""
+        expected = integrate(math.cos, 0, math.pi / 2, n_iter=10000)
+        with IntegratorPool(n_jobs=2, kind='threads') as pool:
+            result = pool.integrate(math.cos, 0, math.pi / 2, n_iter=10000)
+        self.assertAlmostEqual(result, expected, places=9)
+    
+    def test_processes_pool_reused_for_many_calls(self):
+        """Один пул процессов обслуживает несколько интегралов"""
+        with IntegratorPool(n_jobs=2) as pool:
+            results = [pool.integrate(math.sin, 0, b, n_iter=2000) for b in (1, 2, 3)]
+            self.assertEqual(pool.calls, 3)
+            self.assertGreater(pool.amortized_time, 0)
+        for b, result in zip((1, 2, 3), results):
+            self.assertAlmostEqual(result, 1 - math.cos(b), places=2)
+    
+    def test_closed_pool_raises(self):
+        """После shutdown пул не принимает задачи"""
+        pool = IntegratorPool(n_jobs=1, kind='threads')
+        pool.shutdown()
+        pool.shutdown()
+        with self.assertRaises(RuntimeError):
+            pool.integrate(math.cos, 0, 1)
+    
+    def test_invalid_kind(self):
+        """Неизвестный тип пула - ошибка"""
+        with self.assertRaises(ValueError):
+            IntegratorPool(kind='fibers')
+
+
+class TestChunkScheduling(unittest.TestCase):
+    
+    def test_processes_keep_remainder_steps(self):
+        """n_iter, не делящееся на n_jobs, считается целиком"""
+        expected = integrate(math.exp, 0, 1, n_iter=1001)
+        result = integrate_processes(math.exp, 0, 1, n_jobs=2, n_iter=1001)
+        self.assertAlmostEqual(result, expected, places=12)
+    
+    def test_chunksize_does_not_change_result(self):
+        """Любой размер куска дает ту же сумму на той же сетке"""
+        expected = integrate(math.sin, 0, 2, n_iter=997)
+        for chunksize in (1, 10, 333, 997, 5000):
+            with self.subTest(chunksize=chunksize):
+                result = integrate_processes(math.sin, 0, 2, n_jobs=2, n_iter=997,
+                                             chunksize=chunksize)
+                self.assertAlmostEqual(result, expected, places=12)
+    
+    def test_threads_and_pool_exact_partition(self):
+        """Потоки и IntegratorPool тоже не теряют остаток"""
+        expected = integrate(math.exp, 0, 1, n_iter=1003)
+        self.assertAlmostEqual(integrate_threads(math.exp, 0, 1, n_jobs=4, n_iter=1003),
+                               expected, places=12)
+        with IntegratorPool(n_jobs=2, kind='threads') as pool:
+            self.assertAlmostEqual(pool.integrate(math.exp, 0, 1, n_iter=1003, chunksize=100),
+                                   expected, places=12)
+    
+    def test_free_threaded_uses_fine_chunks(self):
+        """Без GIL потоки получают по CHUNKS_PER_WORKER кусков, под GIL - по одному"""
+        for enabled, per_thread in ((True, 1), (False, CHUNKS_PER_WORKER)):
+            with self.subTest(gil=enabled):
+                with mock.patch.object(sys, '_is_gil_enabled', create=True,
+                                       return_value=enabled):
+                    self.assertEqual(gil_enabled(), enabled)
+                    value, stats = integrate_threads(math.exp, 0, 1, n_jobs=2, n_iter=1003,
+                                                     return_stats=True)
+                self.assertEqual(len(stats.chunks), 2 * per_thread)
+                self.assertAlmostEqual(value, integrate(math.exp, 0, 1, n_iter=1003), places=12)
+
+
+class TestThreadKernels(unittest.TestCase):
+    
+    def test_cython_nogil_matches_python(self):
+        """Ядро без GIL (или его numpy-замена) дает ту же сумму, что и Python-ядро"""
+        expected = integrate_threads(math.cos, 0, math.pi / 2, n_jobs=4, n_iter=10000)
+        result = integrate_threads(math.cos, 0, math.pi / 2, n_jobs=4, n_iter=10000,
+                                   kernel='cython_nogil')
+        self.assertAlmostEqual(result, expected, places=9)
+    
+    def test_cython_nogil_rejects_other_functions(self):
+        """Ядро cython_nogil реализует только cos"""
+        with self.assertRaises(ValueError):
+            integrate_threads(math.sin, 0, 1, kernel='cython_nogil')
+        def cos(x):
+            return 2 * math.cos(x)
+        with self.assertRaises(ValueError):
+            integrate_threads(cos, 0, 1, kernel='cython_nogil')
+    
+    def test_unknown_kernel(self):
+        """Неизвестное ядро - ошибка"""
+        with self.assertRaises(ValueError):
+            integrate_threads(math.cos, 0, 1, kernel='asm')
+
+
+class TestIntegrateMany(unittest.TestCase):
+    
+    def test_sequence_jobs_use_indices(self):
+        """Для списка заданий job_id - индекс, результаты совпадают с integrate"""
+        jobs = [(math.sin, 0, b) for b in (0.5, 1.0, 1.5, 2.0, 2.5)]
+        results = dict(integrate_many(jobs, n_jobs=2, chunksize=2, n_iter=2000))
+        self.assertEqual(sorted(results), [0, 1, 2, 3, 4])
+        for i, (f, a, b) in enumerate(jobs):
+            self.assertAlmostEqual(results[i], integrate(f, a, b, n_iter=2000), places=12)
+    
+    def test_lambdas_are_registered(self):
+        """Лямбды и замыкания передаются процессам через реестр"""
+        jobs = [(lambda x, k=k: k * x, 0, 1) for k in (1, 2, 3)]
+        results = dict(integrate_many(jobs, n_jobs=2, n_iter=1000))
+        for i, (f, a, b) in enumerate(jobs):
+            self.assertAlmostEqual(results[i], integrate(f, a, b, n_iter=1000), places=12)
+    
+    def test_mapping_jobs_with_options(self):
+        """Словарь заданий и аргументы integrate для отдельного задания"""
+        jobs = {
+            'left': (math.exp, 0, 1),
+            'simpson': (math.exp, 0, 1, {'method': 'simpson', 'n_iter': 10}),
+        }
+        with IntegratorPool(n_jobs=2, kind='threads') as pool:
+            results = dict(integrate_many(jobs, pool=pool, n_iter=100))
+        self.assertAlmostEqual(results['left'], integrate(math.exp, 0, 1, n_iter=100))
+        self.assertAlmostEqual(results['simpson'], math.e - 1, places=6)
+    
+    def test_results_stream_in_completion_order(self):
+        """Быстрые задания выдаются раньше медленного"""
+        jobs = [(math.cos, 0, 1, {'n_iter': 300000})] + [(math.cos, 0, 1)] * 3
+        with IntegratorPool(n_jobs=2) as pool:
+            order = [job_id for job_id, _ in integrate_many(jobs, pool=pool, n_iter=100)]
+        self.assertEqual(sorted(order), [0, 1, 2, 3])
+        self.assertNotEqual(order[0], 0)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,147 @@
+"""
+Юнит-тесты для кэша интегралов.
+Покрывает: ключи функций, LRU, хранение на диске, уточнение по старым узлам.
+"""
+
+import unittest
+import math
+import os
+import tempfile
+from functools import partial
+
+import numpy as np
+
+from src.integrate import integrate
+from src.integrate_cache import IntegralCache, function_key
+
+
+class Calls:
+    """Счетчик вызовов; атрибут класса не входит в ключ кэша, в отличие от
+    изменяемых глобальных значений."""
+    count = 0
+
+
+def counting_sin(x):
+    """sin(x) со счетчиком вызовов в Calls.count."""
+    Calls.count += 1
+    return math.sin(x)
+
+
+class TestFunctionKey(unittest.TestCase):
+    
+    def test_same_source_same_key(self):
+        """Одинаковые функции дают одинаковый ключ, разные - разный"""
+        make = lambda k: (lambda x: k * x)
+        self.assertEqual(function_key(make(2)), function_key(make(2)))
+        self.assertNotEqual(function_key(make(2)), function_key(make(3)))
+        self.assertNotEqual(function_key(lambda x: x + 1), function_key(lambda x: x + 2))
+    
+    def test_builtins(self):
+        """Встроенные функции идентифицируются модулем и именем"""
+        self.assertEqual(function_key(math.cos), "math:cos")
+    
+    def test_callable_objects_keyed_by_state(self):
+        """Вызываемые объекты различаются состоянием"""
+        class Scale:
+            def __init__(self, k):
+                self.k = k
+            def __call__(self, x):
+                return self.k * x
+        self.assertEqual(function_key(Scale(2)), function_key(Scale(2)))
+        self.assertNotEqual(function_key(Scale(2)), function_key(Scale(3)))
+    
+    def test_bound_methods_and_partials(self):
+        """Связанные методы различаются __self__, partial - аргументами"""
+        class Scale:
+            def __init__(self, k):
+                self.k = k
+            def f(self, x):
+                return self.k * x
+        self.assertNotEqual(function_key(Scale(1).f), function_key(Scale(5).f))
+        self.assertEqual(function_key(Scale(1).f), function_key(Scale(1).f))
+        self.assertNotEqual(function_key(partial(math.pow, 2)), function_key(partial(math.pow, 3)))
+        cache = IntegralCache()
+        self.assertAlmostEqual(cache.integrate(Scale(1).f, 0, 1, n_iter=10), 0.45)
+        self.assertAlmostEqual(cache.integrate(Scale(5).f, 0, 1, n_iter=10), 2.25)
+    
+    def test_globals_and_large_arrays(self):
+        """В ключ входят используемые глобальные значения и массивы целиком"""
+        first, second = np.zeros(10000), np.zeros(10000)
+        second[5000] = 1.0
+        self.assertNotEqual(function_key(lambda x: first[0] * x),
+                            function_key(lambda x: second[0] * x))
+        namespace = {'K': 2}
+        f = eval("lambda x: K * x", namespace)
+        key = function_key(f)
+        namespace['K'] = 3
+        self.assertNotEqual(function_key(f), key)
+    
+    def test_unkeyable_bypasses_cache(self):
+        """Объект без надежного ключа вычисляется без кэша"""
+        class Opaque:
+            __slots__ = ()
+            def __call__(self, x):
+                return x
+        with self.assertRaises(TypeError):
+            function_key(Opaque())
+        cache = IntegralCache()
+        self.assertAlmostEqual(cache.integrate(Opaque(), 0, 1, n_iter=4), 0.375)
+        self.assertEqual(cache.info().currsize, 0)
+
+
+class TestIntegralCache(unittest.TestCase):
+    
+    def test_hit_does_not_recompute(self):
+        """Повторный запрос берется из кэша без вызовов f"""
+        cache = IntegralCache()
+        first = cache.integrate(counting_sin, 0, 1, n_iter=500)
+        calls = Calls.count
+        self.assertEqual(cache.integrate(counting_sin, 0, 1, n_iter=500), first)
+        self.assertEqual(Calls.count, calls)
+        self.assertEqual(cache.info().hits, 1)
+    
+    def test_doubling_reuses_samples(self):
+        """Удвоение n_iter для left/trapezoid вычисляет только n новых узлов"""
+        for method in ('left', 'trapezoid'):
+            with self.subTest(method=method):
+                cache = IntegralCache()
+                cache.integrate(counting_sin, 0, 1, n_iter=1000, method=method)
+                before = Calls.count
+                refined = cache.integrate(counting_sin, 0, 1, n_iter=4000, method=method)
+                self.assertEqual(Calls.count - before, 1000 + 2000)
+                self.assertAlmostEqual(refined, integrate(math.sin, 0, 1, n_iter=4000,
+                                                          method=method), places=12)
+    
+    def test_midpoint_tripling_reuses_samples(self):
+        """Средние прямоугольники уточняются утроением n_iter"""
+        cache = IntegralCache()
+        cache.integrate(counting_sin, 0, 1, n_iter=1000, method='midpoint')
+        before = Calls.count
+        refined = cache.integrate(counting_sin, 0, 1, n_iter=3000, method='midpoint')
+        self.assertEqual(Calls.count - before, 2000)
+        self.assertAlmostEqual(refined, integrate(math.sin, 0, 1, n_iter=3000,
+                                                  method='midpoint'), places=12)
+    
+    def test_lru_eviction(self):
+        """Старые записи вытесняются при превышении maxsize"""
+        cache = IntegralCache(maxsize=2)
+        for b in (1, 2, 3):
+            cache.integrate(math.sin, 0, b, n_iter=10)
+        self.assertEqual(cache.info().currsize, 2)
+        cache.integrate(math.sin, 0, 1, n_iter=10)
+        self.assertEqual(cache.info().hits, 0)
+    
+    def test_disk_persistence(self):
+        """Результаты сохраняются на диск и читаются новым кэшем"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "integrals")
+            with IntegralCache(path=path) as cache:
+                value = cache.integrate(math.cos, 0, 1, n_iter=100, method='simpson')
+            with IntegralCache(path=path) as cache:
+                self.assertEqual(cache.integrate(math.cos, 0, 1, n_iter=100, method='simpson'),
+                                 value)
+                self.assertEqual(cache.info().hits, 1)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,104 @@
+"""
+Юнит-тесты для Cython-расширения (Итерации 4-5) и его numpy-замены.
+Тесты собранного расширения пропускаются, если оно не собрано:
+python run_cython.py build_ext --inplace
+"""
+
+import unittest
+import math
+import pickle
+import subprocess
+import sys
+from pathlib import Path
+
+import cython
+from cython import integrate_python
+from src.integrate import integrate
+from src.integrate_async import integrate_threads
+
+ROOT = Path(__file__).parent.parent
+
+
+class TestKernelFallback(unittest.TestCase):
+    """Kernel из integrate_python (без сборки)."""
+    
+    impl = integrate_python
+    
+    def test_catalog_matches_math(self):
+        """Функции каталога совпадают с math"""
+        for name in ('sin', 'cos', 'tan', 'exp', 'log', 'sqrt'):
+            with self.subTest(name=name):
+                self.assertAlmostEqual(self.impl.kernel(name)(0.7), getattr(math, name)(0.7),
+                                       places=14)
+    
+    def test_poly_lowest_coefficient_first(self):
+        """poly([c0, c1, c2]) = c0 + c1*x + c2*x^2"""
+        self.assertAlmostEqual(self.impl.poly([1, 2, 1])(3.0), 16.0)
+        self.assertAlmostEqual(self.impl.poly([5])(3.0), 5.0)
+    
+    def test_composition(self):
+        """Сумма, произведение, степень и композиция Kernel"""
+        x = self.impl.kernel('x')
+        k = self.impl.kernel('sin') * self.impl.poly([1, 0, 2]) + 3 - x ** 2 / 2
+        value = math.sin(0.5) * (1 + 2 * 0.25) + 3 - 0.25 / 2
+        self.assertAlmostEqual(k(0.5), value, places=14)
+        self.assertAlmostEqual((-x).apply('exp')(1.0), math.exp(-1.0), places=14)
+        self.assertAlmostEqual((2 * self.impl.const(3.0))(0.0), 6.0)
+    
+    def test_integrate_uses_kernel(self):
+        """integrate с Kernel дает те же суммы для всех методов"""
+        for method in ('left', 'midpoint', 'trapezoid', 'simpson', 'gauss'):
+            with self.subTest(method=method):
+                expected = integrate(math.exp, 0, 1, n_iter=1000, method=method)
+                result = integrate(self.impl.kernel('exp'), 0, 1, n_iter=1000, method=method)
+                self.assertAlmostEqual(result, expected, places=12)
+        self.assertAlmostEqual(self.impl.integrate_kernel(self.impl.kernel('cos'), 0, 1, 1000),
+                               integrate(math.cos, 0, 1, n_iter=1000), places=12)
+        self.assertAlmostEqual(self.impl.integrate_cos_nogil(0, 1, 1000),
+                               integrate(math.cos, 0, 1, n_iter=1000), places=12)
+    
+    def test_threads_and_pickle(self):
+        """Kernel работает в потоках и сериализуется для процессов"""
+        k = self.impl.poly([1, 2, 1])
+        result = integrate_threads(k, 0, 1, n_jobs=2, n_iter=10000, kernel='cython_nogil')
+        self.assertAlmostEqual(result, 7 / 3, places=3)
+        self.assertEqual(pickle.loads(pickle.dumps(k))(2.0), 9.0)
+    
+    def test_invalid_programs(self):
+        """Неизвестные функции и некорректные программы - ошибка"""
+        with self.assertRaises(ValueError):
+            self.impl.kernel('gamma')
+        with self.assertRaises(ValueError):
+            self.impl.Kernel([0, 0])
+
+
+@unittest.skipUnless(cython.available(), "Cython-расширение не собрано")
+class TestKernelExtension(TestKernelFallback):
+    """Те же тесты для собранного расширения."""
+    
+    impl = cython.load()
+
+
+class TestLazyLoading(unittest.TestCase):
+    
+    def test_import_does_not_load_extension(self):
+        """Импорт пакетов не загружает расширение, первое обращение - загружает"""
+        code = (
+            "import sys, src, cython\n"
+            "assert 'cython.integrate_cython' not in sys.modules\n"
+            "assert cython.load_time is None\n"
+            "cython.kernel('x')\n"
+            "assert cython.load_time is not None\n"
+        )
+        subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True)
+    
+    def test_public_api_available(self):
+        """Все имена __all__ доступны с расширением и без него"""
+        for name in cython.__all__:
+            with self.subTest(name=name):
+                self.assertTrue(hasattr(cython, name))
+                self.assertTrue(hasattr(integrate_python, name))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,81 @@
+"""
+Юнит-тесты для многомерного интегрирования.
+Покрывает: сетку, Монте-Карло, квази-Монте-Карло, оценки погрешности, процессы.
+"""
+
+import unittest
+import math
+import numpy as np
+from src.integrate_nd import integrate_nd, halton
+
+
+def gaussian(*xs):
+    """exp(-|x|^2), сериализуется pickle для процессов"""
+    return np.exp(-sum(x ** 2 for x in xs))
+
+
+GAUSSIAN_3D = (math.sqrt(math.pi) * math.erf(1)) ** 3  # ∫ по [-1, 1]^3
+
+
+class TestIntegrateND(unittest.TestCase):
+    
+    def test_grid_polynomial(self):
+        """Сетка средних точек точна для билинейной функции"""
+        result = integrate_nd(lambda x, y: x * y + 1, [(0, 1), (0, 2)], n_points=400)
+        self.assertAlmostEqual(result.value, 3.0, places=10)
+        self.assertIsNone(result.error)
+        self.assertEqual(result.n_evals, 400)
+    
+    def test_grid_batches_do_not_change_result(self):
+        """Разбиение сетки на пакеты не влияет на результат"""
+        whole = integrate_nd(gaussian, [(-1, 1)] * 3, n_points=8000)
+        batched = integrate_nd(gaussian, [(-1, 1)] * 3, n_points=8000, batch_size=777)
+        self.assertAlmostEqual(whole.value, batched.value, places=10)
+        self.assertAlmostEqual(whole.value, GAUSSIAN_3D, places=2)
+    
+    def test_sampling_error_estimates(self):
+        """MC и QMC попадают в несколько оценок погрешности от точного значения"""
+        for method in ('mc', 'qmc'):
+            with self.subTest(method=method):
+                result = integrate_nd(gaussian, [(-1, 1)] * 3, method=method,
+                                      n_points=50000, batch_size=10000, seed=7)
+                self.assertGreater(result.error, 0)
+                self.assertLess(abs(result.value - GAUSSIAN_3D), 5 * result.error)
+    
+    def test_qmc_more_accurate_than_mc(self):
+        """Квази-Монте-Карло дает меньшую погрешность при том же числе точек"""
+        mc = integrate_nd(gaussian, [(-1, 1)] * 3, method='mc', n_points=40000, seed=1)
+        qmc = integrate_nd(gaussian, [(-1, 1)] * 3, method='qmc', n_points=40000, seed=1)
+        self.assertLess(qmc.error, mc.error)
+    
+    def test_seed_reproducible(self):
+        """Одинаковое зерно - одинаковый результат"""
+        first = integrate_nd(gaussian, [(0, 1)] * 2, method='mc', n_points=1000, seed=3)
+        second = integrate_nd(gaussian, [(0, 1)] * 2, method='mc', n_points=1000, seed=3)
+        self.assertEqual(first, second)
+    
+    def test_processes_match_serial(self):
+        """Пакеты в процессах дают тот же результат, что и последовательно"""
+        for method in ('grid', 'mc', 'qmc'):
+            with self.subTest(method=method):
+                serial = integrate_nd(gaussian, [(-1, 1)] * 2, method=method, n_points=20000,
+                                      batch_size=5000, seed=5)
+                parallel = integrate_nd(gaussian, [(-1, 1)] * 2, method=method, n_points=20000,
+                                        batch_size=5000, seed=5, n_jobs=2)
+                self.assertAlmostEqual(serial.value, parallel.value, places=10)
+    
+    def test_halton_first_points(self):
+        """Первые точки Холтона по основаниям 2 и 3"""
+        points = halton(np.arange(3), 2)
+        np.testing.assert_allclose(points, [[1 / 2, 1 / 3], [1 / 4, 2 / 3], [3 / 4, 1 / 9]])
+    
+    def test_invalid_arguments(self):
+        """Некорректные границы и метод - ошибка"""
+        with self.assertRaises(ValueError):
+            integrate_nd(gaussian, [(1, 0)])
+        with self.assertRaises(ValueError):
+            integrate_nd(gaussian, [(0, 1)], method='sparse')
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
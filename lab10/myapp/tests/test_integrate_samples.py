@@ -0,0 +1,92 @@
+"""
+Юнит-тесты для интегрирования отсчетов (src.integrate_samples).
+"""
+
+import unittest
+import math
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from src.integrate_samples import integrate_samples, METHODS
+
+# np.trapezoid появилась в NumPy 2.0, раньше - np.trapz
+trapezoid = getattr(np, 'trapezoid', None) or np.trapz
+
+
+def reference(y: np.ndarray, dx: float, method: str) -> float:
+    """Те же формулы напрямую по всему массиву."""
+    if method == 'left':
+        return dx * float(np.sum(y[:-1]))
+    if method == 'trapezoid' or len(y) == 2:
+        return float(trapezoid(y, dx=dx))
+    if len(y) % 2 == 0:
+        return reference(y[:-1], dx, 'simpson') + dx * (y[-2] + y[-1]) / 2
+    return dx / 3 * float(y[0] + y[-1] + 4 * np.sum(y[1:-1:2]) + 2 * np.sum(y[2:-1:2]))
+
+
+class TestIntegrateSamples(unittest.TestCase):
+    """Формулы, блоки, файлы и процессы."""
+    
+    def setUp(self):
+        self.rng = np.random.default_rng(0)
+    
+    def test_chunks_match_reference(self):
+        """Результат не зависит от размера блока (в том числе нечетного)"""
+        for n in (2, 3, 10, 1001, 1002):
+            y = self.rng.random(n)
+            for method in METHODS:
+                for chunk_size in (1, 7, 64, 10_000):
+                    with self.subTest(n=n, method=method, chunk_size=chunk_size):
+                        self.assertAlmostEqual(
+                            integrate_samples(y, 0.1, method=method, chunk_size=chunk_size),
+                            reference(y, 0.1, method), places=10)
+    
+    def test_simpson_exact_for_cubic(self):
+        """Симпсон по нечетному числу отсчетов точен для кубического многочлена"""
+        x = np.linspace(0, 2, 201)
+        self.assertAlmostEqual(integrate_samples(x ** 3, 0.01, method='simpson'), 4.0, places=12)
+    
+    def test_file_and_processes(self):
+        """Файл с заголовком сводится блоками в процессах"""
+        y = np.sin(np.linspace(0, math.pi, 100_001))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'signal.f64'
+            with open(path, 'wb') as f:
+                f.write(b'HEADER!!')
+                f.write(y.tobytes())
+            for n_jobs in (1, 2):
+                with self.subTest(n_jobs=n_jobs):
+                    value, stats = integrate_samples(path, math.pi / 100_000, offset=8,
+                                                     chunk_size=30_001, n_jobs=n_jobs,
+                                                     return_stats=True)
+                    self.assertAlmostEqual(value, reference(y, math.pi / 100_000, 'trapezoid'),
+                                           places=12)
+                    self.assertEqual(len(stats.chunks), 4)
+                    self.assertEqual(stats.n_evals, 100_001)
+    
+    def test_float32_memmap(self):
+        """Другой тип отсчетов и готовый np.memmap"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'ones.f32'
+            np.ones(1001, dtype=np.float32).tofile(path)
+            self.assertAlmostEqual(integrate_samples(path, 0.001, dtype=np.float32), 1.0)
+            mapped = np.memmap(path, dtype=np.float32, mode='r')
+            self.assertAlmostEqual(integrate_samples(mapped, 0.001, method='simpson'), 1.0)
+            del mapped
+    
+    def test_invalid(self):
+        """Некорректные аргументы"""
+        with self.assertRaises(ValueError):
+            integrate_samples(np.ones(1), 0.1)
+        with self.assertRaises(ValueError):
+            integrate_samples(np.ones((3, 3)), 0.1)
+        with self.assertRaises(ValueError):
+            integrate_samples(np.ones(3), 0.0)
+        with self.assertRaises(ValueError):
+            integrate_samples(np.ones(3), 0.1, method='gauss')
+
+
+if __name__ == '__main__':
+    unittest.main()
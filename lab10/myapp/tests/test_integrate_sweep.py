@@ -0,0 +1,68 @@
+"""
+Юнит-тесты для интегрирования по сетке параметров (src.integrate_sweep).
+"""
+
+import unittest
+import math
+
+import numpy as np
+
+from src.integrate import integrate, METHODS
+from src.integrate_sweep import integrate_sweep
+
+
+def decay(x, p):
+    """exp(-p*x): векторизована по x и p."""
+    return np.exp(-p * x)
+
+
+class TestIntegrateSweep(unittest.TestCase):
+    
+    def setUp(self):
+        self.params = np.linspace(0.1, 3, 37)
+    
+    def test_matches_integrate_per_parameter(self):
+        """Каждое значение совпадает с integrate для того же p"""
+        for method in METHODS:
+            with self.subTest(method=method):
+                values = integrate_sweep(decay, 0, 2, self.params, n_iter=200, method=method)
+                expected = [integrate(lambda x: math.exp(-p * x), 0, 2, n_iter=200,
+                                      method=method) for p in self.params]
+                np.testing.assert_allclose(values, expected, rtol=1e-12)
+    
+    def test_tiles_do_not_change_result(self):
+        """Размер плитки влияет только на память"""
+        expected = integrate_sweep(decay, 0, 1, self.params, n_iter=101, method='simpson')
+        for tile_size in (1, 10, 100, 5000):
+            with self.subTest(tile_size=tile_size):
+                np.testing.assert_allclose(
+                    integrate_sweep(decay, 0, 1, self.params, n_iter=101, method='simpson',
+                                    tile_size=tile_size), expected, rtol=1e-12)
+    
+    def test_processes(self):
+        """Плитки раздаются процессам"""
+        values, stats = integrate_sweep(decay, 0, 1, self.params, n_iter=1000, method='gauss',
+                                        n_jobs=2, return_stats=True)
+        np.testing.assert_allclose(values, (1 - np.exp(-self.params)) / self.params, rtol=1e-12)
+        self.assertGreaterEqual(len(stats.chunks), 2 * 8)
+        self.assertEqual(stats.n_evals, 3 * 1000 * len(self.params))
+    
+    def test_constant_function_broadcasts(self):
+        """f может вернуть массив, который только приводится к плитке"""
+        values = integrate_sweep(lambda x, p: 2.0 + 0 * p, 0, 3, [1, 2], n_iter=10)
+        np.testing.assert_allclose(values, [6.0, 6.0])
+    
+    def test_invalid(self):
+        """Некорректные аргументы"""
+        with self.assertRaises(ValueError):
+            integrate_sweep(decay, 1, 0, [1.0])
+        with self.assertRaises(ValueError):
+            integrate_sweep(decay, 0, 1, [])
+        with self.assertRaises(ValueError):
+            integrate_sweep(decay, 0, 1, [[1.0]])
+        with self.assertRaises(ValueError):
+            integrate_sweep(decay, 0, 1, [1.0], method='romberg')
+
+
+if __name__ == '__main__':
+    unittest.main()
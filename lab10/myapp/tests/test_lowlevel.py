@@ -0,0 +1,63 @@
+"""
+Юнит-тесты для C-функций в качестве подынтегральных (ctypes).
+"""
+
+import unittest
+import ctypes
+import ctypes.util
+import math
+from src.integrate import integrate
+from src.integrate_async import integrate_threads
+from src.lowlevel import LowLevelCallable
+
+LIBM = ctypes.CDLL(ctypes.util.find_library("m"))
+
+
+def libm_function(name):
+    """Функция libm с сигнатурой double(double)."""
+    func = getattr(LIBM, name)
+    func.restype = ctypes.c_double
+    func.argtypes = (ctypes.c_double,)
+    return func
+
+
+class TestLowLevelCallable(unittest.TestCase):
+    
+    def test_libm_pointer_in_integrate(self):
+        """Указатель на cos из libm интегрируется как math.cos"""
+        expected = integrate(math.cos, 0, 1, n_iter=1000, method='simpson')
+        result = integrate(libm_function("cos"), 0, 1, n_iter=1000, method='simpson')
+        self.assertAlmostEqual(result, expected, places=12)
+    
+    def test_user_data_signature(self):
+        """double(double, void*) получает user_data вторым аргументом"""
+        prototype = ctypes.CFUNCTYPE(ctypes.c_double, ctypes.c_double, ctypes.c_void_p)
+        scale = ctypes.c_double(3.0)
+        
+        def scaled(x, data):
+            return ctypes.cast(data, ctypes.POINTER(ctypes.c_double)).contents.value * x
+        
+        callback = prototype(scaled)
+        result = integrate(LowLevelCallable(callback, scale), 0, 2, n_iter=100,
+                           method='trapezoid')
+        self.assertAlmostEqual(result, 6.0, places=10)
+    
+    def test_threads_cython_nogil(self):
+        """C-функции принимаются ядром cython_nogil"""
+        result = integrate_threads(libm_function("exp"), 0, 1, n_jobs=2, n_iter=10000,
+                                   kernel='cython_nogil')
+        self.assertAlmostEqual(result, math.e - 1, places=3)
+    
+    def test_signature_checked(self):
+        """Неподходящие функции и сигнатуры - ошибка"""
+        with self.assertRaises(TypeError):
+            LowLevelCallable(math.cos)
+        untyped = ctypes.CDLL(ctypes.util.find_library("m")).sin
+        with self.assertRaises(ValueError):
+            LowLevelCallable(untyped)
+        with self.assertRaises(ValueError):
+            LowLevelCallable(libm_function("cos"), user_data=1)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,111 @@
+"""
+Юнит-тесты для реестра подынтегральных функций (src.registry).
+"""
+
+import unittest
+import math
+import multiprocessing as mp
+import pickle
+from functools import partial
+from unittest import mock
+
+from src.integrate import integrate
+from src.integrate_async import integrate_processes, IntegratorPool
+from src.registry import (IntegrandRef, lookup, register, register_import,
+                          register_source, unregister, worker_options)
+
+SOURCE = """
+import math
+
+def bump(x):
+    return math.exp(-x * x)
+"""
+
+
+class TestRegistry(unittest.TestCase):
+    """Регистрация и поиск функций в текущем процессе."""
+    
+    def test_register_and_resolve(self):
+        """integrate принимает IntegrandRef вместо функции"""
+        scale = 3.0
+        ref = register(lambda x: scale * x)
+        try:
+            self.assertIsInstance(ref, IntegrandRef)
+            self.assertEqual(integrate(ref, 0, 1, n_iter=100, method='trapezoid'),
+                             integrate(lambda x: scale * x, 0, 1, n_iter=100, method='trapezoid'))
+        finally:
+            unregister(ref)
+        with self.assertRaises(LookupError):
+            lookup(ref.id)
+    
+    def test_task_payload_is_small(self):
+        """В задаче передается только id, а не функция"""
+        ref = register_source(SOURCE * 20, 'bump')
+        try:
+            self.assertLess(len(pickle.dumps(partial(integrate, ref))), 200)
+        finally:
+            unregister(ref)
+    
+    def test_closure_requires_fork(self):
+        """Замыкание без fork передать нельзя; функция из модуля - по пути импорта"""
+        ref = register(lambda x: x)
+        try:
+            with self.assertRaises(ValueError):
+                worker_options([ref], 'spawn')
+            self.assertEqual(worker_options([ref], 'fork')['mp_context'].get_start_method(),
+                             'fork')
+        finally:
+            unregister(ref)
+        ref = register(math.cos)
+        try:
+            options = worker_options([ref], 'spawn')
+            self.assertEqual(options['initargs'], ([('import', ref.id, 'math:cos')],))
+        finally:
+            unregister(ref)
+    
+    def test_start_method_not_fixed(self):
+        """worker_options не фиксирует глобальный способ запуска"""
+        ref = register(math.cos)
+        with mock.patch.object(mp.context._default_context, '_actual_context', None):
+            try:
+                worker_options([ref])
+                self.assertIsNone(mp.get_start_method(allow_none=True))
+            finally:
+                unregister(ref)
+
+
+class TestRegistryWorkers(unittest.TestCase):
+    """Функции доступны рабочим процессам без pickle в задачах."""
+    
+    def test_processes_closure(self):
+        """integrate_processes работает с замыканием"""
+        power = 2
+        value = integrate_processes(lambda x: x ** power, 0, 3, n_jobs=2, n_iter=3000)
+        self.assertAlmostEqual(value, 9.0, places=2)
+    
+    def test_spawn_pool_import_and_source(self):
+        """Пул spawn получает функции по пути импорта и по исходному тексту"""
+        refs = [register_import('math:sin'), register_source(SOURCE, 'bump')]
+        try:
+            with IntegratorPool(n_jobs=1, integrands=refs, start_method='spawn') as pool:
+                self.assertAlmostEqual(pool.integrate(refs[0], 0, math.pi, n_iter=1000), 2.0,
+                                       places=5)
+                self.assertAlmostEqual(pool.integrate(refs[1], -5, 5, n_iter=1000),
+                                       math.sqrt(math.pi), places=5)
+        finally:
+            for ref in refs:
+                unregister(ref)
+    
+    def test_pool_owns_registrations(self):
+        """Пул удаляет из реестра функции, которые зарегистрировал сам"""
+        offset = 1.0
+        with IntegratorPool(n_jobs=2, integrands=[lambda x: x + offset]) as pool:
+            ref, = pool.refs
+            _, stats = pool.integrate(ref, 0, 1, n_iter=1000, return_stats=True)
+            self.assertLess(stats.bytes_pickled / len(stats.chunks), 400)
+        with self.assertRaises(LookupError):
+            lookup(ref.id)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+"""
+Юнит-тесты для статистики выполнения (return_stats, src.stats).
+"""
+
+import unittest
+import asyncio
+import math
+
+from src.integrate import integrate
+from src.integrate_adaptive import integrate_adaptive
+from src.integrate_aio import integrate_async
+from src.integrate_async import (integrate_threads, integrate_processes, integrate_many,
+                                 IntegratorPool)
+from src.integrate_nd import integrate_nd
+from src.stats import ChunkStats, IntegrationStats, aggregate_stats
+
+
+class TestIntegrationStats(unittest.TestCase):
+    """Поля и сводки IntegrationStats."""
+    
+    def test_worker_times_and_imbalance(self):
+        """Время по рабочим суммируется по кускам"""
+        stats = IntegrationStats('test', n_evals=300, total=2.0, chunks=[
+            ChunkStats('1:a', 100, 1.0), ChunkStats('2:b', 100, 0.5), ChunkStats('1:a', 100, 0.5),
+        ])
+        self.assertEqual(stats.worker_times, {'1:a': 1.5, '2:b': 0.5})
+        summary = stats.as_dict()
+        self.assertEqual(summary['n_chunks'], 3)
+        self.assertAlmostEqual(summary['imbalance'], 1.5)
+        self.assertAlmostEqual(summary['evals_per_second'], 150.0)
+    
+    def test_aggregate(self):
+        """aggregate_stats усредняет числовые поля"""
+        runs = [IntegrationStats('x', compute=1.0, total=1.0),
+                IntegrationStats('x', compute=3.0, total=3.0)]
+        summary = aggregate_stats(runs)
+        self.assertEqual(summary['runs'], 2)
+        self.assertAlmostEqual(summary['compute'], 2.0)
+        with self.assertRaises(ValueError):
+            aggregate_stats([])
+
+
+class TestReturnStats(unittest.TestCase):
+    """return_stats=True во всех функциях integrate*."""
+    
+    def check(self, stats, n_evals, n_chunks):
+        self.assertIsInstance(stats, IntegrationStats)
+        self.assertEqual(stats.n_evals, n_evals)
+        self.assertEqual(len(stats.chunks), n_chunks)
+        self.assertEqual(sum(c.n_evals for c in stats.chunks), n_evals)
+        self.assertGreater(stats.total, 0)
+        self.assertGreaterEqual(stats.total, stats.compute)
+    
+    def test_integrate(self):
+        """Значение совпадает с вызовом без статистики"""
+        value, stats = integrate(math.sin, 0, 1, n_iter=1000, method='simpson', return_stats=True)
+        self.assertEqual(value, integrate(math.sin, 0, 1, n_iter=1000, method='simpson'))
+        self.check(stats, 2002, 1)
+    
+    def test_threads(self):
+        """Потоки: куски и нулевой объем pickle"""
+        value, stats = integrate_threads(math.sin, 0, 1, n_jobs=2, n_iter=1000,
+                                         chunksize=100, return_stats=True)
+        self.assertAlmostEqual(value, integrate(math.sin, 0, 1, n_iter=1000), places=12)
+        self.check(stats, 1000, 10)
+        self.assertEqual(stats.bytes_pickled, 0)
+    
+    def test_processes(self):
+        """Процессы: фаза запуска и объем переданных данных"""
+        value, stats = integrate_processes(math.sin, 0, 1, n_jobs=2, n_iter=1000,
+                                           return_stats=True)
+        self.assertAlmostEqual(value, integrate(math.sin, 0, 1, n_iter=1000), places=12)
+        self.check(stats, 1000, 16)
+        self.assertGreater(stats.spawn, 0)
+        self.assertGreater(stats.bytes_pickled, 0)
+    
+    def test_pool(self):
+        """Пул: spawn не входит в вызов, время совпадает с учетом пула"""
+        with IntegratorPool(n_jobs=2, kind='threads') as pool:
+            _, stats = pool.integrate(math.sin, 0, 1, n_iter=1000, return_stats=True)
+            self.assertEqual(stats.spawn, 0.0)
+            self.assertAlmostEqual(stats.total, pool.total_time)
+        self.check(stats, 1000, 2)
+    
+    def test_async(self):
+        """integrate_async замеряет каждый кусок"""
+        with IntegratorPool(n_jobs=2, kind='threads') as pool:
+            value, stats = asyncio.run(integrate_async(math.sin, 0, 1, n_iter=1000, chunksize=250,
+                                                       pool=pool, return_stats=True))
+        self.assertAlmostEqual(value, integrate(math.sin, 0, 1, n_iter=1000), places=12)
+        self.check(stats, 1000, 4)
+        with IntegratorPool(n_jobs=2, kind='threads') as pool:
+            _, stats = asyncio.run(integrate_async(math.sin, 0, 1, n_iter=1000, chunksize=250,
+                                                   pool=pool, method='simpson',
+                                                   return_stats=True))
+        self.check(stats, 4 * (2 * 250 + 2), 4)
+    
+    def test_many(self):
+        """integrate_many выдает статистику каждого задания с n_evals по методу"""
+        jobs = {'left': (math.sin, 0, 1), 'simpson': (math.sin, 0, 1, {'method': 'simpson'})}
+        results = dict(integrate_many(jobs, n_jobs=2, n_iter=1000, return_stats=True))
+        for name, n_evals in (('left', 1000), ('simpson', 2002)):
+            value, stats = results[name]
+            self.assertEqual(value, integrate(*jobs[name][:3], n_iter=1000,
+                                              **(jobs[name][3:] or [{}])[0]))
+            self.check(stats, n_evals, 1)
+            self.assertEqual(stats.backend, 'many_processes')
+            self.assertGreater(stats.bytes_pickled, 0)
+    
+    def test_adaptive_and_nd(self):
+        """Адаптивный и многомерный варианты"""
+        result, stats = integrate_adaptive(math.sin, 0, 1, return_stats=True)
+        self.check(stats, result.n_evals, 1)
+        result, stats = integrate_nd(lambda x, y: x * y, [(0, 1), (0, 1)], n_points=10000,
+                                     batch_size=2500, return_stats=True)
+        self.assertAlmostEqual(result.value, 0.25)
+        self.check(stats, 10000, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,181 @@
+"""
+Нагрузочный тест веб-приложения.
+
+Запускает приложение в этом же процессе (однопоточный HTTPServer и
+PooledHTTPServer с разным числом потоков) на свободном порту и
+нагружает его параллельными клиентами. Для каждого режима выводятся
+запросы в секунду, задержки (медиана, 95-й перцентиль, максимум) и
+число ошибок.
+
+Медленные клиенты (--slow-clients) открывают соединение и не
+дописывают запрос: однопоточный сервер ждет их до таймаута и не
+обслуживает остальных, пул потоков теряет только занятые ими потоки.
+
+Примеры:
+    python benchmarks/load_test.py
+    python benchmarks/load_test.py --clients 32 --requests 100 --workers 0 4 16
+    python benchmarks/load_test.py --slow-clients 1 --workers 0 8
+    python benchmarks/load_test.py --db /tmp/load.db --synchronous OFF
+    python benchmarks/load_test.py --url http://localhost:8000
+"""
+
+import argparse
+import http.client
+import os
+import socket
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+ROOT = Path(__file__).parent.parent
+
+# Маршруты, которые запрашивают клиенты; каждый WRITE_EVERY-й запрос - запись
+ROUTES = ['/', '/users', '/currencies', '/user?id=1', '/user?id=2', '/author']
+WRITE_ROUTE = '/currency/update?USD={value}'
+WRITE_EVERY = 10
+
+
+def run_client(host: str, port: int, n_requests: int, offset: int,
+               latencies: List[float], errors: List[str], timeout: float) -> None:
+    """Выполняет n_requests запросов подряд, каждый в новом соединении."""
+    for i in range(offset, offset + n_requests):
+        if i % WRITE_EVERY == WRITE_EVERY - 1:
+            path = WRITE_ROUTE.format(value=90 + i % 10)
+        else:
+            path = ROUTES[i % len(ROUTES)]
+        start = time.perf_counter()
+        try:
+            conn = http.client.HTTPConnection(host, port, timeout=timeout)
+            conn.request('GET', path)
+            response = conn.getresponse()
+            response.read()
+            conn.close()
+            if response.status >= 400:
+                errors.append(f"{path}: HTTP {response.status}")
+                continue
+        except OSError as e:
+            errors.append(f"{path}: {e}")
+            continue
+        latencies.append(time.perf_counter() - start)
+
+
+def open_slow_clients(host: str, port: int, count: int) -> List[socket.socket]:
+    """Открывает соединения, отправившие только начало запроса."""
+    sockets = []
+    for _ in range(count):
+        sock = socket.create_connection((host, port))
+        sock.sendall(b"GET / HTTP/1.1\r\nHost: localhost\r\n")
+        sockets.append(sock)
+    return sockets
+
+
+def load(host: str, port: int, clients: int, n_requests: int,
+         slow_clients: int = 0, timeout: float = 30.0) -> Dict[str, Any]:
+    """
+    Нагружает сервер clients параллельными клиентами.
+
+    Returns:
+        Dict[str, Any]: пропускная способность, задержки (сек) и ошибки
+    """
+    latencies: List[float] = []
+    errors: List[str] = []
+    slow = open_slow_clients(host, port, slow_clients)
+    threads = [
+        threading.Thread(target=run_client,
+                         args=(host, port, n_requests, i * n_requests, latencies, errors, timeout))
+        for i in range(clients)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    for sock in slow:
+        sock.close()
+
+    ordered = sorted(latencies) or [0.0]
+    return {
+        'requests': len(latencies),
+        'errors': len(errors),
+        'seconds': elapsed,
+        'rps': len(latencies) / elapsed,
+        'p50': statistics.median(ordered),
+        'p95': ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        'max': ordered[-1],
+        'first_error': errors[0] if errors else None,
+    }
+
+
+def start_app(workers: int, request_timeout: float, database: Optional[str] = None,
+              **db_options):
+    """Запускает приложение на свободном порту в фоновом потоке; возвращает (сервер, база)."""
+    os.chdir(ROOT)  # шаблоны загружаются из templates/ относительно каталога запуска
+    if str(ROOT) not in sys.path:
+        sys.path.insert(0, str(ROOT))
+    from myapp import RouterHandler, create_app
+
+    RouterHandler.timeout = request_timeout
+    RouterHandler.log_message = lambda self, *args: None  # журнал запросов искажает замер
+    server, controllers = create_app('localhost', 0, workers, database, **db_options)
+    # Закрытые медленные клиенты дают BrokenPipeError при ответе - это ожидаемо
+    server.handle_error = lambda request, client_address: None
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, controllers['currency'].db
+
+
+def print_row(label: str, result: Dict[str, Any]) -> None:
+    print(f"{label:<14} | {result['rps']:8.1f} | {result['p50'] * 1000:8.2f} | "
+          f"{result['p95'] * 1000:8.2f} | {result['max'] * 1000:8.1f} | {result['errors']:6d}")
+    if result['first_error']:
+        print(f"{'':<14}   первая ошибка: {result['first_error']}")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Нагрузочный тест веб-приложения")
+    parser.add_argument('--clients', type=int, default=16, help="параллельных клиентов")
+    parser.add_argument('--requests', type=int, default=50, help="запросов на клиента")
+    parser.add_argument('--workers', nargs='+', type=int, default=[0, 4, 8],
+                        help="режимы сервера: 0 - однопоточный, N - пул из N потоков")
+    parser.add_argument('--slow-clients', type=int, default=0,
+                        help="соединений, не дописывающих запрос")
+    parser.add_argument('--request-timeout', type=float, default=2.0,
+                        help="таймаут сокета сервера для медленных клиентов (сек)")
+    parser.add_argument('--db', help="файл базы SQLite (по умолчанию база в памяти)")
+    parser.add_argument('--synchronous', default='NORMAL', help="PRAGMA synchronous")
+    parser.add_argument('--url', help="нагрузить уже запущенный сервер вместо встроенного")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    print(f"Клиентов: {args.clients}, запросов на клиента: {args.requests}, "
+          f"медленных клиентов: {args.slow_clients}, база: {args.db or 'в памяти'}")
+    print(f"{'Сервер':<14} | {'Запр/с':>8} | {'p50 (мс)':>8} | {'p95 (мс)':>8} | "
+          f"{'max (мс)':>8} | {'Ошибки':>6}")
+    print("-" * 68)
+    if args.url:
+        url = urlparse(args.url)
+        result = load(url.hostname, url.port or 80, args.clients, args.requests, args.slow_clients)
+        print_row(url.netloc, result)
+        return
+    for workers in args.workers:
+        server, db = start_app(workers, args.request_timeout, args.db,
+                               synchronous=args.synchronous)
+        try:
+            result = load('localhost', server.server_port, args.clients, args.requests,
+                          args.slow_clients)
+        finally:
+            server.shutdown()
+            server.server_close()
+            db.close()
+        print_row("однопоточный" if workers == 0 else f"пул {workers}", result)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,52 +1,171 @@
 """
 Контроллер работы с базой данных SQLite.
 Реализует CRUD операции с защитой от SQL-инъекций.
+Безопасен для многопоточного сервера: пул соединений для чтения
+и одно соединение для записи.
 """
 
+import itertools
+import os
+import queue
 import sqlite3
-from typing import List, Dict, Any, Optional, Tuple
-from contextlib import contextmanager
+import threading
+from typing import List, Dict, Any, Optional, Tuple, Union
+from contextlib import contextmanager, nullcontext
+
+# Номера баз в памяти: у каждого контроллера своя база
+_database_ids = itertools.count()
+
+SYNCHRONOUS_MODES = ('OFF', 'NORMAL', 'FULL', 'EXTRA')
+
+# Число соединений для чтения по умолчанию
+DEFAULT_READERS = 4
 
 
 class DatabaseController:
     """
-    Контроллер базы данных SQLite в памяти.
+    Контроллер базы данных SQLite в файле или в памяти.
     Управляет таблицами user, currency и user_currency.
+    
+    Все изменения выполняются через одно соединение для записи под
+    блокировкой, чтения - через пул из readers соединений, поэтому
+    несколько запросов читают одновременно. Файловая база работает
+    в режиме WAL: чтения не ждут записи и видят последние
+    зафиксированные данные. База в памяти (path=None) общая для
+    соединений контроллера (URI с cache=shared) и теряется при
+    остановке; WAL для нее недоступен, поэтому чтения ждут окончания
+    записи (блокировка читателей-писателя), но тоже видят только
+    зафиксированные данные.
+    
+    Args:
+        path: путь к файлу базы; None или ':memory:' - база в памяти
+        readers: число соединений для чтения
+        synchronous: PRAGMA synchronous (OFF, NORMAL, FULL, EXTRA)
+        cache_size: PRAGMA cache_size каждого соединения
+            (> 0 - страниц, < 0 - КиБ)
+        pragmas: дополнительные PRAGMA для всех соединений, например
+            {'mmap_size': 268435456}
     """
 
-    def __init__(self) -> None:
+    def __init__(self, path: Union[str, os.PathLike, None] = None, *,
+                 readers: int = DEFAULT_READERS,
+                 synchronous: str = 'NORMAL',
+                 cache_size: int = -2000,
+                 pragmas: Optional[Dict[str, Union[int, str]]] = None) -> None:
         """
-        Инициализирует базу данных в памяти и создает таблицы.
-        Заполняет тестовыми данными.
+        Открывает базу данных и создает таблицы, если их нет.
+        Заполняет тестовыми данными только пустую базу.
         """
-        self._conn = sqlite3.connect(':memory:')
-        self._conn.row_factory = sqlite3.Row  # Возвращает словари вместо кортежей
+        if readers < 1:
+            raise ValueError("Нужно хотя бы одно соединение для чтения")
+        if str(synchronous).upper() not in SYNCHRONOUS_MODES:
+            raise ValueError(f"synchronous должен быть одним из {SYNCHRONOUS_MODES}")
+        self.in_memory = path is None or path == ':memory:'
+        if self.in_memory:
+            self._target = f"file:myapp_{next(_database_ids)}?mode=memory&cache=shared"
+        else:
+            self._target = os.fspath(path)
+        self._pragmas = {'synchronous': str(synchronous).upper(), 'cache_size': int(cache_size)}
+        self._pragmas.update(_check_pragmas(pragmas or {}))
+        self._write_lock = threading.Lock()
+        # В памяти нет WAL: чтения исключают запись, но не друг друга
+        self._memory_lock = _ReadWriteLock() if self.in_memory else None
+        # Соединение для записи; база в памяти существует, пока оно открыто
+        self._writer = self._connect()
+        if not self.in_memory:
+            self._writer.execute("PRAGMA journal_mode = WAL")
         self._init_database()
-        self._populate_test_data()
+        if self._is_empty():
+            self._populate_test_data()
+        self._readers: queue.LifoQueue = queue.LifoQueue()
+        for _ in range(readers):
+            self._readers.put(self._connect(read_only=True))
+
+    def _connect(self, read_only: bool = False) -> sqlite3.Connection:
+        """Открывает соединение, которое можно передавать между потоками."""
+        conn = sqlite3.connect(self._target, uri=self.in_memory, check_same_thread=False,
+                               timeout=5.0)
+        conn.row_factory = sqlite3.Row  # Возвращает словари вместо кортежей
+        for name, value in self._pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        if read_only:
+            conn.execute("PRAGMA query_only = 1")
+        return conn
 
     @contextmanager
-    def _get_cursor(self):
-        """Контекстный менеджер для курсора."""
-        cursor = self._conn.cursor()
+    def _get_cursor(self, write: bool = False):
+        """
+        Контекстный менеджер для курсора.
+        
+        Args:
+            write: запрос изменяет данные - выполняется соединением
+                для записи под блокировкой, иначе соединением из пула
+                (для базы в памяти - после завершения текущей записи)
+        """
+        lock = self._memory_lock
+        if write:
+            with self._write_lock, lock.writing() if lock else nullcontext():
+                with self._cursor(self._writer) as cursor:
+                    yield cursor
+            return
+        conn = self._readers.get()
+        try:
+            with lock.reading() if lock else nullcontext(), self._cursor(conn) as cursor:
+                yield cursor
+        finally:
+            self._readers.put(conn)
+
+    @staticmethod
+    @contextmanager
+    def _cursor(conn: sqlite3.Connection):
+        """Курсор с фиксацией транзакции или откатом при ошибке."""
+        cursor = conn.cursor()
         try:
             yield cursor
-            self._conn.commit()
+            conn.commit()
         except Exception:
-            self._conn.rollback()
+            conn.rollback()
             raise
         finally:
             cursor.close()
 
+    def pragma(self, name: str) -> Any:
+        """
+        Текущее значение PRAGMA на соединении для чтения.
+        
+        Args:
+            name: имя PRAGMA (journal_mode, synchronous, cache_size, ...)
+        """
+        _check_pragmas({name: 0})
+        with self._get_cursor() as cursor:
+            return cursor.execute(f"PRAGMA {name}").fetchone()[0]
+
+    def close(self) -> None:
+        """Закрывает все соединения; база в памяти при этом удаляется."""
+        while True:
+            try:
+                self._readers.get_nowait().close()
+            except queue.Empty:
+                break
+        with self._write_lock:
+            self._writer.close()
+
+    def _is_empty(self) -> bool:
+        """True, если в базе нет ни пользователей, ни валют."""
+        with self._get_cursor(write=True) as cursor:
+            cursor.execute("SELECT (SELECT COUNT(*) FROM user) + (SELECT COUNT(*) FROM currency)")
+            return cursor.fetchone()[0] == 0
+
     def _init_database(self) -> None:
         """
         Создает структуру базы данных с первичными и внешними ключами.
         Первичный ключ (PRIMARY KEY) - уникальный идентификатор записи.
         Внешний ключ (FOREIGN KEY) - обеспечивает целостность ссылок между таблицами.
         """
-        with self._get_cursor() as cursor:
+        with self._get_cursor(write=True) as cursor:
             # Таблица пользователей
             cursor.execute("""
-                CREATE TABLE user (
+                CREATE TABLE IF NOT EXISTS user (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     name TEXT NOT NULL
                 )
@@ -54,7 +173,7 @@ class DatabaseController:
 
             # Таблица валют
             cursor.execute("""
-                CREATE TABLE currency (
+                CREATE TABLE IF NOT EXISTS currency (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     num_code TEXT NOT NULL,
                     char_code TEXT NOT NULL UNIQUE,
@@ -66,7 +185,7 @@ class DatabaseController:
 
             # Связующая таблица многие-ко-многим
             cursor.execute("""
-                CREATE TABLE user_currency (
+                CREATE TABLE IF NOT EXISTS user_currency (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     user_id INTEGER NOT NULL,
                     currency_id INTEGER NOT NULL,
@@ -91,7 +210,7 @@ class DatabaseController:
             ("398", "KZT", "Казахстанский тенге", 0.21, 1)
         ]
 
-        with self._get_cursor() as cursor:
+        with self._get_cursor(write=True) as cursor:
             cursor.executemany("INSERT INTO user (name) VALUES (?)", test_users)
             cursor.executemany(
                 "INSERT INTO currency (num_code, char_code, name, value, nominal) "
@@ -125,7 +244,7 @@ class DatabaseController:
             INSERT INTO currency (num_code, char_code, name, value, nominal)
             VALUES (:num_code, :char_code, :name, :value, :nominal)
         """
-        with self._get_cursor() as cursor:
+        with self._get_cursor(write=True) as cursor:
             cursor.execute(sql, currency_data)
             return cursor.lastrowid
 
@@ -152,7 +271,7 @@ class DatabaseController:
             bool: True если обновление прошло успешно
         """
         sql = "UPDATE currency SET value = ? WHERE id = ?"
-        with self._get_cursor() as cursor:
+        with self._get_cursor(write=True) as cursor:
             result = cursor.execute(sql, (value, currency_id))
             return result.rowcount > 0
 
@@ -168,7 +287,7 @@ class DatabaseController:
             bool: True если обновление прошло успешно
         """
         sql = "UPDATE currency SET value = ? WHERE char_code = ?"
-        with self._get_cursor() as cursor:
+        with self._get_cursor(write=True) as cursor:
             result = cursor.execute(sql, (value, char_code))
             return result.rowcount > 0
 
@@ -183,7 +302,7 @@ class DatabaseController:
             bool: True если удаление прошло успешно
         """
         sql = "DELETE FROM currency WHERE id = ?"
-        with self._get_cursor() as cursor:
+        with self._get_cursor(write=True) as cursor:
             result = cursor.execute(sql, (currency_id,))
             return result.rowcount > 0
 
@@ -231,3 +350,56 @@ class DatabaseController:
         with self._get_cursor() as cursor:
             cursor.execute(sql)
             return [dict(row) for row in cursor.fetchall()]
+
+
+class _ReadWriteLock:
+    """
+    Блокировка читателей-писателя: много читателей или один писатель.
+    Ожидающий писатель не пропускает новых читателей вперед.
+    """
+
+    def __init__(self) -> None:
+        self._condition = threading.Condition()
+        self._readers = 0
+        self._writing = False
+        self._waiting_writers = 0
+
+    @contextmanager
+    def reading(self):
+        with self._condition:
+            self._condition.wait_for(lambda: not self._writing and not self._waiting_writers)
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+
+    @contextmanager
+    def writing(self):
+        with self._condition:
+            self._waiting_writers += 1
+            self._condition.wait_for(lambda: not self._writing and not self._readers)
+            self._waiting_writers -= 1
+            self._writing = True
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writing = False
+                self._condition.notify_all()
+
+
+def _check_pragmas(pragmas: Dict[str, Union[int, str]]) -> Dict[str, Union[int, str]]:
+    """
+    Проверяет имена и значения PRAGMA: они подставляются в текст запроса,
+    поэтому допускаются только идентификаторы и целые числа.
+    """
+    for name, value in pragmas.items():
+        if not name.isidentifier():
+            raise ValueError(f"Недопустимое имя PRAGMA: {name!r}")
+        if not isinstance(value, int) and not str(value).isidentifier():
+            raise ValueError(f"Недопустимое значение PRAGMA {name}: {value!r}")
+    return dict(pragmas)
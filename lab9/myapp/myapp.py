@@ -1,21 +1,76 @@
 """
 Главное веб-приложение с архитектурой MVC для работы с валютами и пользователями.
-Использует SQLite в памяти и Jinja2 для рендеринга шаблонов.
+Использует SQLite (файл в режиме WAL или база в памяти) и Jinja2 для рендеринга шаблонов.
+Запросы обслуживаются ограниченным пулом потоков (PooledHTTPServer).
 """
 
+import argparse
 import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 from http.server import HTTPServer, BaseHTTPRequestHandler
 from jinja2 import Environment, FileSystemLoader
 import os
+from typing import Optional
 
-from controllers.databasecontroller import DatabaseController
+from controllers.databasecontroller import DatabaseController, SYNCHRONOUS_MODES
 from controllers.currencycontroller import CurrencyController
 from controllers.usercontroller import UserController
 from controllers.pages import PagesController
 
+# Число потоков, обслуживающих запросы по умолчанию
+DEFAULT_WORKERS = 8
+
+# Файл базы для запуска из командной строки (':memory:' - база в памяти)
+DEFAULT_DATABASE = os.environ.get('MYAPP_DB', 'myapp.db')
+
+# Сколько секунд сервер ждет данных от клиента, прежде чем закрыть соединение
+REQUEST_TIMEOUT = 10
+
+
+class PooledHTTPServer(HTTPServer):
+    """
+    HTTP-сервер, обслуживающий запросы в пуле из workers потоков.
+    
+    В отличие от ThreadingHTTPServer, число потоков ограничено: при
+    наплыве клиентов запросы ждут в очереди пула, а не порождают
+    новые потоки. Медленный клиент занимает только один поток.
+    """
+    
+    # Очередь соединений в ядре: при коротком backlog (5) клиенты под
+    # нагрузкой получают отказ и повторяют подключение через секунду
+    request_queue_size = 128
+    
+    def __init__(self, server_address, handler_class, workers: int = DEFAULT_WORKERS) -> None:
+        super().__init__(server_address, handler_class)
+        self.workers = workers
+        self._executor = ThreadPoolExecutor(max_workers=workers,
+                                            thread_name_prefix='myapp-worker')
+
+    def process_request(self, request, client_address) -> None:
+        """Передает запрос в пул вместо обработки в потоке сервера."""
+        self._executor.submit(self._process_request_thread, request, client_address)
+
+    def _process_request_thread(self, request, client_address) -> None:
+        """Обрабатывает запрос в потоке пула (как ThreadingMixIn)."""
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self) -> None:
+        """Закрывает сокет и дожидается обработки принятых запросов."""
+        super().server_close()
+        self._executor.shutdown(wait=True)
+
+
 class RouterHandler(BaseHTTPRequestHandler):
     """Обработчик HTTP-запросов с маршрутизацией."""
     
+    # Таймаут сокета: зависший клиент не держит поток пула бесконечно
+    timeout = REQUEST_TIMEOUT
+    
     def __init__(self, *args, controllers=None, **kwargs):
         self.controllers = controllers
         super().__init__(*args, **kwargs)
@@ -119,10 +174,20 @@ class RouterHandler(BaseHTTPRequestHandler):
         self.wfile.write(html_content.encode('utf-8'))
 
 
-def create_app() -> tuple[HTTPServer, dict]:
+def create_app(host: str = 'localhost', port: int = 8000,
+               workers: int = DEFAULT_WORKERS,
+               database: Optional[str] = None,
+               **db_options) -> tuple[HTTPServer, dict]:
     """
     Создает и инициализирует веб-приложение.
     
+    Args:
+        host: адрес сервера
+        port: порт (0 - любой свободный)
+        workers: число потоков для запросов; 0 - однопоточный HTTPServer
+        database: файл базы SQLite; None - база в памяти
+        **db_options: параметры DatabaseController (synchronous, cache_size, ...)
+    
     Returns:
         tuple[HTTPServer, dict]: HTTP-сервер и словарь контроллеров
     """
@@ -131,7 +196,9 @@ def create_app() -> tuple[HTTPServer, dict]:
                      keep_trailing_newline=True)
     
     # Инициализация базы данных
-    db_controller = DatabaseController()
+    # Соединений для чтения столько же, сколько потоков обслуживают запросы
+    db_options.setdefault('readers', max(1, workers))
+    db_controller = DatabaseController(database, **db_options)
     
     # Создание контроллеров
     currency_controller = CurrencyController(db_controller)
@@ -145,8 +212,11 @@ def create_app() -> tuple[HTTPServer, dict]:
     }
     
     # Создание сервера
-    server = HTTPServer(('localhost', 8000), lambda *args, **kwargs: 
-                       RouterHandler(*args, controllers=controllers, **kwargs))
+    handler = lambda *args, **kwargs: RouterHandler(*args, controllers=controllers, **kwargs)
+    if workers > 0:
+        server = PooledHTTPServer((host, port), handler, workers=workers)
+    else:
+        server = HTTPServer((host, port), handler)
     server.template_env = env
     
     return server, controllers
@@ -154,15 +224,36 @@ def create_app() -> tuple[HTTPServer, dict]:
 
 def main() -> None:
     """Запуск веб-приложения."""
-    server, controllers = create_app()
-    print("Сервер запущен на http://localhost:8000")
+    parser = argparse.ArgumentParser(description="Веб-приложение валют и пользователей")
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help="потоков для запросов (0 - однопоточный сервер)")
+    parser.add_argument('--db', default=DEFAULT_DATABASE,
+                        help="файл базы SQLite (':memory:' - в памяти, по умолчанию MYAPP_DB или myapp.db)")
+    parser.add_argument('--synchronous', default='NORMAL', choices=SYNCHRONOUS_MODES,
+                        help="PRAGMA synchronous")
+    parser.add_argument('--cache-size', type=int, default=-2000,
+                        help="PRAGMA cache_size (> 0 - страниц, < 0 - КиБ)")
+    args = parser.parse_args()
+    
+    server, controllers = create_app(args.host, args.port, args.workers, args.db,
+                                     synchronous=args.synchronous, cache_size=args.cache_size)
+    mode = f"{args.workers} потоков" if args.workers > 0 else "однопоточный"
+    print(f"Сервер запущен на http://{args.host}:{server.server_port} ({mode}, база {args.db})")
     print("Доступные маршруты:")
     print("  / - Главная")
     print("  /author - Об авторе")
     print("  /users - Пользователи")
     print("  /currencies - Все валюты")
     print("  /currency/show - Показать валюты в консоли")
-    server.serve_forever()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        controllers['currency'].db.close()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,134 @@
+"""
+Unit-тесты для DatabaseController: доступ из нескольких потоков,
+файловая база в режиме WAL.
+"""
+
+import os
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from controllers.databasecontroller import DatabaseController
+
+
+class TestDatabaseController(unittest.TestCase):
+    """Тесты контроллера базы данных."""
+
+    def setUp(self) -> None:
+        self.db = DatabaseController(readers=2)
+
+    def tearDown(self) -> None:
+        self.db.close()
+
+    def test_parallel_reads_share_pool(self) -> None:
+        """Тест: чтения из многих потоков выполняются через пул соединений."""
+        barrier = threading.Barrier(2)
+
+        def read(_):
+            with self.db._get_cursor() as cursor:
+                # Оба читателя держат соединения одновременно
+                barrier.wait(timeout=5)
+                cursor.execute("SELECT COUNT(*) FROM currency")
+                return cursor.fetchone()[0]
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            counts = list(executor.map(read, range(2)))
+
+        self.assertEqual(counts, [4, 4])
+        self.assertEqual(len(self.db.read_currencies()), 4)
+
+    def test_concurrent_reads_and_writes(self) -> None:
+        """Тест: параллельные чтения и записи не теряют обновлений и не падают."""
+        def work(i):
+            if i % 2:
+                return self.db.update_currency_by_code('USD', float(i))
+            return len(self.db.get_subscribed_currencies()) > 0
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(work, range(200)))
+
+        self.assertTrue(all(results))
+        usd = next(c for c in self.db.read_currencies() if c['char_code'] == 'USD')
+        self.assertIn(usd['value'], {float(i) for i in range(1, 200, 2)})
+
+    def test_rolled_back_write_not_visible(self) -> None:
+        """Тест: чтение в памяти ждет записи и не видит отмененных изменений."""
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            with self.assertRaises(RuntimeError):
+                with self.db._get_cursor(write=True) as cursor:
+                    cursor.execute("UPDATE currency SET value = 1.5 WHERE char_code = 'USD'")
+                    usd = executor.submit(
+                        lambda: next(c for c in self.db.read_currencies()
+                                     if c['char_code'] == 'USD'))
+                    time.sleep(0.2)
+                    self.assertFalse(usd.done())
+                    raise RuntimeError("откат")
+            self.assertEqual(usd.result(timeout=5)['value'], 90.5)
+
+    def test_controllers_are_isolated(self) -> None:
+        """Тест: у каждого контроллера своя база в памяти."""
+        other = DatabaseController()
+        self.db.delete_currency(1)
+        self.assertEqual(len(self.db.read_currencies()), 3)
+        self.assertEqual(len(other.read_currencies()), 4)
+        other.close()
+
+
+class TestFileDatabase(unittest.TestCase):
+    """Тесты файловой базы."""
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'myapp.db')
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_data_survives_restart(self) -> None:
+        """Тест: данные сохраняются, тестовые данные добавляются только в пустую базу."""
+        db = DatabaseController(self.path)
+        db.update_currency_by_code('USD', 100.0)
+        db.delete_currency(4)
+        db.close()
+
+        db = DatabaseController(self.path)
+        currencies = {c['char_code']: c['value'] for c in db.read_currencies()}
+        db.close()
+        self.assertEqual(currencies, {'EUR': 98.2, 'RUB': 1.0, 'USD': 100.0})
+
+    def test_wal_and_pragmas(self) -> None:
+        """Тест: режим WAL и настраиваемые PRAGMA."""
+        db = DatabaseController(self.path, synchronous='off', cache_size=-4096,
+                                pragmas={'temp_store': 'MEMORY'})
+        self.assertEqual(db.pragma('journal_mode'), 'wal')
+        self.assertEqual(db.pragma('synchronous'), 0)
+        self.assertEqual(db.pragma('cache_size'), -4096)
+        self.assertEqual(db.pragma('temp_store'), 2)
+        db.close()
+
+    def test_invalid_options(self) -> None:
+        """Тест: недопустимые PRAGMA отклоняются до подстановки в запрос."""
+        with self.assertRaises(ValueError):
+            DatabaseController(self.path, synchronous='SOMETIMES')
+        with self.assertRaises(ValueError):
+            DatabaseController(self.path, pragmas={'cache_size': '1; DROP TABLE user'})
+        with self.assertRaises(ValueError):
+            DatabaseController(self.path, readers=0)
+
+    def test_read_during_write(self) -> None:
+        """Тест: чтение не ждет незавершенной записи и видит зафиксированные данные."""
+        db = DatabaseController(self.path)
+        with db._get_cursor(write=True) as cursor:
+            cursor.execute("UPDATE currency SET value = 1.5 WHERE char_code = 'USD'")
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                usd = executor.submit(
+                    lambda: next(c for c in db.read_currencies() if c['char_code'] == 'USD')
+                ).result(timeout=5)
+        self.assertEqual(usd['value'], 90.5)
+        self.assertEqual(db.read_currencies()[-1]['value'], 1.5)
+        db.close()
+
+
+if __name__ == '__main__':
+    unittest.main()